@@ -0,0 +1,163 @@
+"""Range-partition telemetry_records on recorded_at.
+
+Existing rows are copied into the new partitioned table, so on large databases this
+migration runs for as long as a full table rewrite.
+
+The partition width and the number of future partitions come from the app settings
+(``API_TELEMETRY_PARTITION_INTERVAL`` and ``API_TELEMETRY_PARTITION_PREMAKE``, including
+``.env``) at upgrade time, like the database URL in ``env.py``.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, time, timedelta, timezone
+
+import sqlalchemy as sa
+
+from alembic import op
+from app.core.config import get_settings
+
+# revision identifiers, used by Alembic.
+revision = "20241202_0002"
+down_revision = "20241125_0001"
+branch_labels = None
+depends_on = None
+
+COLUMNS = "id, bus_id, recorded_at, latitude, longitude, speed_kph, heading, passenger_load"
+DEFAULT_PARTITION = "telemetry_records_default"
+
+
+def _planned_partitions(
+    first: datetime, last: datetime, weekly: bool
+) -> list[tuple[str, datetime, datetime]]:
+    """``(name, start, end)`` of the UTC day (or ISO week) partitions covering ``[first, last]``.
+
+    A frozen copy of the planning in ``app.services.partitions`` as of this revision, so
+    later changes there cannot change what this migration creates.
+    """
+
+    start = datetime.combine(first.astimezone(timezone.utc).date(), time(), tzinfo=timezone.utc)
+    step = timedelta(days=1)
+    if weekly:
+        start -= timedelta(days=start.weekday())
+        step = timedelta(weeks=1)
+    planned = []
+    while start <= last:
+        planned.append((f"telemetry_records_p{start:%Y%m%d}", start, start + step))
+        start += step
+    return planned
+
+
+def _rename_heap_table(old: str, new: str) -> None:
+    op.rename_table(old, new)
+    op.execute(f"ALTER TABLE {new} RENAME CONSTRAINT {old}_pkey TO {new}_pkey")
+    op.execute(f"ALTER TABLE {new} RENAME CONSTRAINT {old}_bus_id_fkey TO {new}_bus_id_fkey")
+
+
+def upgrade() -> None:
+    # The scheduled partition maintenance tops up the premake window afterwards.
+    settings = get_settings()
+    weekly = settings.telemetry_partition_interval == "weekly"
+    premake = settings.telemetry_partition_premake
+    bind = op.get_bind()
+
+    _rename_heap_table("telemetry_records", "telemetry_records_heap")
+    op.execute(
+        "ALTER TABLE telemetry_records_heap "
+        "RENAME CONSTRAINT uq_telemetry_bus_recorded_at TO uq_telemetry_heap_bus_recorded_at"
+    )
+    op.execute(
+        "ALTER INDEX ix_telemetry_bus_recorded_at RENAME TO ix_telemetry_heap_bus_recorded_at"
+    )
+    # Hundreds of millions of rows a month outgrow a 32-bit key; keep the sequence, widen it.
+    op.execute("ALTER SEQUENCE telemetry_records_id_seq AS bigint")
+
+    op.create_table(
+        "telemetry_records",
+        sa.Column(
+            "id",
+            sa.BigInteger(),
+            server_default=sa.text("nextval('telemetry_records_id_seq'::regclass)"),
+            nullable=False,
+        ),
+        sa.Column("bus_id", sa.Integer(), nullable=False),
+        sa.Column("recorded_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("latitude", sa.Float(), nullable=False),
+        sa.Column("longitude", sa.Float(), nullable=False),
+        sa.Column("speed_kph", sa.Float(), nullable=True),
+        sa.Column("heading", sa.Integer(), nullable=True),
+        sa.Column("passenger_load", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(["bus_id"], ["buses.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id", "recorded_at"),
+        sa.UniqueConstraint("bus_id", "recorded_at", name="uq_telemetry_bus_recorded_at"),
+        postgresql_partition_by="RANGE (recorded_at)",
+    )
+    op.create_index(
+        "ix_telemetry_bus_recorded_at",
+        "telemetry_records",
+        ["bus_id", "recorded_at"],
+        unique=False,
+    )
+    op.execute("ALTER SEQUENCE telemetry_records_id_seq OWNED BY telemetry_records.id")
+
+    now = datetime.now(timezone.utc)
+    oldest = bind.execute(sa.text("SELECT min(recorded_at) FROM telemetry_records_heap")).scalar()
+    last = now + timedelta(weeks=premake) if weekly else now + timedelta(days=premake)
+    for name, start, end in _planned_partitions(oldest or now, last, weekly):
+        op.execute(
+            f"CREATE TABLE {name} PARTITION OF telemetry_records "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+    # Catches fixes outside the pre-created ranges instead of failing whole batches.
+    op.execute(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF telemetry_records DEFAULT")
+
+    op.execute(
+        f"INSERT INTO telemetry_records ({COLUMNS}) SELECT {COLUMNS} FROM telemetry_records_heap"
+    )
+    op.drop_table("telemetry_records_heap")
+
+
+def downgrade() -> None:
+    op.rename_table("telemetry_records", "telemetry_records_partitioned")
+    op.execute(
+        "ALTER TABLE telemetry_records_partitioned "
+        "RENAME CONSTRAINT uq_telemetry_bus_recorded_at TO uq_telemetry_partitioned_bus_recorded_at"
+    )
+    op.execute(
+        "ALTER INDEX ix_telemetry_bus_recorded_at "
+        "RENAME TO ix_telemetry_partitioned_bus_recorded_at"
+    )
+    op.execute("ALTER SEQUENCE telemetry_records_id_seq OWNED BY NONE")
+
+    op.create_table(
+        "telemetry_records",
+        sa.Column(
+            "id",
+            sa.Integer(),
+            server_default=sa.text("nextval('telemetry_records_id_seq'::regclass)"),
+            nullable=False,
+        ),
+        sa.Column("bus_id", sa.Integer(), nullable=False),
+        sa.Column("recorded_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("latitude", sa.Float(), nullable=False),
+        sa.Column("longitude", sa.Float(), nullable=False),
+        sa.Column("speed_kph", sa.Float(), nullable=True),
+        sa.Column("heading", sa.Integer(), nullable=True),
+        sa.Column("passenger_load", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(["bus_id"], ["buses.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("bus_id", "recorded_at", name="uq_telemetry_bus_recorded_at"),
+    )
+    op.create_index(
+        "ix_telemetry_bus_recorded_at",
+        "telemetry_records",
+        ["bus_id", "recorded_at"],
+        unique=False,
+    )
+    op.execute(
+        f"INSERT INTO telemetry_records ({COLUMNS}) "
+        f"SELECT {COLUMNS} FROM telemetry_records_partitioned"
+    )
+    op.drop_table("telemetry_records_partitioned")
+    op.execute("ALTER SEQUENCE telemetry_records_id_seq AS integer")
+    op.execute("ALTER SEQUENCE telemetry_records_id_seq OWNED BY telemetry_records.id")
@@ -0,0 +1,52 @@
+"""Add telemetry rollup tables and the refresh watermark table."""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20241209_0003"
+down_revision = "20241202_0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "telemetry_rollups",
+        sa.Column("resolution_seconds", sa.Integer(), nullable=False),
+        sa.Column("bus_id", sa.Integer(), nullable=False),
+        sa.Column("bucket_start", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("route_id", sa.Integer(), nullable=False),
+        sa.Column("ping_count", sa.Integer(), nullable=False),
+        sa.Column("speed_sum", sa.Float(), nullable=True),
+        sa.Column("speed_count", sa.Integer(), nullable=False),
+        sa.Column("load_sum", sa.BigInteger(), nullable=True),
+        sa.Column("load_count", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["bus_id"], ["buses.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["route_id"], ["routes.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("resolution_seconds", "bus_id", "bucket_start"),
+    )
+    op.create_index(
+        "ix_telemetry_rollups_route_bucket",
+        "telemetry_rollups",
+        ["resolution_seconds", "route_id", "bucket_start"],
+        unique=False,
+    )
+
+    op.create_table(
+        "rollup_watermarks",
+        sa.Column("name", sa.String(length=64), nullable=False),
+        sa.Column("watermark", sa.DateTime(timezone=True), nullable=False),
+        sa.Column(
+            "updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.PrimaryKeyConstraint("name"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("rollup_watermarks")
+    op.drop_index("ix_telemetry_rollups_route_bucket", table_name="telemetry_rollups")
+    op.drop_table("telemetry_rollups")
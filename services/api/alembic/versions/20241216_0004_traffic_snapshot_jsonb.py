@@ -0,0 +1,58 @@
+"""Store traffic snapshot payloads as indexed JSONB with promoted key columns."""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20241216_0004"
+down_revision = "20241209_0003"
+branch_labels = None
+depends_on = None
+
+PROMOTED_KEYS = ("incident_type", "segment_id")
+
+
+def upgrade() -> None:
+    op.execute(
+        "ALTER TABLE traffic_snapshots ALTER COLUMN payload TYPE JSONB USING payload::jsonb"
+    )
+    for key in PROMOTED_KEYS:
+        op.add_column(
+            "traffic_snapshots",
+            sa.Column(key, sa.Text(), sa.Computed(f"payload ->> '{key}'", persisted=True)),
+        )
+
+    op.create_index(
+        "ix_traffic_snapshots_payload",
+        "traffic_snapshots",
+        ["payload"],
+        postgresql_using="gin",
+        postgresql_ops={"payload": "jsonb_path_ops"},
+    )
+    op.create_index(
+        "ix_traffic_snapshots_source_captured_at",
+        "traffic_snapshots",
+        ["source", sa.text("captured_at DESC")],
+    )
+    op.create_index(
+        "ix_traffic_snapshots_incident_type_captured_at",
+        "traffic_snapshots",
+        ["incident_type", "captured_at"],
+    )
+    op.create_index(
+        "ix_traffic_snapshots_segment_captured_at",
+        "traffic_snapshots",
+        ["segment_id", "captured_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_traffic_snapshots_segment_captured_at", table_name="traffic_snapshots")
+    op.drop_index("ix_traffic_snapshots_incident_type_captured_at", table_name="traffic_snapshots")
+    op.drop_index("ix_traffic_snapshots_source_captured_at", table_name="traffic_snapshots")
+    op.drop_index("ix_traffic_snapshots_payload", table_name="traffic_snapshots")
+    for key in reversed(PROMOTED_KEYS):
+        op.drop_column("traffic_snapshots", key)
+    op.execute("ALTER TABLE traffic_snapshots ALTER COLUMN payload TYPE JSON USING payload::json")
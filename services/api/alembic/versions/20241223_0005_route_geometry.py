@@ -0,0 +1,58 @@
+"""Add route shapes, stops and learned per-segment traversal pace."""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20241223_0005"
+down_revision = "20241216_0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "route_shape_points",
+        sa.Column("route_id", sa.Integer(), nullable=False),
+        sa.Column("sequence", sa.Integer(), nullable=False),
+        sa.Column("latitude", sa.Float(), nullable=False),
+        sa.Column("longitude", sa.Float(), nullable=False),
+        sa.Column("distance_m", sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(["route_id"], ["routes.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("route_id", "sequence"),
+    )
+
+    op.create_table(
+        "route_stops",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("route_id", sa.Integer(), nullable=False),
+        sa.Column("sequence", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=255), nullable=False),
+        sa.Column("latitude", sa.Float(), nullable=False),
+        sa.Column("longitude", sa.Float(), nullable=False),
+        sa.Column("distance_m", sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(["route_id"], ["routes.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("route_id", "sequence", name="uq_route_stops_sequence"),
+    )
+
+    op.create_table(
+        "route_segment_stats",
+        sa.Column("route_id", sa.Integer(), nullable=False),
+        sa.Column("segment_index", sa.Integer(), nullable=False),
+        sa.Column("seconds_per_meter", sa.Float(), nullable=False),
+        sa.Column("samples", sa.Integer(), nullable=False),
+        sa.Column(
+            "updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.ForeignKeyConstraint(["route_id"], ["routes.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("route_id", "segment_index"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("route_segment_stats")
+    op.drop_table("route_stops")
+    op.drop_table("route_shape_points")
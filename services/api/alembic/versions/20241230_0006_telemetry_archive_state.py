@@ -0,0 +1,29 @@
+"""Record which archive directory holds the archived telemetry."""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20241230_0006"
+down_revision = "20241223_0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "telemetry_archive_state",
+        sa.Column("name", sa.String(length=64), nullable=False),
+        sa.Column("archive_id", sa.String(length=32), nullable=False),
+        sa.Column("archived_through", sa.DateTime(timezone=True), nullable=False),
+        sa.Column(
+            "updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.PrimaryKeyConstraint("name"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("telemetry_archive_state")
@@ -0,0 +1,28 @@
+"""Record the schedule slot each leader-only job last ran for."""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20250106_0007"
+down_revision = "20241230_0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "scheduled_job_slots",
+        sa.Column("job", sa.String(length=64), nullable=False),
+        sa.Column("slot_start", sa.DateTime(timezone=True), nullable=False),
+        sa.Column(
+            "updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.PrimaryKeyConstraint("job"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("scheduled_job_slots")
@@ -1,3 +1,18 @@
-from .main import app, create_app
+import os
+from typing import Any
+
+if os.environ.get("API_STARTUP_PROFILE", "").lower() in {"1", "true", "yes"}:
+    from . import profiling
+
+    profiling.install()
 
 __all__ = ["app", "create_app"]
+
+
+def __getattr__(name: str) -> Any:
+    # Importing app.models or app.services (scripts, workers) should not build the API.
+    if name in __all__:
+        from . import main
+
+        return getattr(main, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..db.query_budget import report, start_tracking, stop_tracking
+from .metrics import HTTP_REQUEST_DURATION, HTTP_REQUESTS, HTTP_REQUESTS_IN_PROGRESS
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording request counts and latency per route template.
+
+    Routes are labelled by their template (``/buses/{bus_id}/telemetry``) rather than the
+    raw path so label cardinality stays bounded. Server-sent event streams are counted
+    but kept out of the latency histogram, since they stay open for minutes.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        streaming = False
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code, streaming
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                for name, value in message.get("headers", ()):
+                    if name == b"content-type" and value.startswith(b"text/event-stream"):
+                        streaming = True
+            await send(message)
+
+        HTTP_REQUESTS_IN_PROGRESS.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            HTTP_REQUESTS_IN_PROGRESS.dec()
+            # The router stores the matched route on the shared scope dict.
+            route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+            method = scope["method"]
+            HTTP_REQUESTS.inc(method, route, str(status_code))
+            if not streaming:
+                HTTP_REQUEST_DURATION.observe(elapsed, method, route)
+
+
+class QueryBudgetMiddleware:
+    """Pure ASGI middleware counting the statements and database time of each request.
+
+    Outside production the totals are returned as ``X-DB-Query-Count``,
+    ``X-DB-Query-Time-Ms`` and ``X-DB-Repeated-Statements`` headers. Requests over the
+    statement budget or repeating one statement ``repeat_threshold`` times (a likely
+    N+1) are logged once the handler finishes.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        max_statements: int,
+        repeat_threshold: int,
+        expose_headers: bool = True,
+    ) -> None:
+        self.app = app
+        self.max_statements = max_statements
+        self.repeat_threshold = repeat_threshold
+        self.expose_headers = expose_headers
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats, token = start_tracking()
+
+        async def send_with_stats(message: Message) -> None:
+            if message["type"] == "http.response.start" and self.expose_headers:
+                repeated = len(stats.repeated(self.repeat_threshold))
+                message["headers"] = [
+                    *message.get("headers", ()),
+                    (b"x-db-query-count", str(stats.statements).encode()),
+                    (b"x-db-query-time-ms", f"{stats.seconds * 1000:.3f}".encode()),
+                    (b"x-db-repeated-statements", str(repeated).encode()),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            stop_tracking(token)
+            route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+            report(
+                stats,
+                f"{scope['method']} {route}",
+                max_statements=self.max_statements,
+                repeat_threshold=self.repeat_threshold,
+            )
@@ -0,0 +1,29 @@
+"""Fast JSON path for bulk list responses.
+
+Endpoints keep ``response_model`` so the OpenAPI contract is unchanged, but return a
+:class:`BulkJSONResponse` built from plain row dicts. FastAPI passes ``Response``
+instances through untouched, so no Pydantic model is instantiated or validated per
+row; orjson encodes the rows directly. Row keys must therefore match the schema's
+field names, which the contract tests in ``tests/test_bulk_responses.py`` check.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+# Matches Pydantic's JSON output: UTC datetimes end in "Z", enums render as values.
+JSON_OPTIONS = orjson.OPT_UTC_Z
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, option=JSON_OPTIONS)
+
+
+class BulkJSONResponse(JSONResponse):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -1,10 +1,18 @@
 from .base import Base, TimestampMixin
-from .session import get_db_session, get_engine, get_sessionmaker
+from .session import (
+    get_db_session,
+    get_engine,
+    get_read_session,
+    get_replica_set,
+    get_sessionmaker,
+)
 
 __all__ = [
     "Base",
     "TimestampMixin",
     "get_db_session",
     "get_engine",
+    "get_read_session",
+    "get_replica_set",
     "get_sessionmaker",
 ]
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from ..core.metrics import DB_POOL_WAIT, DB_QUERY_DURATION, REGISTRY
+
+_QUERY_START_KEY = "metrics_query_start"
+# Engines rather than pools: ``dispose()`` swaps in a fresh pool.
+_instrumented_engines: list[Engine] = []
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Async queue pool that records how long each checkout takes.
+
+    The measured time covers waiting for a free connection, opening an overflow
+    connection when needed, and any checkout-time ping.
+    """
+
+    def connect(self) -> Any:
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            DB_POOL_WAIT.observe(time.perf_counter() - started)
+
+
+def statement_operation(statement: str) -> str:
+    """Return the leading SQL keyword (SELECT, INSERT, WITH, ...) as a low-cardinality label."""
+
+    head = statement.lstrip()[:16].split(None, 1)
+    return head[0].upper() if head else "UNKNOWN"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault(_QUERY_START_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    starts = conn.info.get(_QUERY_START_KEY)
+    if not starts:
+        return
+    DB_QUERY_DURATION.observe(time.perf_counter() - starts.pop(), statement_operation(statement))
+
+
+def _handle_error(exception_context) -> None:
+    connection = exception_context.connection
+    if connection is not None:
+        starts = connection.info.get(_QUERY_START_KEY)
+        if starts:
+            starts.pop()
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Attach query timing to ``engine`` and report its pool through the pool gauges."""
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+    _instrumented_engines.append(engine)
+
+
+def _pool_total(attribute: str) -> float:
+    total = 0
+    for engine in _instrumented_engines:
+        reader = getattr(engine.pool, attribute, None)
+        if reader is not None:
+            total += reader()
+    return float(total)
+
+
+REGISTRY.gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out of the pool",
+    callback=lambda: _pool_total("checkedout"),
+)
+REGISTRY.gauge(
+    "db_pool_overflow",
+    "Connections open beyond the pool size (negative while the pool is still filling)",
+    callback=lambda: _pool_total("overflow"),
+)
+REGISTRY.gauge(
+    "db_pool_size",
+    "Configured number of pooled connections",
+    callback=lambda: _pool_total("size"),
+)
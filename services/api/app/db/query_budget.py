@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from ..core.config import get_settings
+from ..core.metrics import REGISTRY
+from .instrumentation import statement_operation
+
+logger = logging.getLogger(__name__)
+
+OVER_BUDGET = REGISTRY.counter(
+    "db_query_budget_exceeded_total", "Requests that ran more statements than the query budget"
+)
+SUSPECTED_N_PLUS_ONE = REGISTRY.counter(
+    "db_suspected_n_plus_one_total", "Statements repeated often enough within a request to flag"
+)
+SLOW_QUERY_PLANS = REGISTRY.counter(
+    "db_slow_query_plans_total", "Slow statements whose plan was captured", ("outcome",)
+)
+
+_QUERY_START_KEY = "query_budget_start"
+_current_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+ExplainFunc = Callable[[str, Any], Awaitable[str]]
+
+
+@dataclass
+class QueryStats:
+    """Statements and database time accumulated by one request."""
+
+    statements: int = 0
+    seconds: float = 0.0
+    executions: Counter[str] = field(default_factory=Counter)
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.statements += 1
+        self.seconds += elapsed
+        self.executions[statement] += 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Statements executed at least ``threshold`` times, most frequent first."""
+
+        return [(sql, count) for sql, count in self.executions.most_common() if count >= threshold]
+
+
+def current_query_stats() -> QueryStats | None:
+    return _current_stats.get()
+
+
+def start_tracking() -> tuple[QueryStats, Any]:
+    """Begin counting statements for the current context; returns the stats and a reset token."""
+
+    stats = QueryStats()
+    return stats, _current_stats.set(stats)
+
+
+def stop_tracking(token: Any) -> None:
+    _current_stats.reset(token)
+
+
+class SlowQueryLog:
+    """Ring buffer of ``EXPLAIN (ANALYZE, BUFFERS)`` plans for slow SELECT statements.
+
+    Plans are captured after the fact on a separate connection so the request that ran
+    the slow statement never waits for the second execution. Parameters are used to run
+    the plan and then dropped; only the statement text is kept.
+    """
+
+    def __init__(self, capacity: int, threshold_seconds: float | None) -> None:
+        self.threshold_seconds = threshold_seconds
+        self._entries: deque[dict[str, Any]] = deque(maxlen=capacity)
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._capturing: set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def entries(self) -> list[dict[str, Any]]:
+        """Captured plans, newest first."""
+
+        return list(reversed(self._entries))
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def should_capture(self, statement: str, elapsed: float) -> bool:
+        return (
+            self.threshold_seconds is not None
+            and elapsed >= self.threshold_seconds
+            and statement_operation(statement) == "SELECT"
+            and statement not in self._capturing
+        )
+
+    def capture(
+        self, explain: ExplainFunc, statement: str, parameters: Any, elapsed: float
+    ) -> None:
+        """Schedule a plan capture on the running loop; a no-op outside one."""
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._capturing.add(statement)
+        task = loop.create_task(self._capture(explain, statement, parameters, elapsed))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _capture(
+        self, explain: ExplainFunc, statement: str, parameters: Any, elapsed: float
+    ) -> None:
+        # The plan's own statement must not count against the request that triggered it.
+        _current_stats.set(None)
+        entry = {
+            "captured_at": datetime.now(timezone.utc),
+            "duration_ms": round(elapsed * 1000, 3),
+            "statement": statement,
+            "plan": None,
+            "error": None,
+        }
+        try:
+            entry["plan"] = await explain(statement, parameters)
+            SLOW_QUERY_PLANS.inc("captured")
+        except (OSError, SQLAlchemyError) as exc:
+            entry["error"] = str(exc).splitlines()[0] if str(exc) else type(exc).__name__
+            SLOW_QUERY_PLANS.inc("error")
+        finally:
+            self._capturing.discard(statement)
+        self._entries.append(entry)
+
+
+@lru_cache
+def get_slow_query_log() -> SlowQueryLog:
+    """Return the process-wide slow query log."""
+
+    settings = get_settings()
+    threshold = settings.slow_query_explain_ms
+    return SlowQueryLog(
+        settings.slow_query_log_size, None if threshold is None else threshold / 1000
+    )
+
+
+def explain_with(engine: AsyncEngine) -> ExplainFunc:
+    """Return a function running ``EXPLAIN (ANALYZE, BUFFERS)`` on its own connection."""
+
+    async def explain(statement: str, parameters: Any) -> str:
+        async with engine.connect() as connection:
+            # ANALYZE executes the statement; SELECTs only, and never left committed.
+            result = await connection.exec_driver_sql(
+                f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters
+            )
+            lines = [row[0] for row in result]
+            await connection.rollback()
+        return "\n".join(lines)
+
+    return explain
+
+
+def instrument_query_budget(engine: AsyncEngine) -> None:
+    """Count statements run under :func:`start_tracking` and capture slow query plans.
+
+    Plans are only captured on PostgreSQL, where ``EXPLAIN (ANALYZE, BUFFERS)`` exists.
+    """
+
+    sync_engine: Engine = engine.sync_engine
+    explain = explain_with(engine) if sync_engine.dialect.name == "postgresql" else None
+
+    def before(conn: Connection, cursor, statement, parameters, context, executemany) -> None:
+        conn.info.setdefault(_QUERY_START_KEY, []).append(time.perf_counter())
+
+    def after(conn: Connection, cursor, statement, parameters, context, executemany) -> None:
+        starts = conn.info.get(_QUERY_START_KEY)
+        if not starts:
+            return
+        elapsed = time.perf_counter() - starts.pop()
+        stats = _current_stats.get()
+        if stats is None:
+            return
+        stats.record(statement, elapsed)
+        slow_log = get_slow_query_log()
+        if explain is not None and slow_log.should_capture(statement, elapsed):
+            slow_log.capture(explain, statement, parameters, elapsed)
+
+    def handle_error(exception_context) -> None:
+        connection = exception_context.connection
+        if connection is not None:
+            starts = connection.info.get(_QUERY_START_KEY)
+            if starts:
+                starts.pop()
+
+    event.listen(sync_engine, "before_cursor_execute", before)
+    event.listen(sync_engine, "after_cursor_execute", after)
+    event.listen(sync_engine, "handle_error", handle_error)
+
+
+def report(stats: QueryStats, route: str, *, max_statements: int, repeat_threshold: int) -> int:
+    """Log budget overruns and suspected N+1 patterns; returns the number of repeated statements."""
+
+    if stats.statements > max_statements:
+        OVER_BUDGET.inc()
+        logger.warning(
+            "%s ran %d statements (budget %d, %.1f ms in the database)",
+            route,
+            stats.statements,
+            max_statements,
+            stats.seconds * 1000,
+        )
+    repeated = stats.repeated(repeat_threshold)
+    for statement, count in repeated:
+        SUSPECTED_N_PLUS_ONE.inc()
+        logger.warning("Suspected N+1 in %s: %d executions of %s", route, count, statement)
+    return len(repeated)
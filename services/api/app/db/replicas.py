@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Callable, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+logger = logging.getLogger(__name__)
+
+# The last replayed commit's age also grows while the primary is idle, so a replica that
+# has replayed everything it received counts as current. Without a WAL receiver (archive
+# recovery) the received LSN is NULL and the commit age is used.
+REPLICA_LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+@dataclass
+class Replica:
+    name: str
+    engine: AsyncEngine
+    sessionmaker: async_sessionmaker[AsyncSession]
+    down_until: float = 0.0
+
+
+class ReplicaSet:
+    """Round-robin over read replicas, skipping ones that recently failed.
+
+    A replica is marked down when a connection attempt or health check fails and is
+    offered again once ``retry_after`` seconds pass. ``choose`` returns ``None`` when no
+    replica is usable so callers can fall back to the primary.
+    """
+
+    def __init__(
+        self,
+        engines: Sequence[AsyncEngine],
+        *,
+        retry_after: float = 30.0,
+        max_lag_seconds: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._replicas = [
+            Replica(
+                name=make_url(engine.url).render_as_string(hide_password=True),
+                engine=engine,
+                sessionmaker=async_sessionmaker(bind=engine, expire_on_commit=False),
+            )
+            for engine in engines
+        ]
+        self._retry_after = retry_after
+        self._max_lag_seconds = max_lag_seconds
+        self._clock = clock
+        self._next = 0
+
+    def __len__(self) -> int:
+        return len(self._replicas)
+
+    @property
+    def replicas(self) -> list[Replica]:
+        return list(self._replicas)
+
+    def healthy(self) -> list[Replica]:
+        now = self._clock()
+        return [replica for replica in self._replicas if replica.down_until <= now]
+
+    def choose(self) -> Replica | None:
+        now = self._clock()
+        for _ in range(len(self._replicas)):
+            replica = self._replicas[self._next % len(self._replicas)]
+            self._next += 1
+            if replica.down_until <= now:
+                return replica
+        return None
+
+    def mark_down(self, replica: Replica) -> None:
+        if replica.down_until <= self._clock():
+            logger.warning("Read replica %s is unavailable; using other sources", replica.name)
+        replica.down_until = self._clock() + self._retry_after
+
+    def mark_up(self, replica: Replica) -> None:
+        replica.down_until = 0.0
+
+    async def check(self, timeout: float = 5.0) -> None:
+        """Probe every replica once, updating its health."""
+
+        await asyncio.gather(*(self._check_one(replica, timeout) for replica in self._replicas))
+
+    async def _check_one(self, replica: Replica, timeout: float) -> None:
+        try:
+            async with asyncio.timeout(timeout):
+                async with replica.engine.connect() as connection:
+                    lag = float((await connection.execute(REPLICA_LAG_QUERY)).scalar_one())
+        except (OSError, TimeoutError, SQLAlchemyError):
+            self.mark_down(replica)
+            return
+        if self._max_lag_seconds is not None and lag > self._max_lag_seconds:
+            logger.warning("Read replica %s is %.1fs behind; skipping it", replica.name, lag)
+            self.mark_down(replica)
+            return
+        self.mark_up(replica)
+
+    async def monitor(self, interval: float) -> None:
+        """Run health checks forever; intended to run as a background task."""
+
+        while True:
+            await self.check()
+            await asyncio.sleep(interval)
+
+    async def dispose(self) -> None:
+        for replica in self._replicas:
+            await replica.engine.dispose()
@@ -1,16 +1,31 @@
 from __future__ import annotations
 
+import asyncio
 from functools import lru_cache
 from typing import AsyncIterator
 
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 
 from ..core.config import get_settings
+from .instrumentation import TimedQueuePool, instrument_engine
+from .query_budget import instrument_query_budget
+from .replicas import ReplicaSet
 
 
-def _create_engine() -> AsyncEngine:
+def _create_engine(url: str | None = None) -> AsyncEngine:
     settings = get_settings()
-    return create_async_engine(settings.database_url, echo=settings.debug)
+    url = url or settings.database_url
+    options = {}
+    if make_url(url).get_backend_name() == "postgresql":
+        options["poolclass"] = TimedQueuePool
+    engine = create_async_engine(url, echo=settings.debug, **options)
+    if settings.metrics_enabled:
+        instrument_engine(engine.sync_engine)
+    if settings.query_budget_enabled:
+        instrument_query_budget(engine)
+    return engine
 
 
 @lru_cache
@@ -27,9 +42,70 @@ def get_sessionmaker() -> async_sessionmaker[AsyncSession]:
     return async_sessionmaker(bind=get_engine(), expire_on_commit=False)
 
 
+@lru_cache
+def get_replica_set() -> ReplicaSet:
+    """Return the cached set of read-replica engines (empty when none are configured)."""
+
+    settings = get_settings()
+    return ReplicaSet(
+        [_create_engine(url) for url in settings.database_replica_urls],
+        retry_after=settings.database_replica_retry_seconds,
+        max_lag_seconds=settings.database_replica_max_lag_seconds,
+    )
+
+
+async def warm_engine_pool(engine: AsyncEngine, connections: int) -> int:
+    """Open ``connections`` pooled connections at once and hand them back to the pool.
+
+    Doing this at startup moves TCP, TLS and authentication round trips off the first
+    requests a new worker serves.
+    """
+
+    results = await asyncio.gather(
+        *(engine.connect().start() for _ in range(connections)), return_exceptions=True
+    )
+    opened = [result for result in results if not isinstance(result, BaseException)]
+    for connection in opened:
+        await connection.close()
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return len(opened)
+
+
 async def get_db_session() -> AsyncIterator[AsyncSession]:
     """FastAPI dependency that yields an async database session."""
 
     session_factory = get_sessionmaker()
     async with session_factory() as session:
         yield session
+
+
+async def get_read_session() -> AsyncIterator[AsyncSession]:
+    """FastAPI dependency that yields a session for read-only queries.
+
+    Sessions are spread round-robin across healthy replicas. A replica that cannot hand
+    out a connection is marked down and the next one is tried; with none left the
+    primary serves the read. Replicas may lag the primary, so read-your-writes paths
+    should keep using ``get_db_session``.
+    """
+
+    replicas = get_replica_set()
+    for _ in range(len(replicas)):
+        replica = replicas.choose()
+        if replica is None:
+            break
+        session = replica.sessionmaker()
+        try:
+            # Connect eagerly so a dead replica fails here rather than mid-request.
+            await session.connection()
+        except (OSError, SQLAlchemyError):
+            await session.close()
+            replicas.mark_down(replica)
+            continue
+        async with session:
+            yield session
+        return
+
+    async for session in get_db_session():
+        yield session
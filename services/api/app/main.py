@@ -1,14 +1,40 @@
+import asyncio
+import contextlib
+import logging
+
 from fastapi import FastAPI
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import configure_mappers
 
+from . import profiling
 from .core.config import get_settings
 from .core.logging import configure_logging
-from .db.session import get_engine
+from .core.metrics import monitor_event_loop_lag
+from .core.middleware import MetricsMiddleware, QueryBudgetMiddleware
+from .db.session import get_engine, get_replica_set, get_sessionmaker, warm_engine_pool
 from .routers import register_routers
+from .routers.admin import router as admin_router
+from .routers.metrics import router as metrics_router
+from .services.archive import ArchiveLocationError, get_telemetry_archive
+from .services.jobs import build_scheduler
+from .services.map_matching import get_route_matcher
+from .services.positions import get_position_store, warm_position_store
+from .services.prediction_reads import PredictionInvalidationListener, get_prediction_reads
+from .services.travel_profiles import get_travel_profiles
+from .services.write_behind import get_telemetry_buffer
+
+logger = logging.getLogger(__name__)
 
 
 def create_app() -> FastAPI:
     settings = get_settings()
     configure_logging(settings.log_level)
+    profiler = profiling.get_profiler()
+    if profiler is None and settings.startup_profile:
+        # Enabled via .env rather than the process environment: imports so far are missed.
+        profiler = profiling.install()
+    if profiler is not None:
+        profiler.mark("app modules imported")
 
     app = FastAPI(
         title=settings.app_name,
@@ -19,7 +45,23 @@ def create_app() -> FastAPI:
     )
 
     register_routers(app)
+    if settings.metrics_enabled:
+        app.add_middleware(MetricsMiddleware)
+        app.include_router(metrics_router)
+    if settings.query_budget_enabled:
+        app.add_middleware(
+            QueryBudgetMiddleware,
+            max_statements=settings.query_budget_max_statements,
+            repeat_threshold=settings.query_repeat_threshold,
+            expose_headers=settings.environment != "production",
+        )
+        # Plans include statement text and are served without auth; keep them off production.
+        if settings.environment != "production":
+            app.include_router(admin_router)
     register_event_handlers(app)
+    if profiler is not None:
+        app.add_middleware(profiling.FirstRequestProbe)
+        profiler.mark("app created")
     return app
 
 
@@ -28,13 +70,109 @@ def register_event_handlers(app: FastAPI) -> None:
 
     @app.on_event("startup")
     async def _startup() -> None:
-        # Ensure the async engine is instantiated on application boot.
-        get_engine()
+        settings = get_settings()
+        # Resolve relationships now rather than on the first ORM query a request makes.
+        configure_mappers()
+        await _warm_pools(settings.database_pool_warm_connections)
+        if settings.warm_position_store:
+            await _warm_position_store()
+        await _load_route_shapes()
+        await _check_telemetry_archive()
+        # Read the profile file now rather than during the first prediction run.
+        get_travel_profiles()
+        if settings.prediction_cache_listen:
+            app.state.prediction_listener = await _listen_for_prediction_updates()
+        replicas = get_replica_set()
+        if len(replicas):
+            app.state.replica_monitor = asyncio.create_task(
+                replicas.monitor(settings.database_replica_check_seconds)
+            )
+        if settings.metrics_enabled:
+            app.state.loop_lag_task = asyncio.create_task(
+                monitor_event_loop_lag(settings.event_loop_lag_interval_seconds)
+            )
+        get_telemetry_buffer().start()
+        if settings.scheduler_enabled:
+            app.state.scheduler = build_scheduler(settings)
+            app.state.scheduler.start()
+        profiler = profiling.get_profiler()
+        if profiler is not None:
+            profiler.mark("startup hooks finished")
 
     @app.on_event("shutdown")
     async def _shutdown() -> None:
+        scheduler = getattr(app.state, "scheduler", None)
+        if scheduler is not None:
+            await scheduler.stop()
+        for name in ("loop_lag_task", "replica_monitor"):
+            task = getattr(app.state, name, None)
+            if task is not None:
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+        # Flush before the engine goes away so accepted single records are not lost.
+        await get_telemetry_buffer().stop()
+        listener = getattr(app.state, "prediction_listener", None)
+        if listener is not None:
+            await listener.stop()
+        await get_replica_set().dispose()
         engine = get_engine()
         await engine.dispose()
 
 
+async def _warm_pools(connections: int) -> None:
+    engines = [get_engine(), *(replica.engine for replica in get_replica_set().replicas)]
+    if connections <= 0:
+        return
+    try:
+        await asyncio.gather(*(warm_engine_pool(engine, connections) for engine in engines))
+    except (OSError, SQLAlchemyError):
+        # Connections are opened on demand instead; the first requests just pay for them.
+        logger.warning("Could not warm the database connection pools", exc_info=True)
+
+
+async def _warm_position_store() -> None:
+    try:
+        async with get_sessionmaker()() as session:
+            loaded = await warm_position_store(session, get_position_store())
+    except (OSError, SQLAlchemyError):
+        # Serve anyway: the ingest path fills the store as telemetry arrives.
+        logger.warning("Could not warm the bus position store", exc_info=True)
+        return
+    logger.info("Warmed bus position store with %d positions", loaded)
+
+
+async def _load_route_shapes() -> None:
+    try:
+        async with get_sessionmaker()() as session:
+            loaded = await get_route_matcher().load(session)
+    except (OSError, SQLAlchemyError):
+        # Fixes go unmatched until the scheduled segment sync loads the shapes.
+        logger.warning("Could not load route shapes for map matching", exc_info=True)
+        return
+    logger.info("Loaded %d route shapes for map matching", loaded)
+
+
+async def _check_telemetry_archive() -> None:
+    try:
+        async with get_sessionmaker()() as session:
+            await get_telemetry_archive().check(session)
+    except ArchiveLocationError:
+        # Serving would silently drop every archived day from history and exports.
+        raise
+    except (OSError, SQLAlchemyError):
+        logger.warning("Could not check the telemetry archive location", exc_info=True)
+
+
+async def _listen_for_prediction_updates() -> PredictionInvalidationListener | None:
+    listener = PredictionInvalidationListener(get_prediction_reads())
+    try:
+        await listener.start(get_engine())
+    except (OSError, SQLAlchemyError):
+        # Without the listener, cached predictions still expire after their TTL.
+        logger.warning("Could not listen for prediction cache invalidations", exc_info=True)
+        return None
+    return listener
+
+
 app = create_app()
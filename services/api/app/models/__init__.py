@@ -1,14 +1,25 @@
 from .bus import Bus, BusStatus
 from .prediction import Prediction
 from .route import Route
+from .route_geometry import RouteSegmentStat, RouteShapePoint, RouteStop
+from .scheduler import ScheduledJobSlot
 from .telemetry import TelemetryRecord
+from .telemetry_archive import TelemetryArchiveState
+from .telemetry_rollup import RollupWatermark, TelemetryRollup
 from .traffic_snapshot import TrafficSnapshot
 
 __all__ = [
     "Bus",
     "BusStatus",
     "Prediction",
+    "RollupWatermark",
     "Route",
+    "RouteSegmentStat",
+    "RouteShapePoint",
+    "RouteStop",
+    "ScheduledJobSlot",
+    "TelemetryArchiveState",
     "TelemetryRecord",
+    "TelemetryRollup",
     "TrafficSnapshot",
 ]
@@ -37,7 +37,12 @@ class Bus(TimestampMixin, Base):
     )
     last_service_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
 
-    route: Mapped["Route"] = relationship("Route", back_populates="buses")
+    route: Mapped["Route"] = relationship("Route", back_populates="buses", lazy="raise_on_sql")
+    # Deletes rely on ON DELETE CASCADE rather than loading a bus's whole history.
     telemetry_records: Mapped[list["TelemetryRecord"]] = relationship(
-        "TelemetryRecord", back_populates="bus", cascade="all, delete-orphan"
+        "TelemetryRecord",
+        back_populates="bus",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise_on_sql",
     )
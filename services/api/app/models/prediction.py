@@ -28,7 +28,9 @@ class Prediction(TimestampMixin, Base):
     confidence: Mapped[float | None] = mapped_column(Float)
     notes: Mapped[str | None] = mapped_column(String(512))
 
-    route: Mapped["Route"] = relationship("Route", back_populates="predictions")
-    traffic_snapshot: Mapped["TrafficSnapshot" | None] = relationship(
-        "TrafficSnapshot", back_populates="predictions"
+    route: Mapped["Route"] = relationship(
+        "Route", back_populates="predictions", lazy="raise_on_sql"
+    )
+    traffic_snapshot: Mapped["TrafficSnapshot | None"] = relationship(
+        "TrafficSnapshot", back_populates="predictions", lazy="raise_on_sql"
     )
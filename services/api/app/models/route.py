@@ -25,5 +25,9 @@ class Route(TimestampMixin, Base):
         Boolean, nullable=False, server_default=expression.true(), default=True
     )
 
-    buses: Mapped[list["Bus"]] = relationship("Bus", back_populates="route")
-    predictions: Mapped[list["Prediction"]] = relationship("Prediction", back_populates="route")
+    buses: Mapped[list["Bus"]] = relationship(
+        "Bus", back_populates="route", passive_deletes=True, lazy="raise_on_sql"
+    )
+    predictions: Mapped[list["Prediction"]] = relationship(
+        "Prediction", back_populates="route", passive_deletes=True, lazy="raise_on_sql"
+    )
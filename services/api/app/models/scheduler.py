@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ..db.base import Base
+
+
+class ScheduledJobSlot(Base):
+    """The latest schedule slot each leader-only job has been claimed for.
+
+    Replicas share slot boundaries, so a replica that wins the advisory lock after the
+    slot already ran elsewhere (its jitter delayed it past that run) sees the claim and
+    skips instead of running the job a second time.
+    """
+
+    __tablename__ = "scheduled_job_slots"
+
+    job: Mapped[str] = mapped_column(String(64), primary_key=True)
+    slot_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ..db.base import Base
+
+
+class TelemetryArchiveState(Base):
+    """Which archive directory holds the telemetry deleted from ``telemetry_records``.
+
+    The archiver writes ``archive_id`` into the archive root the first time it runs and
+    records it here in the same transaction as its deletes, so a process whose archive
+    path is a different (e.g. replica-local) directory is refused instead of silently
+    missing the archived days.
+    """
+
+    __tablename__ = "telemetry_archive_state"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    archive_id: Mapped[str] = mapped_column(String(32), nullable=False)
+    archived_through: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Float, ForeignKey, Index, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ..db.base import Base
+
+
+class TelemetryRollup(Base):
+    """Per-bus telemetry aggregates at a fixed bucket width.
+
+    Sums and counts are stored instead of averages so buckets can be re-aggregated into
+    coarser widths (and across a route's buses) without skewing the means.
+    """
+
+    __tablename__ = "telemetry_rollups"
+    __table_args__ = (
+        Index(
+            "ix_telemetry_rollups_route_bucket", "resolution_seconds", "route_id", "bucket_start"
+        ),
+    )
+
+    resolution_seconds: Mapped[int] = mapped_column(Integer, primary_key=True)
+    bus_id: Mapped[int] = mapped_column(
+        ForeignKey("buses.id", ondelete="CASCADE"), primary_key=True
+    )
+    bucket_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    route_id: Mapped[int] = mapped_column(
+        ForeignKey("routes.id", ondelete="CASCADE"), nullable=False
+    )
+    ping_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    speed_sum: Mapped[float | None] = mapped_column(Float)
+    speed_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    load_sum: Mapped[int | None] = mapped_column(BigInteger)
+    load_count: Mapped[int] = mapped_column(Integer, nullable=False)
+
+
+class RollupWatermark(Base):
+    __tablename__ = "rollup_watermarks"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    watermark: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
@@ -3,7 +3,8 @@ from __future__ import annotations
 from datetime import datetime
 from typing import TYPE_CHECKING, Any
 
-from sqlalchemy import DateTime, Float, Integer, JSON, String
+from sqlalchemy import JSON, Computed, DateTime, Float, Index, Integer, String, Text, text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ..db.base import Base, TimestampMixin
@@ -13,7 +14,24 @@ if TYPE_CHECKING:
 
 
 class TrafficSnapshot(TimestampMixin, Base):
+    """Congestion/incident observation from an external feed.
+
+    ``payload`` is JSONB on PostgreSQL with a ``jsonb_path_ops`` GIN index for containment
+    filters; the most queried keys are also promoted to indexed generated columns.
+    """
+
     __tablename__ = "traffic_snapshots"
+    __table_args__ = (
+        Index(
+            "ix_traffic_snapshots_payload",
+            "payload",
+            postgresql_using="gin",
+            postgresql_ops={"payload": "jsonb_path_ops"},
+        ),
+        Index("ix_traffic_snapshots_source_captured_at", "source", text("captured_at DESC")),
+        Index("ix_traffic_snapshots_incident_type_captured_at", "incident_type", "captured_at"),
+        Index("ix_traffic_snapshots_segment_captured_at", "segment_id", "captured_at"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     source: Mapped[str] = mapped_column(String(64), nullable=False)
@@ -21,8 +39,17 @@ class TrafficSnapshot(TimestampMixin, Base):
     congestion_index: Mapped[int] = mapped_column(Integer, nullable=False)
     incident_count: Mapped[int] = mapped_column(Integer, nullable=False)
     average_speed_kph: Mapped[float | None] = mapped_column(Float)
-    payload: Mapped[dict[str, Any] | None] = mapped_column(JSON)
+    payload: Mapped[dict[str, Any] | None] = mapped_column(
+        JSON().with_variant(JSONB(), "postgresql")
+    )
+    incident_type: Mapped[str | None] = mapped_column(
+        Text, Computed("payload ->> 'incident_type'", persisted=True)
+    )
+    segment_id: Mapped[str | None] = mapped_column(
+        Text, Computed("payload ->> 'segment_id'", persisted=True)
+    )
 
+    # Deleting a snapshot leaves its predictions to ON DELETE SET NULL in the database.
     predictions: Mapped[list["Prediction"]] = relationship(
-        "Prediction", back_populates="traffic_snapshot", cascade="all, delete-orphan"
+        "Prediction", back_populates="traffic_snapshot", passive_deletes=True, lazy="raise_on_sql"
     )
@@ -0,0 +1,155 @@
+"""Opt-in startup profiling, enabled with ``API_STARTUP_PROFILE=true``.
+
+When enabled, the ``app`` package installs an import hook before anything heavy loads.
+The hook times every module's execution, including self time without nested imports.
+It also records startup phases through to the first served request, and logs a report
+once that request completes. This module must only import the standard library.
+"""
+
+from __future__ import annotations
+
+import importlib.abc
+import logging
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+ENV_FLAG = "API_STARTUP_PROFILE"
+REPORT_MODULES = 25
+
+
+@dataclass
+class ModuleTiming:
+    name: str
+    cumulative: float
+    self_time: float
+
+
+@dataclass
+class StartupProfiler:
+    started: float = field(default_factory=time.perf_counter)
+    modules: list[ModuleTiming] = field(default_factory=list)
+    phases: list[tuple[str, float]] = field(default_factory=list)
+    _stack: list[float] = field(default_factory=list)
+    reported: bool = False
+
+    def mark(self, phase: str) -> None:
+        """Record that ``phase`` finished, relative to when profiling started."""
+
+        self.phases.append((phase, time.perf_counter() - self.started))
+
+    def run_module(self, name: str, loader: Any, module: Any) -> None:
+        self._stack.append(0.0)
+        started = time.perf_counter()
+        try:
+            loader.exec_module(module)
+        finally:
+            elapsed = time.perf_counter() - started
+            nested = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += elapsed
+            self.modules.append(ModuleTiming(name, elapsed, elapsed - nested))
+
+    def report(self) -> str:
+        lines = ["Startup profile (seconds since profiling began):"]
+        lines.extend(f"  {phase:<28}{offset:>9.3f}" for phase, offset in self.phases)
+        total = sum(timing.self_time for timing in self.modules)
+        lines.append(f"Imported {len(self.modules)} modules in {total:.3f}s; slowest (self time):")
+        slowest = sorted(self.modules, key=lambda timing: timing.self_time, reverse=True)
+        lines.extend(
+            f"  {timing.name:<48}{timing.self_time * 1000:>9.1f} ms"
+            f"  (cumulative {timing.cumulative * 1000:.1f} ms)"
+            for timing in slowest[:REPORT_MODULES]
+        )
+        own = [timing for timing in self.modules if timing.name.split(".")[0] == "app"]
+        if own:
+            lines.append("Application modules (cumulative):")
+            lines.extend(
+                f"  {timing.name:<48}{timing.cumulative * 1000:>9.1f} ms"
+                for timing in sorted(own, key=lambda timing: timing.cumulative, reverse=True)
+            )
+        return "\n".join(lines)
+
+
+class _TimedLoader:
+    """Loader proxy that times ``exec_module`` and forwards everything else."""
+
+    def __init__(self, loader: Any, name: str, profiler: StartupProfiler) -> None:
+        self._loader = loader
+        self._name = name
+        self._profiler = profiler
+
+    def __getattr__(self, attribute: str) -> Any:
+        return getattr(self._loader, attribute)
+
+    def create_module(self, spec: Any) -> Any:
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module: Any) -> None:
+        self._profiler.run_module(self._name, self._loader, module)
+
+
+class _ImportTimer(importlib.abc.MetaPathFinder):
+    def __init__(self, profiler: StartupProfiler) -> None:
+        self._profiler = profiler
+
+    def find_spec(self, fullname: str, path: Any, target: Any = None) -> Any:
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(spec.loader, fullname, self._profiler)
+        return spec
+
+
+_profiler: StartupProfiler | None = None
+
+
+def install() -> StartupProfiler:
+    """Start profiling imports (idempotent) and return the process-wide profiler."""
+
+    global _profiler
+    if _profiler is None:
+        _profiler = StartupProfiler()
+        sys.meta_path.insert(0, _ImportTimer(_profiler))
+    return _profiler
+
+
+def get_profiler() -> StartupProfiler | None:
+    return _profiler
+
+
+def finish() -> None:
+    """Stop timing imports and log the report; called once the first request completes."""
+
+    profiler = _profiler
+    if profiler is None or profiler.reported:
+        return
+    profiler.reported = True
+    sys.meta_path[:] = [finder for finder in sys.meta_path if not isinstance(finder, _ImportTimer)]
+    logger.info("%s", profiler.report())
+
+
+class FirstRequestProbe:
+    """ASGI middleware marking when the first HTTP request has been served."""
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+        self._seen = False
+
+    async def __call__(self, scope: Any, receive: Any, send: Any) -> None:
+        await self.app(scope, receive, send)
+        if scope["type"] == "http" and not self._seen:
+            self._seen = True
+            profiler = get_profiler()
+            if profiler is not None:
+                profiler.mark("first request served")
+            finish()
@@ -1,6 +1,12 @@
 from fastapi import FastAPI
 
+from .buses import router as buses_router
 from .health import router as health_router
+from .live import router as live_router
+from .rollups import router as rollups_router
+from .routes import router as routes_router
+from .telemetry import router as telemetry_router
+from .traffic import router as traffic_router
 from .version import router as version_router
 
 
@@ -9,3 +15,9 @@ def register_routers(app: FastAPI) -> None:
 
     app.include_router(health_router)
     app.include_router(version_router)
+    app.include_router(telemetry_router)
+    app.include_router(live_router)
+    app.include_router(buses_router)
+    app.include_router(routes_router)
+    app.include_router(rollups_router)
+    app.include_router(traffic_router)
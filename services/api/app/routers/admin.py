@@ -0,0 +1,23 @@
+from fastapi import APIRouter, status
+
+from ..core.responses import BulkJSONResponse
+from ..db.query_budget import get_slow_query_log
+from ..schemas.admin import SlowQueryLogOut
+
+router = APIRouter(prefix="/admin", tags=["system"])
+
+
+@router.get("/slow-queries", response_model=SlowQueryLogOut, status_code=status.HTTP_200_OK)
+def read_slow_queries() -> BulkJSONResponse:
+    """Return the captured plans of recent slow statements, newest first."""
+
+    slow_log = get_slow_query_log()
+    items = slow_log.entries()
+    threshold = slow_log.threshold_seconds
+    return BulkJSONResponse(
+        {
+            "threshold_ms": None if threshold is None else threshold * 1000,
+            "count": len(items),
+            "items": items,
+        }
+    )
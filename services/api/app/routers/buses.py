@@ -0,0 +1,140 @@
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.responses import BulkJSONResponse
+from ..db.session import get_read_session
+from ..models.bus import BusStatus
+from ..schemas.bus import BusPositionsResponse, NearbyBusesResponse
+from ..schemas.fleet import BusPage, BusSummary
+from ..schemas.history import TelemetryPage
+from ..services.fleet import FleetLoaders, FleetService
+from ..services.history import HistoryService, SortOrder
+from ..services.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, InvalidCursorError
+from ..services.positions import get_position_store
+
+router = APIRouter(prefix="/buses", tags=["buses"])
+_history_service = HistoryService()
+_fleet_service = FleetService()
+
+
+async def get_fleet_loaders(session: AsyncSession = Depends(get_read_session)) -> FleetLoaders:
+    """Request-scoped batch loaders sharing the request's read session."""
+
+    return FleetLoaders(session)
+
+
+@router.get("", response_model=BusPage, status_code=status.HTTP_200_OK)
+async def list_buses(
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(default=None, description="Continuation token from a prior page"),
+    route_id: int | None = Query(default=None, description="Only buses assigned to this route"),
+    bus_status: BusStatus | None = Query(
+        default=None, alias="status", description="Only buses with this operational status"
+    ),
+    session: AsyncSession = Depends(get_read_session),
+    loaders: FleetLoaders = Depends(get_fleet_loaders),
+) -> BulkJSONResponse:
+    """Page through the fleet with each bus's route and newest stored fix.
+
+    Runs a fixed number of queries per page: one for buses joined to their routes and
+    one batched lookup for the latest telemetry of every bus on the page.
+    """
+
+    try:
+        rows, next_cursor = await _fleet_service.list_buses(
+            session, loaders, limit, cursor=cursor, route_id=route_id, status=bus_status
+        )
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    return BulkJSONResponse({"items": rows, "next_cursor": next_cursor})
+
+
+@router.get("/positions", response_model=BusPositionsResponse, status_code=status.HTTP_200_OK)
+def read_bus_positions(
+    route_id: int | None = Query(default=None, description="Only buses assigned to this route"),
+    bus_status: BusStatus | None = Query(
+        default=None, alias="status", description="Only buses with this operational status"
+    ),
+) -> BulkJSONResponse:
+    """Return the latest known position of every bus from the in-memory store."""
+
+    rows = get_position_store().snapshot(route_id=route_id, status=bus_status)
+    return BulkJSONResponse({"count": len(rows), "positions": rows})
+
+
+@router.get("/nearby", response_model=NearbyBusesResponse, status_code=status.HTTP_200_OK)
+def read_nearby_buses(
+    lat: float = Query(ge=-90, le=90, description="Latitude of the query point"),
+    lon: float = Query(ge=-180, le=180, description="Longitude of the query point"),
+    radius_m: float = Query(default=500, gt=0, le=50_000, description="Search radius in meters"),
+    limit: int = Query(default=50, ge=1, le=1_000, description="Maximum buses to return"),
+    route_id: int | None = Query(default=None, description="Only buses assigned to this route"),
+    bus_status: BusStatus | None = Query(
+        default=None, alias="status", description="Only buses with this operational status"
+    ),
+) -> BulkJSONResponse:
+    """Return buses within a radius of a point, nearest first."""
+
+    rows = get_position_store().nearby(
+        lat, lon, radius_m, limit=limit, route_id=route_id, status=bus_status
+    )
+    return BulkJSONResponse({"count": len(rows), "buses": rows})
+
+
+@router.get("/within", response_model=BusPositionsResponse, status_code=status.HTTP_200_OK)
+def read_buses_within(
+    min_lat: float = Query(ge=-90, le=90, description="Southern edge of the bounding box"),
+    min_lon: float = Query(ge=-180, le=180, description="Western edge of the bounding box"),
+    max_lat: float = Query(ge=-90, le=90, description="Northern edge of the bounding box"),
+    max_lon: float = Query(ge=-180, le=180, description="Eastern edge of the bounding box"),
+    route_id: int | None = Query(default=None, description="Only buses assigned to this route"),
+    bus_status: BusStatus | None = Query(
+        default=None, alias="status", description="Only buses with this operational status"
+    ),
+) -> BulkJSONResponse:
+    """Return buses whose latest position lies inside a bounding box."""
+
+    if min_lat > max_lat or min_lon > max_lon:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Bounding box minimums must not exceed maximums",
+        )
+    rows = get_position_store().within(
+        min_lat, min_lon, max_lat, max_lon, route_id=route_id, status=bus_status
+    )
+    return BulkJSONResponse({"count": len(rows), "positions": rows})
+
+
+@router.get("/{bus_id}/telemetry", response_model=TelemetryPage, status_code=status.HTTP_200_OK)
+async def list_bus_telemetry(
+    bus_id: int,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(default=None, description="Continuation token from a prior page"),
+    start: datetime | None = Query(default=None, description="Inclusive lower bound"),
+    end: datetime | None = Query(default=None, description="Exclusive upper bound"),
+    order: SortOrder = Query(default="desc", description="Sort direction on recorded_at"),
+    session: AsyncSession = Depends(get_read_session),
+) -> BulkJSONResponse:
+    """Page through a bus's telemetry history using keyset pagination."""
+
+    try:
+        rows, next_cursor = await _history_service.list_bus_telemetry(
+            session, bus_id, limit, cursor=cursor, start=start, end=end, order=order
+        )
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    return BulkJSONResponse({"items": rows, "next_cursor": next_cursor})
+
+
+@router.get("/{bus_id}", response_model=BusSummary, status_code=status.HTTP_200_OK)
+async def read_bus(
+    bus_id: int, loaders: FleetLoaders = Depends(get_fleet_loaders)
+) -> BulkJSONResponse:
+    """Return one bus with its route and newest stored fix."""
+
+    row = await _fleet_service.get_bus(loaders, bus_id)
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Bus not found")
+    return BulkJSONResponse(row)
@@ -0,0 +1,100 @@
+import asyncio
+from typing import AsyncIterator
+
+from fastapi import APIRouter, HTTPException, Query, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+
+from ..core.config import get_settings
+from ..services.pubsub import get_telemetry_hub
+
+router = APIRouter(prefix="/telemetry", tags=["telemetry"])
+
+MAX_SUBSCRIPTION_KEYS = 500
+
+
+def _validate_filters(route_ids: list[int], bus_ids: list[int]) -> str | None:
+    if not route_ids and not bus_ids:
+        return "Subscribe to at least one route_id or bus_id"
+    if len(route_ids) + len(bus_ids) > MAX_SUBSCRIPTION_KEYS:
+        return f"At most {MAX_SUBSCRIPTION_KEYS} route_id/bus_id filters are allowed"
+    return None
+
+
+@router.get(
+    "/stream",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    responses={200: {"content": {"text/event-stream": {}}}},
+)
+async def stream_telemetry(
+    route_id: list[int] = Query(default=[], description="Routes to follow"),
+    bus_id: list[int] = Query(default=[], description="Buses to follow"),
+) -> StreamingResponse:
+    """Server-Sent Events stream of position updates for the selected routes and buses."""
+
+    problem = _validate_filters(route_id, bus_id)
+    if problem is not None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=problem)
+
+    hub = get_telemetry_hub()
+    keepalive = get_settings().live_keepalive_seconds
+
+    async def events() -> AsyncIterator[str]:
+        # Subscribe only once the response starts streaming: a client gone before then
+        # never runs this generator, so its finally could not release the mailbox.
+        subscription = hub.subscribe(route_ids=route_id, bus_ids=bus_id)
+        try:
+            yield ": subscribed\n\n"
+            while True:
+                batch = await subscription.next_batch(timeout=keepalive)
+                if not batch:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield "".join(f"event: position\ndata: {message}\n\n" for message in batch)
+        finally:
+            hub.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/ws")
+async def telemetry_websocket(
+    websocket: WebSocket,
+    route_id: list[int] = Query(default=[]),
+    bus_id: list[int] = Query(default=[]),
+) -> None:
+    """WebSocket stream of position updates; each text frame is one JSON position."""
+
+    if _validate_filters(route_id, bus_id) is not None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    hub = get_telemetry_hub()
+    keepalive = get_settings().live_keepalive_seconds
+    disconnected: asyncio.Task[None] | None = None
+    subscription = hub.subscribe(route_ids=route_id, bus_ids=bus_id)
+    try:
+        # Clients never send anything we need; reading only surfaces the disconnect.
+        disconnected = asyncio.create_task(_wait_for_disconnect(websocket))
+        while not disconnected.done():
+            for message in await subscription.next_batch(timeout=keepalive):
+                await websocket.send_text(message)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        if disconnected is not None:
+            disconnected.cancel()
+        hub.unsubscribe(subscription)
+
+
+async def _wait_for_disconnect(websocket: WebSocket) -> None:
+    try:
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        return
@@ -0,0 +1,40 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from ..core.metrics import REGISTRY
+from ..services.positions import get_position_store
+from ..services.pubsub import get_telemetry_hub
+from ..services.write_behind import get_telemetry_buffer
+
+router = APIRouter(tags=["system"])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+REGISTRY.gauge(
+    "position_store_buses",
+    "Buses held in the in-memory position store",
+    callback=lambda: len(get_position_store()),
+)
+REGISTRY.gauge(
+    "live_subscribers",
+    "Open live telemetry streams",
+    callback=lambda: len(get_telemetry_hub()),
+)
+REGISTRY.gauge(
+    "live_dropped_messages",
+    "Messages dropped so far by currently connected slow live subscribers",
+    callback=lambda: get_telemetry_hub().dropped_messages(),
+)
+
+REGISTRY.gauge(
+    "telemetry_buffer_pending",
+    "Single telemetry records waiting in the write-behind buffer",
+    callback=lambda: len(get_telemetry_buffer()),
+)
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def read_metrics() -> PlainTextResponse:
+    """Expose collected metrics in the Prometheus text format."""
+
+    return PlainTextResponse(REGISTRY.render(), media_type=PROMETHEUS_CONTENT_TYPE)
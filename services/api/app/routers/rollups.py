@@ -0,0 +1,47 @@
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.responses import BulkJSONResponse
+from ..db.session import get_read_session
+from ..schemas.rollup import RollupSeries
+from ..services.rollups import TelemetryRollupService
+
+router = APIRouter(prefix="/rollups", tags=["rollups"])
+_rollup_service = TelemetryRollupService()
+
+
+@router.get("/telemetry", response_model=RollupSeries, status_code=status.HTTP_200_OK)
+async def read_telemetry_rollups(
+    start: datetime = Query(description="Inclusive lower bound on bucket start"),
+    end: datetime = Query(description="Exclusive upper bound on bucket start"),
+    resolution_seconds: int = Query(default=300, ge=60, description="Requested bucket width"),
+    bus_id: int | None = Query(default=None, description="Aggregate a single bus"),
+    route_id: int | None = Query(default=None, description="Aggregate all buses on a route"),
+    session: AsyncSession = Depends(get_read_session),
+) -> BulkJSONResponse:
+    """Return speed, load and ping-count series from the coarsest rollup that fits."""
+
+    if (bus_id is None) == (route_id is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Exactly one of bus_id or route_id is required",
+        )
+    if end <= start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="end must be after start"
+        )
+    try:
+        source, rows = await _rollup_service.series(
+            session, resolution_seconds, start, end, bus_id=bus_id, route_id=route_id
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    return BulkJSONResponse(
+        {
+            "resolution_seconds": resolution_seconds,
+            "source_resolution_seconds": source,
+            "buckets": rows,
+        }
+    )
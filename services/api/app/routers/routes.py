@@ -0,0 +1,122 @@
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import get_settings
+from ..core.responses import BulkJSONResponse
+from ..db.session import get_db_session, get_read_session
+from ..schemas.fleet import RouteDetail
+from ..schemas.history import PredictionPage
+from ..schemas.prediction import UpcomingPredictions
+from ..schemas.route_geometry import RouteSegments, RouteShape, RouteShapeRequest
+from ..services.fleet import FleetService
+from ..services.history import HistoryService
+from ..services.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, InvalidCursorError
+from ..services.prediction_reads import get_prediction_reads
+from ..services.route_geometry import RouteGeometryService
+
+router = APIRouter(prefix="/routes", tags=["routes"])
+_history_service = HistoryService()
+_geometry_service = RouteGeometryService()
+_fleet_service = FleetService()
+
+
+@router.get("/{route_id}", response_model=RouteDetail, status_code=status.HTTP_200_OK)
+async def read_route(
+    route_id: int, session: AsyncSession = Depends(get_read_session)
+) -> BulkJSONResponse:
+    """Return a route with the buses assigned to it."""
+
+    payload = await _fleet_service.get_route(session, route_id)
+    if payload is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Route not found")
+    return BulkJSONResponse(payload)
+
+
+@router.get(
+    "/{route_id}/predictions", response_model=PredictionPage, status_code=status.HTTP_200_OK
+)
+async def list_route_predictions(
+    route_id: int,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(default=None, description="Continuation token from a prior page"),
+    start: datetime | None = Query(default=None, description="Inclusive lower bound"),
+    end: datetime | None = Query(default=None, description="Exclusive upper bound"),
+    session: AsyncSession = Depends(get_read_session),
+) -> BulkJSONResponse:
+    """Page through a route's predictions in target-arrival order."""
+
+    try:
+        rows, next_cursor = await _history_service.list_route_predictions(
+            session, route_id, limit, cursor=cursor, start=start, end=end
+        )
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    return BulkJSONResponse({"items": rows, "next_cursor": next_cursor})
+
+
+@router.get(
+    "/{route_id}/predictions/upcoming",
+    response_model=UpcomingPredictions,
+    status_code=status.HTTP_200_OK,
+    responses={status.HTTP_304_NOT_MODIFIED: {"description": "Client copy is current"}},
+)
+async def read_upcoming_predictions(
+    route_id: int, request: Request, session: AsyncSession = Depends(get_db_session)
+) -> Response:
+    """Return a route's upcoming predictions from the read cache, honouring If-None-Match."""
+
+    entry = await get_prediction_reads().upcoming(session, route_id)
+    headers = {
+        "ETag": entry.etag,
+        "Cache-Control": f"max-age={int(get_settings().prediction_cache_ttl_seconds)}",
+    }
+    if _etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+@router.put("/{route_id}/shape", response_model=RouteShape, status_code=status.HTTP_200_OK)
+async def replace_route_shape(
+    route_id: int, shape: RouteShapeRequest, session: AsyncSession = Depends(get_db_session)
+) -> BulkJSONResponse:
+    """Store a route's polyline and stops, snapping stops onto the shape."""
+
+    payload = await _geometry_service.save_shape(session, route_id, shape)
+    if payload is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Route not found")
+    return BulkJSONResponse(payload)
+
+
+@router.get("/{route_id}/shape", response_model=RouteShape, status_code=status.HTTP_200_OK)
+async def read_route_shape(
+    route_id: int, session: AsyncSession = Depends(get_read_session)
+) -> BulkJSONResponse:
+    """Return a route's polyline and stops with their along-route distances."""
+
+    payload = await _geometry_service.shape(session, route_id)
+    if payload is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Route has no shape")
+    return BulkJSONResponse(payload)
+
+
+@router.get(
+    "/{route_id}/segments", response_model=RouteSegments, status_code=status.HTTP_200_OK
+)
+async def read_route_segments(
+    route_id: int, session: AsyncSession = Depends(get_read_session)
+) -> BulkJSONResponse:
+    """Return each shape segment with its learned traversal time."""
+
+    items = await _geometry_service.segments(session, route_id)
+    if items is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Route has no shape")
+    return BulkJSONResponse({"route_id": route_id, "items": items})
+
+
+def _etag_matches(header: str | None, etag: str) -> bool:
+    if not header:
+        return False
+    candidates = {candidate.strip().removeprefix("W/") for candidate in header.split(",")}
+    return "*" in candidates or etag in candidates
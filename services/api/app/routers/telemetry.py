@@ -0,0 +1,108 @@
+import math
+from dataclasses import asdict
+from datetime import datetime
+from typing import AsyncIterator
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import get_settings
+from ..db.session import get_db_session, get_read_session
+from ..schemas.telemetry import (
+    TelemetryAccepted,
+    TelemetryBatchRequest,
+    TelemetryBatchResponse,
+    TelemetryPoint,
+)
+from ..services.export import MEDIA_TYPES, ExportFormat, TelemetryExportService
+from ..services.telemetry import TelemetryIngestService, validate_point
+from ..services.write_behind import BufferFull, get_telemetry_buffer
+
+router = APIRouter(prefix="/telemetry", tags=["telemetry"])
+_ingest_service = TelemetryIngestService()
+_export_service = TelemetryExportService()
+
+
+@router.post(
+    "",
+    response_model=TelemetryAccepted,
+    status_code=status.HTTP_202_ACCEPTED,
+    responses={429: {"description": "The write buffer is full; retry after Retry-After seconds"}},
+)
+async def submit_telemetry(point: TelemetryPoint) -> TelemetryAccepted:
+    """Buffer a single fix for the next bulk insert instead of writing it inline."""
+
+    reason = validate_point(point)
+    if reason is not None:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=reason)
+    buffer = get_telemetry_buffer()
+    try:
+        buffered = buffer.submit(point)
+    except BufferFull as exc:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(exc),
+            headers={"Retry-After": str(max(math.ceil(exc.retry_after), 1))},
+        ) from exc
+    return TelemetryAccepted(buffered=buffered, pending=len(buffer))
+
+
+@router.post("/batch", response_model=TelemetryBatchResponse, status_code=status.HTTP_200_OK)
+async def ingest_telemetry_batch(
+    batch: TelemetryBatchRequest, session: AsyncSession = Depends(get_db_session)
+) -> TelemetryBatchResponse:
+    """Bulk-ingest telemetry fixes, skipping duplicates and reporting rejected rows."""
+
+    limit = get_settings().telemetry_batch_max_records
+    if len(batch.records) > limit:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Batch exceeds the maximum of {limit} records",
+        )
+
+    summary = await _ingest_service.ingest(session, batch.records)
+    return TelemetryBatchResponse(**asdict(summary))
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    responses={200: {"content": {media_type: {} for media_type in MEDIA_TYPES.values()}}},
+)
+async def export_telemetry(
+    start: datetime = Query(description="Inclusive lower bound on recorded_at"),
+    end: datetime = Query(description="Exclusive upper bound on recorded_at"),
+    bus_id: int | None = Query(default=None, description="Only export this bus"),
+    route_id: int | None = Query(default=None, description="Only export buses on this route"),
+    export_format: ExportFormat = Query(default="ndjson", alias="format"),
+) -> StreamingResponse:
+    """Stream telemetry history as NDJSON or CSV without buffering it in memory.
+
+    Rows are ordered by bus, then time, including ranges reaching into the archive.
+    """
+
+    if end <= start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="end must be after start"
+        )
+    archived, stmt = _export_service.plan(start, end, bus_id=bus_id, route_id=route_id)
+
+    async def body() -> AsyncIterator[bytes]:
+        if stmt is None:
+            async for chunk in _export_service.stream(None, None, export_format, archived):
+                yield chunk
+            return
+        # Dependencies with yield are closed before a streaming body is sent, so the
+        # stream drives get_read_session itself to keep the cursor's session open.
+        async for session in get_read_session():
+            async for chunk in _export_service.stream(session, stmt, export_format, archived):
+                yield chunk
+
+    filename = f"telemetry-{start:%Y%m%dT%H%M%S}-{end:%Y%m%dT%H%M%S}.{export_format}"
+    return StreamingResponse(
+        body(),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -0,0 +1,79 @@
+import json
+from datetime import datetime
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.responses import BulkJSONResponse
+from ..db.session import get_read_session
+from ..schemas.traffic import LatestTrafficSnapshots, TrafficSnapshotPage
+from ..services.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, InvalidCursorError
+from ..services.traffic import TrafficSnapshotService
+
+router = APIRouter(prefix="/traffic", tags=["traffic"])
+_traffic_service = TrafficSnapshotService()
+
+
+def _parse_payload_filter(raw: str | None) -> dict[str, Any] | None:
+    if raw is None:
+        return None
+    try:
+        parsed = json.loads(raw)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="payload must be a JSON object"
+        ) from exc
+    if not isinstance(parsed, dict):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="payload must be a JSON object"
+        )
+    return parsed
+
+
+@router.get("/snapshots", response_model=TrafficSnapshotPage, status_code=status.HTTP_200_OK)
+async def list_traffic_snapshots(
+    source: str | None = Query(default=None, description="Only snapshots from this feed"),
+    start: datetime | None = Query(default=None, description="Inclusive lower bound"),
+    end: datetime | None = Query(default=None, description="Exclusive upper bound"),
+    incident_type: str | None = Query(default=None, description="Match payload incident_type"),
+    segment_id: str | None = Query(default=None, description="Match payload segment_id"),
+    payload: str | None = Query(
+        default=None,
+        description='JSON object the payload must contain, e.g. {"severity": 3}',
+    ),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(default=None, description="Continuation token from a prior page"),
+    session: AsyncSession = Depends(get_read_session),
+) -> BulkJSONResponse:
+    """Page through traffic snapshots, newest first, filtered on columns and payload."""
+
+    try:
+        rows, next_cursor = await _traffic_service.list_snapshots(
+            session,
+            limit,
+            cursor=cursor,
+            source=source,
+            start=start,
+            end=end,
+            incident_type=incident_type,
+            segment_id=segment_id,
+            payload=_parse_payload_filter(payload),
+        )
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    return BulkJSONResponse({"items": rows, "next_cursor": next_cursor})
+
+
+@router.get(
+    "/snapshots/latest", response_model=LatestTrafficSnapshots, status_code=status.HTTP_200_OK
+)
+async def read_latest_traffic_snapshots(
+    source: list[str] | None = Query(default=None, description="Limit to these feeds"),
+    since: datetime | None = Query(default=None, description="Ignore snapshots older than this"),
+    session: AsyncSession = Depends(get_read_session),
+) -> BulkJSONResponse:
+    """Return the newest snapshot of every source (or of the requested ones)."""
+
+    rows = await _traffic_service.latest_per_source(session, sources=source, since=since)
+    return BulkJSONResponse({"items": rows})
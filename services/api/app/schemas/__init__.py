@@ -1,4 +1,49 @@
+from .admin import SlowQueryLogOut
+from .bus import BusPosition, BusPositionsResponse, NearbyBus, NearbyBusesResponse
+from .fleet import BusPage, BusSummary, RouteDetail
 from .health import HealthResponse
+from .history import PredictionOut, PredictionPage, TelemetryPage, TelemetryRecordOut
+from .prediction import UpcomingPredictions
+from .rollup import RollupBucket, RollupSeries
+from .route_geometry import RouteSegment, RouteSegments, RouteShape, RouteShapeRequest
+from .telemetry import (
+    TelemetryAccepted,
+    TelemetryBatchRequest,
+    TelemetryBatchResponse,
+    TelemetryPoint,
+    TelemetryRejection,
+)
+from .traffic import LatestTrafficSnapshots, TrafficSnapshotOut, TrafficSnapshotPage
 from .version import VersionResponse
 
-__all__ = ["HealthResponse", "VersionResponse"]
+__all__ = [
+    "BusPage",
+    "BusPosition",
+    "BusPositionsResponse",
+    "BusSummary",
+    "HealthResponse",
+    "LatestTrafficSnapshots",
+    "NearbyBus",
+    "NearbyBusesResponse",
+    "PredictionOut",
+    "PredictionPage",
+    "RollupBucket",
+    "RollupSeries",
+    "RouteDetail",
+    "RouteSegment",
+    "RouteSegments",
+    "RouteShape",
+    "RouteShapeRequest",
+    "SlowQueryLogOut",
+    "TelemetryAccepted",
+    "TelemetryBatchRequest",
+    "TelemetryBatchResponse",
+    "TelemetryPage",
+    "TelemetryPoint",
+    "TelemetryRecordOut",
+    "TelemetryRejection",
+    "TrafficSnapshotOut",
+    "TrafficSnapshotPage",
+    "UpcomingPredictions",
+    "VersionResponse",
+]
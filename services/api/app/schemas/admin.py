@@ -0,0 +1,17 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+
+class SlowQueryOut(BaseModel):
+    captured_at: datetime = Field(description="When the plan was captured")
+    duration_ms: float = Field(description="Duration of the original execution")
+    statement: str = Field(description="SQL text as sent to the driver, without parameters")
+    plan: str | None = Field(default=None, description="EXPLAIN (ANALYZE, BUFFERS) output")
+    error: str | None = Field(default=None, description="Why the plan could not be captured")
+
+
+class SlowQueryLogOut(BaseModel):
+    threshold_ms: float | None = Field(description="Capture threshold; null when disabled")
+    count: int = Field(description="Number of captured plans returned")
+    items: list[SlowQueryOut] = Field(description="Captured plans, newest first")
@@ -0,0 +1,31 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+from ..models.bus import BusStatus
+
+
+class BusPosition(BaseModel):
+    bus_id: int = Field(description="Identifier of the bus")
+    route_id: int = Field(description="Route the bus is assigned to")
+    status: BusStatus = Field(description="Operational status of the bus")
+    recorded_at: datetime = Field(description="Timestamp of the latest GPS fix")
+    latitude: float = Field(description="WGS84 latitude in decimal degrees")
+    longitude: float = Field(description="WGS84 longitude in decimal degrees")
+    speed_kph: float | None = Field(default=None, description="Ground speed in km/h")
+    heading: int | None = Field(default=None, description="Compass heading in degrees")
+    passenger_load: int | None = Field(default=None, description="Passengers on board")
+
+
+class BusPositionsResponse(BaseModel):
+    count: int = Field(description="Number of positions returned")
+    positions: list[BusPosition] = Field(description="Latest known fix per bus")
+
+
+class NearbyBus(BusPosition):
+    distance_m: float = Field(description="Great-circle distance from the query point in meters")
+
+
+class NearbyBusesResponse(BaseModel):
+    count: int = Field(description="Number of buses returned")
+    buses: list[NearbyBus] = Field(description="Buses within the radius, nearest first")
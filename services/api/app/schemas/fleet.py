@@ -0,0 +1,52 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+from ..models.bus import BusStatus
+
+
+class RouteRef(BaseModel):
+    id: int = Field(description="Route identifier")
+    code: str = Field(description="Short public route code")
+    name: str = Field(description="Route display name")
+
+
+class LatestFix(BaseModel):
+    recorded_at: datetime = Field(description="Timestamp of the newest stored GPS fix")
+    latitude: float = Field(description="WGS84 latitude in decimal degrees")
+    longitude: float = Field(description="WGS84 longitude in decimal degrees")
+    speed_kph: float | None = Field(default=None, description="Ground speed in km/h")
+    heading: int | None = Field(default=None, description="Compass heading in degrees")
+    passenger_load: int | None = Field(default=None, description="Passengers on board")
+
+
+class BusSummary(BaseModel):
+    id: int = Field(description="Bus identifier")
+    fleet_number: str = Field(description="Operator fleet number")
+    status: BusStatus = Field(description="Operational status of the bus")
+    capacity: int = Field(description="Passenger capacity")
+    last_service_at: datetime | None = Field(default=None, description="Last maintenance visit")
+    route: RouteRef = Field(description="Route the bus is assigned to")
+    latest_fix: LatestFix | None = Field(
+        default=None, description="Newest stored telemetry for the bus, if any"
+    )
+
+
+class BusPage(BaseModel):
+    items: list[BusSummary] = Field(description="Buses in this page, ordered by id")
+    next_cursor: str | None = Field(
+        default=None, description="Opaque token for the next page; null on the last page"
+    )
+
+
+class RouteBus(BaseModel):
+    id: int = Field(description="Bus identifier")
+    fleet_number: str = Field(description="Operator fleet number")
+    status: BusStatus = Field(description="Operational status of the bus")
+
+
+class RouteDetail(RouteRef):
+    origin: str = Field(description="First stop of the route")
+    destination: str = Field(description="Last stop of the route")
+    is_active: bool = Field(description="Whether the route is in service")
+    buses: list[RouteBus] = Field(description="Buses assigned to the route")
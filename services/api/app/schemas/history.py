@@ -0,0 +1,42 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+
+class TelemetryRecordOut(BaseModel):
+    id: int = Field(description="Telemetry record identifier")
+    bus_id: int = Field(description="Identifier of the reporting bus")
+    recorded_at: datetime = Field(description="Timestamp of the GPS fix")
+    latitude: float = Field(description="WGS84 latitude in decimal degrees")
+    longitude: float = Field(description="WGS84 longitude in decimal degrees")
+    speed_kph: float | None = Field(default=None, description="Ground speed in km/h")
+    heading: int | None = Field(default=None, description="Compass heading in degrees")
+    passenger_load: int | None = Field(default=None, description="Passengers on board")
+
+
+class TelemetryPage(BaseModel):
+    items: list[TelemetryRecordOut] = Field(description="Telemetry records in this page")
+    next_cursor: str | None = Field(
+        default=None, description="Opaque token for the next page; null on the last page"
+    )
+
+
+class PredictionOut(BaseModel):
+    id: int = Field(description="Prediction identifier")
+    route_id: int = Field(description="Route the prediction applies to")
+    traffic_snapshot_id: int | None = Field(
+        default=None, description="Traffic snapshot used as an input, if any"
+    )
+    target_arrival: datetime = Field(description="Predicted arrival time")
+    estimated_headway_minutes: int | None = Field(default=None, description="Expected headway")
+    travel_time_minutes: int | None = Field(default=None, description="Expected travel time")
+    confidence: float | None = Field(default=None, description="Model confidence (0-1)")
+    notes: str | None = Field(default=None, description="Free-form operator notes")
+    created_at: datetime = Field(description="When the prediction was generated")
+
+
+class PredictionPage(BaseModel):
+    items: list[PredictionOut] = Field(description="Predictions in this page")
+    next_cursor: str | None = Field(
+        default=None, description="Opaque token for the next page; null on the last page"
+    )
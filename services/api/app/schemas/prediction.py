@@ -0,0 +1,8 @@
+from pydantic import BaseModel, Field
+
+from .history import PredictionOut
+
+
+class UpcomingPredictions(BaseModel):
+    route_id: int = Field(description="Route the predictions apply to")
+    items: list[PredictionOut] = Field(description="Upcoming predictions by target arrival")
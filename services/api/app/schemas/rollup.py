@@ -0,0 +1,16 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+
+class RollupBucket(BaseModel):
+    bucket_start: datetime = Field(description="Start of the aggregation bucket")
+    ping_count: int = Field(description="Telemetry fixes received in the bucket")
+    avg_speed_kph: float | None = Field(default=None, description="Mean reported speed")
+    avg_passenger_load: float | None = Field(default=None, description="Mean passenger load")
+
+
+class RollupSeries(BaseModel):
+    resolution_seconds: int = Field(description="Requested bucket width")
+    source_resolution_seconds: int = Field(description="Stored rollup the series was built from")
+    buckets: list[RollupBucket] = Field(description="Buckets in chronological order")
@@ -0,0 +1,50 @@
+from pydantic import BaseModel, Field
+
+
+class ShapePointIn(BaseModel):
+    latitude: float = Field(ge=-90, le=90, description="WGS84 latitude in decimal degrees")
+    longitude: float = Field(ge=-180, le=180, description="WGS84 longitude in decimal degrees")
+
+
+class StopIn(ShapePointIn):
+    name: str = Field(min_length=1, max_length=255, description="Stop name shown to riders")
+
+
+class RouteShapeRequest(BaseModel):
+    points: list[ShapePointIn] = Field(
+        min_length=2, description="Polyline vertices in travel order"
+    )
+    stops: list[StopIn] = Field(default_factory=list, description="Stops in travel order")
+
+
+class ShapePointOut(BaseModel):
+    sequence: int = Field(description="Vertex position along the shape")
+    latitude: float
+    longitude: float
+    distance_m: float = Field(description="Along-route distance from the first vertex")
+
+
+class StopOut(ShapePointOut):
+    name: str = Field(description="Stop name shown to riders")
+
+
+class RouteShape(BaseModel):
+    route_id: int = Field(description="Route the shape belongs to")
+    length_m: float = Field(description="Total along-route length of the shape")
+    points: list[ShapePointOut] = Field(description="Polyline vertices in travel order")
+    stops: list[StopOut] = Field(description="Stops snapped onto the shape, in travel order")
+
+
+class RouteSegment(BaseModel):
+    segment_index: int = Field(description="Segment position; runs from vertex n to n + 1")
+    start_m: float = Field(description="Along-route distance where the segment starts")
+    length_m: float = Field(description="Segment length")
+    traversal_seconds: float | None = Field(
+        default=None, description="Learned time to traverse the segment, if observed"
+    )
+    samples: int = Field(description="Matched telemetry steps folded into the estimate")
+
+
+class RouteSegments(BaseModel):
+    route_id: int = Field(description="Route the segments belong to")
+    items: list[RouteSegment] = Field(description="Segments in travel order")
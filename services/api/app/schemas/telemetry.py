@@ -0,0 +1,43 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+
+class TelemetryPoint(BaseModel):
+    bus_id: int = Field(description="Identifier of the reporting bus")
+    recorded_at: datetime = Field(description="Timestamp of the GPS fix (timezone-aware)")
+    latitude: float = Field(description="WGS84 latitude in decimal degrees")
+    longitude: float = Field(description="WGS84 longitude in decimal degrees")
+    speed_kph: float | None = Field(default=None, description="Ground speed in km/h")
+    heading: int | None = Field(default=None, description="Compass heading in degrees (0-359)")
+    passenger_load: int | None = Field(default=None, description="Passengers on board")
+
+
+class TelemetryBatchRequest(BaseModel):
+    records: list[TelemetryPoint] = Field(
+        min_length=1, description="Telemetry fixes to ingest in a single batch"
+    )
+
+
+class TelemetryRejection(BaseModel):
+    index: int = Field(description="Position of the rejected record in the submitted batch")
+    reason: str = Field(description="Why the record was rejected")
+
+
+class TelemetryBatchResponse(BaseModel):
+    received: int = Field(description="Number of records submitted in the batch")
+    accepted: int = Field(description="Number of records newly written")
+    duplicates: int = Field(description="Records already stored for the same bus and timestamp")
+    rejected: int = Field(description="Records that failed validation and were skipped")
+    rejections: list[TelemetryRejection] = Field(
+        default_factory=list, description="Per-record rejection details"
+    )
+    elapsed_ms: float = Field(description="Wall-clock time spent processing the batch")
+    rows_per_second: float = Field(description="Ingest throughput for the batch")
+
+
+class TelemetryAccepted(BaseModel):
+    buffered: bool = Field(
+        description="False if the same bus and timestamp was already waiting to be written"
+    )
+    pending: int = Field(description="Records waiting for the next bulk insert")
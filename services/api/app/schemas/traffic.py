@@ -0,0 +1,27 @@
+from datetime import datetime
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+
+class TrafficSnapshotOut(BaseModel):
+    id: int = Field(description="Traffic snapshot identifier")
+    source: str = Field(description="Feed that produced the observation")
+    captured_at: datetime = Field(description="When the observation was taken")
+    congestion_index: int = Field(description="Congestion score (0-100)")
+    incident_count: int = Field(description="Incidents reported in the observation")
+    average_speed_kph: float | None = Field(default=None, description="Average traffic speed")
+    incident_type: str | None = Field(default=None, description="Promoted payload incident_type")
+    segment_id: str | None = Field(default=None, description="Promoted payload segment_id")
+    payload: dict[str, Any] | None = Field(default=None, description="Source-specific details")
+
+
+class TrafficSnapshotPage(BaseModel):
+    items: list[TrafficSnapshotOut] = Field(description="Snapshots in this page, newest first")
+    next_cursor: str | None = Field(
+        default=None, description="Opaque token for the next page; null on the last page"
+    )
+
+
+class LatestTrafficSnapshots(BaseModel):
+    items: list[TrafficSnapshotOut] = Field(description="Newest snapshot of each source")
@@ -1,3 +1,22 @@
+from .history import HistoryService
+from .positions import PositionStore, get_position_store, warm_position_store
+from .pubsub import TelemetryHub, get_telemetry_hub
+from .rollups import TelemetryRollupService
+from .spatial import SpatialGrid
 from .system import SystemService
+from .telemetry import TelemetryIngestService
+from .traffic import TrafficSnapshotService
 
-__all__ = ["SystemService"]
+__all__ = [
+    "HistoryService",
+    "PositionStore",
+    "SpatialGrid",
+    "SystemService",
+    "TelemetryHub",
+    "TelemetryIngestService",
+    "TelemetryRollupService",
+    "TrafficSnapshotService",
+    "get_position_store",
+    "get_telemetry_hub",
+    "warm_position_store",
+]
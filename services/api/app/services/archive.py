@@ -0,0 +1,629 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Literal, Sequence
+
+import numpy as np
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import get_settings
+from ..models import Bus, TelemetryArchiveState, TelemetryRecord
+
+logger = logging.getLogger(__name__)
+
+# Column order of archived partitions; ``EXPORT_COLUMNS`` is this without ``id``.
+ARCHIVE_COLUMNS: dict[str, np.dtype] = {
+    "id": np.dtype(np.int64),
+    "bus_id": np.dtype(np.int64),
+    "recorded_at": np.dtype("datetime64[us]"),
+    "latitude": np.dtype(np.float64),
+    "longitude": np.dtype(np.float64),
+    "speed_kph": np.dtype(np.float64),
+    "heading": np.dtype(np.int32),
+    "passenger_load": np.dtype(np.int32),
+}
+# Nullable integer columns store NULL as this sentinel; a nullable float stores NaN.
+NULL_INT = np.iinfo(np.int32).min
+MANIFEST = "manifest.json"
+HORIZON = "horizon.json"
+ARCHIVE_ID = "archive.json"
+# ``telemetry_archive_state`` holds a single row under this name.
+STATE_NAME = "telemetry"
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+Columns = dict[str, np.ndarray]
+SortOrder = Literal["asc", "desc"]
+
+
+class ArchiveVerificationError(RuntimeError):
+    """Archived files do not match what was read from the database; nothing is deleted."""
+
+
+class ArchiveLocationError(RuntimeError):
+    """The archive path is not the directory the database's telemetry was archived into."""
+
+
+def as_utc(moment: datetime) -> datetime:
+    """``moment`` as an aware UTC timestamp; a missing offset means UTC, as in storage."""
+
+    if moment.tzinfo is None:
+        return moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc)
+
+
+def day_start(moment: datetime) -> datetime:
+    return datetime.combine(as_utc(moment).date(), time(), tzinfo=timezone.utc)
+
+
+def epoch_micros(moment: datetime) -> int:
+    """Microseconds since the epoch; naive timestamps are taken to be UTC."""
+
+    return (as_utc(moment) - _EPOCH) // _MICROSECOND
+
+
+def to_datetime64(moment: datetime) -> np.datetime64:
+    return np.datetime64(epoch_micros(moment), "us")
+
+
+def columns_from_rows(rows: Sequence[Sequence[Any]]) -> Columns:
+    """Convert rows in ``ARCHIVE_COLUMNS`` order into typed column arrays."""
+
+    values = list(zip(*rows)) or [()] * len(ARCHIVE_COLUMNS)
+    columns: Columns = {}
+    for (name, dtype), column in zip(ARCHIVE_COLUMNS.items(), values):
+        if name == "recorded_at":
+            micros = [epoch_micros(moment) for moment in column]
+            columns[name] = np.asarray(micros, dtype=np.int64).view(dtype)
+        elif dtype.kind == "i" and name not in ("id", "bus_id"):
+            columns[name] = np.asarray(
+                [NULL_INT if value is None else value for value in column], dtype=dtype
+            )
+        else:
+            # None becomes NaN for the nullable float column.
+            columns[name] = np.asarray(column, dtype=dtype)
+    return columns
+
+
+def rows_from_columns(columns: Columns, names: Sequence[str]) -> list[tuple[Any, ...]]:
+    """Convert (possibly memory-mapped) columns back to rows of Python values."""
+
+    converted = []
+    for name in names:
+        column = columns[name]
+        if name == "recorded_at":
+            values = [
+                moment.replace(tzinfo=timezone.utc)
+                for moment in column.astype("datetime64[us]").astype(object)
+            ]
+        elif name == "speed_kph":
+            values = [None if value != value else value for value in column.tolist()]
+        elif name in ("heading", "passenger_load"):
+            values = [None if value == NULL_INT else value for value in column.tolist()]
+        else:
+            values = column.tolist()
+        converted.append(values)
+    return list(zip(*converted))
+
+
+def merge_columns(parts: Iterable[Columns]) -> Columns:
+    """Concatenate column sets, order by ``(bus_id, recorded_at)`` and drop repeats.
+
+    ``(bus_id, recorded_at)`` is unique in ``telemetry_records``, so a repeat is the same
+    fix seen twice (re-archiving a day after an interrupted run); the first copy wins.
+    """
+
+    parts = list(parts)
+    merged = {
+        name: np.concatenate([part[name] for part in parts]) if parts else np.empty(0, dtype)
+        for name, dtype in ARCHIVE_COLUMNS.items()
+    }
+    order = np.lexsort((merged["recorded_at"], merged["bus_id"]))
+    merged = {name: column[order] for name, column in merged.items()}
+    keep = np.ones(len(order), dtype=bool)
+    keep[1:] = (np.diff(merged["bus_id"]) != 0) | (np.diff(merged["recorded_at"]) != 0)
+    return {name: column[keep] for name, column in merged.items()}
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def write_partition(directory: Path, route_id: int, day: datetime, columns: Columns) -> dict:
+    """Write one route-day as a ``.npy`` file per column plus a checksummed manifest."""
+
+    directory.mkdir(parents=True)
+    bus_ids, offsets, counts = np.unique(columns["bus_id"], return_index=True, return_counts=True)
+    checksums = {}
+    for name in ARCHIVE_COLUMNS:
+        path = directory / f"{name}.npy"
+        with path.open("wb") as handle:
+            np.save(handle, np.ascontiguousarray(columns[name]))
+            handle.flush()
+            os.fsync(handle.fileno())
+        checksums[name] = _sha256(path)
+    recorded_at = columns["recorded_at"]
+    manifest = {
+        "route_id": route_id,
+        "day": day.isoformat(),
+        "rows": int(len(recorded_at)),
+        "first": str(recorded_at.min()) if len(recorded_at) else None,
+        "last": str(recorded_at.max()) if len(recorded_at) else None,
+        # Rows are grouped by bus, so each bus is one contiguous [offset, offset + count).
+        "buses": {
+            str(bus_id): [int(offset), int(count)]
+            for bus_id, offset, count in zip(bus_ids.tolist(), offsets, counts)
+        },
+        "sha256": checksums,
+    }
+    (directory / MANIFEST).write_text(json.dumps(manifest, indent=2))
+    return manifest
+
+
+class ArchivePartition:
+    """One archived route-day; columns are memory-mapped on first access."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.manifest = json.loads((path / MANIFEST).read_text())
+        self.route_id: int = self.manifest["route_id"]
+        self._columns: Columns | None = None
+
+    def __len__(self) -> int:
+        return self.manifest["rows"]
+
+    @property
+    def columns(self) -> Columns:
+        if self._columns is None:
+            self._columns = {
+                name: np.load(self.path / f"{name}.npy", mmap_mode="r") for name in ARCHIVE_COLUMNS
+            }
+        return self._columns
+
+    def bus_ids(self) -> list[int]:
+        return [int(bus_id) for bus_id in self.manifest["buses"]]
+
+    def bus_slice(
+        self, bus_id: int, start: datetime | None = None, end: datetime | None = None
+    ) -> Columns:
+        """Zero-copy views of one bus's rows in ``[start, end)``, oldest first."""
+
+        offset, count = self.manifest["buses"].get(str(bus_id), (0, 0))
+        recorded_at = self.columns["recorded_at"][offset : offset + count]
+        low = 0 if start is None else int(np.searchsorted(recorded_at, to_datetime64(start)))
+        high = count if end is None else int(np.searchsorted(recorded_at, to_datetime64(end)))
+        return {
+            name: column[offset + low : offset + max(low, high)]
+            for name, column in self.columns.items()
+        }
+
+    def verify(self) -> None:
+        """Check every column file against the manifest's row count and checksum."""
+
+        for name, dtype in ARCHIVE_COLUMNS.items():
+            path = self.path / f"{name}.npy"
+            if _sha256(path) != self.manifest["sha256"][name]:
+                raise ArchiveVerificationError(f"{path} does not match its checksum")
+            column = np.load(path, mmap_mode="r")
+            if column.dtype != dtype or len(column) != len(self):
+                raise ArchiveVerificationError(f"{path} has the wrong type or row count")
+
+
+class TelemetryArchive:
+    """Read side of the cold tier: ``<root>/<YYYY-MM-DD>/route-<id>/<column>.npy``.
+
+    ``horizon.json`` records the end of the archived range. Everything before it has
+    been verified and deleted from ``telemetry_records``, so callers read ``[.., horizon)``
+    from here and ``[horizon, ..)`` from the database without seeing a row twice.
+    """
+
+    def __init__(self, root: Path, cache_size: int = 256) -> None:
+        self.root = root
+        self.cache_size = cache_size
+        self._horizon: tuple[float, datetime | None] | None = None
+        self._bus_index: dict[str, dict[int, list[str]]] = {}
+        self._open: OrderedDict[Path, ArchivePartition] = OrderedDict()
+
+    def horizon(self) -> datetime | None:
+        path = self.root / HORIZON
+        try:
+            mtime = path.stat().st_mtime
+        except FileNotFoundError:
+            return None
+        if self._horizon is None or self._horizon[0] != mtime:
+            through = json.loads(path.read_text())["archived_through"]
+            self._horizon = (mtime, datetime.fromisoformat(through))
+            # The archiver rewrites the horizon after every day, including re-archived ones.
+            self._bus_index.clear()
+            self._open.clear()
+        return self._horizon[1]
+
+    def set_horizon(self, through: datetime) -> None:
+        path = self.root / HORIZON
+        self.root.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_name(f".{HORIZON}.tmp")
+        temporary.write_text(json.dumps({"archived_through": through.isoformat()}))
+        os.replace(temporary, path)
+
+    def archive_id(self) -> str | None:
+        try:
+            return json.loads((self.root / ARCHIVE_ID).read_text())["archive_id"]
+        except FileNotFoundError:
+            return None
+
+    def claim(self) -> str:
+        """Return this directory's archive id, creating it on first use."""
+
+        archive_id = self.archive_id()
+        if archive_id is None:
+            archive_id = uuid.uuid4().hex
+            path = self.root / ARCHIVE_ID
+            self.root.mkdir(parents=True, exist_ok=True)
+            temporary = path.with_name(f".{ARCHIVE_ID}.tmp")
+            temporary.write_text(json.dumps({"archive_id": archive_id}))
+            os.replace(temporary, path)
+        return archive_id
+
+    async def check(self, session: AsyncSession) -> TelemetryArchiveState | None:
+        """Fail unless this is the archive the database says holds the deleted telemetry.
+
+        Every API process and the archiver must see the same directory (shared storage):
+        rows are deleted from the shared database once they are in the archive, so a
+        process with its own local copy would silently miss them.
+        """
+
+        state = await session.get(TelemetryArchiveState, STATE_NAME)
+        if state is not None and self.archive_id() != state.archive_id:
+            raise ArchiveLocationError(
+                f"{self.root} is not telemetry archive {state.archive_id}, which holds rows "
+                f"before {state.archived_through:%Y-%m-%d}; mount the shared archive there"
+            )
+        return state
+
+    def day_path(self, day: datetime) -> Path:
+        return self.root / f"{day:%Y-%m-%d}"
+
+    def days(self, start: datetime, end: datetime) -> list[datetime]:
+        """Archived days overlapping ``[start, end)``, clipped to the horizon, oldest first."""
+
+        horizon = self.horizon()
+        if horizon is None:
+            return []
+        end = min(as_utc(end), horizon)
+        day, days = day_start(start), []
+        while day < end:
+            if self.day_path(day).is_dir():
+                days.append(day)
+            day += timedelta(days=1)
+        return days
+
+    def partition(self, path: Path) -> ArchivePartition:
+        """Open (or reuse) a partition; the most recently used ones stay mapped."""
+
+        partition = self._open.get(path)
+        if partition is None:
+            partition = self._open[path] = ArchivePartition(path)
+            if len(self._open) > self.cache_size:
+                self._open.popitem(last=False)
+        else:
+            self._open.move_to_end(path)
+        return partition
+
+    def partitions(self, day: datetime, route_id: int | None = None) -> list[ArchivePartition]:
+        directory = self.day_path(day)
+        if route_id is not None:
+            path = directory / f"route-{route_id}"
+            return [self.partition(path)] if (path / MANIFEST).exists() else []
+        return [
+            self.partition(path)
+            for path in sorted(directory.glob("route-*"))
+            if (path / MANIFEST).exists()
+        ]
+
+    def bus_partitions(self, day: datetime, bus_id: int) -> list[ArchivePartition]:
+        """Partitions of ``day`` holding rows for ``bus_id``, via a cached manifest index."""
+
+        key = f"{day:%Y-%m-%d}"
+        index = self._bus_index.get(key)
+        if index is None:
+            index = {}
+            for partition in self.partitions(day):
+                for archived_bus in partition.bus_ids():
+                    index.setdefault(archived_bus, []).append(partition.path.name)
+            self._bus_index[key] = index
+        directory = self.day_path(day)
+        return [self.partition(directory / name) for name in index.get(bus_id, [])]
+
+    def bus_history(
+        self,
+        bus_id: int,
+        start: datetime | None,
+        end: datetime | None,
+        limit: int,
+        order: SortOrder = "desc",
+    ) -> list[dict[str, Any]]:
+        """Up to ``limit`` archived fixes of one bus in ``[start, end)``, in ``order``."""
+
+        horizon = self.horizon()
+        if horizon is None or limit <= 0:
+            return []
+        end = horizon if end is None else min(as_utc(end), horizon)
+        start = as_utc(start) if start is not None else self._first_day()
+        if start is None or start >= end:
+            return []
+        days = self.days(start, end)
+        if order == "desc":
+            days.reverse()
+        rows: list[dict[str, Any]] = []
+        names = list(ARCHIVE_COLUMNS)
+        for day in days:
+            views = [
+                partition.bus_slice(bus_id, start, end)
+                for partition in self.bus_partitions(day, bus_id)
+            ]
+            chunk = merge_columns(views) if len(views) > 1 else (views[0] if views else None)
+            if chunk is None or not len(chunk["id"]):
+                continue
+            remaining = limit - len(rows)
+            if order == "desc":
+                chunk = {name: column[::-1][:remaining] for name, column in chunk.items()}
+            else:
+                chunk = {name: column[:remaining] for name, column in chunk.items()}
+            rows.extend(dict(zip(names, row)) for row in rows_from_columns(chunk, names))
+            if len(rows) >= limit:
+                break
+        return rows
+
+    def scan(
+        self,
+        start: datetime,
+        end: datetime,
+        bus_id: int | None = None,
+        route_id: int | None = None,
+    ) -> Iterator[Columns]:
+        """Yield archived rows in ``[start, end)`` ordered by ``(bus_id, recorded_at)``.
+
+        Each chunk is one bus-day, so a bus's rows are contiguous across days, matching
+        the live export's order. Routes are the ones buses were assigned to when their
+        day was archived.
+        """
+
+        days = self.days(start, end)
+        if bus_id is not None:
+            buses = [bus_id]
+        else:
+            buses = sorted(
+                {
+                    archived_bus
+                    for day in days
+                    for partition in self.partitions(day, route_id)
+                    for archived_bus in partition.bus_ids()
+                }
+            )
+        for archived_bus in buses:
+            for day in days:
+                views = [
+                    partition.bus_slice(archived_bus, start, end)
+                    for partition in self.bus_partitions(day, archived_bus)
+                    if route_id is None or partition.route_id == route_id
+                ]
+                # A bus reassigned during the day has rows in more than one route.
+                chunk = merge_columns(views) if len(views) > 1 else (views[0] if views else None)
+                if chunk is not None and len(chunk["id"]):
+                    yield chunk
+
+    def export_batches(
+        self,
+        start: datetime,
+        end: datetime,
+        names: Sequence[str],
+        batch_size: int,
+        bus_id: int | None = None,
+        route_id: int | None = None,
+    ) -> Iterator[list[tuple[Any, ...]]]:
+        """Archived rows as ``names``-ordered tuples in batches of at most ``batch_size``."""
+
+        for chunk in self.scan(start, end, bus_id=bus_id, route_id=route_id):
+            for offset in range(0, len(chunk["id"]), batch_size):
+                window = {name: chunk[name][offset : offset + batch_size] for name in names}
+                yield rows_from_columns(window, names)
+
+    def _first_day(self) -> datetime | None:
+        days = sorted(path.name for path in self.root.glob("????-??-??") if path.is_dir())
+        if not days:
+            return None
+        return datetime.fromisoformat(days[0]).replace(tzinfo=timezone.utc)
+
+
+@dataclass(frozen=True, slots=True)
+class ArchiveSummary:
+    days: int
+    rows_archived: int
+    rows_deleted: int
+
+
+class TelemetryArchiver:
+    """Move telemetry older than a cutoff from ``telemetry_records`` into the archive.
+
+    Each UTC day is written to a temporary directory, swapped into place, verified
+    against its checksums and the database row count, and only then deleted from the
+    table in one transaction. A day already in the archive is merged with any rows
+    still in the table, so an interrupted run is simply repeated.
+    """
+
+    def __init__(self, archive: TelemetryArchive, batch_size: int = 50_000) -> None:
+        self.archive = archive
+        self.batch_size = batch_size
+
+    async def run(
+        self, session: AsyncSession, after_days: int, now: datetime | None = None
+    ) -> ArchiveSummary:
+        await self.archive.check(session)
+        now = now or datetime.now(timezone.utc)
+        cutoff = day_start(now - timedelta(days=after_days))
+        oldest = await session.scalar(
+            select(func.min(TelemetryRecord.recorded_at)).where(
+                TelemetryRecord.recorded_at < cutoff
+            )
+        )
+        days = archived = deleted = 0
+        day = day_start(oldest) if oldest is not None else cutoff
+        while day < cutoff:
+            rows, removed = await self.archive_day(session, day)
+            if removed:
+                days += 1
+                archived += rows
+                deleted += removed
+            day += timedelta(days=1)
+        return ArchiveSummary(days=days, rows_archived=archived, rows_deleted=deleted)
+
+    async def archive_day(self, session: AsyncSession, day: datetime) -> tuple[int, int]:
+        """Archive and delete one day of telemetry; returns (rows archived, rows deleted).
+
+        Routes are merged and written one at a time, so memory is bounded by the busiest
+        route-day rather than the whole day.
+        """
+
+        end = day + timedelta(days=1)
+        window = (TelemetryRecord.recorded_at >= day, TelemetryRecord.recorded_at < end)
+        target = self.archive.day_path(day)
+        staging = target.with_name(f".{target.name}.tmp")
+        retired = target.with_name(f".{target.name}.old")
+        self._recover(target, staging, retired)
+        fresh_routes = set(
+            await session.scalars(
+                select(Bus.route_id)
+                .join(TelemetryRecord, TelemetryRecord.bus_id == Bus.id)
+                .where(*window)
+                .distinct()
+            )
+        )
+        if not fresh_routes:
+            return 0, 0
+        # Uncached mappings of the previous files; they stay readable until the swap.
+        existing = {
+            partition.route_id: partition
+            for partition in map(ArchivePartition, sorted(target.glob("route-*")))
+        }
+
+        staging.mkdir(parents=True)
+        expected: dict[int, int] = {}
+        fresh_rows = 0
+        for route_id in sorted(existing.keys() | fresh_routes):
+            path = staging / f"route-{route_id}"
+            previous = existing.get(route_id)
+            if route_id not in fresh_routes:
+                shutil.copytree(previous.path, path)
+                expected[route_id] = len(previous)
+                continue
+            fresh = await self._read_route(session, window, route_id)
+            parts = [fresh] if previous is None else [previous.columns, fresh]
+            columns = merge_columns(parts)
+            expected[route_id] = len(columns["id"])
+            write_partition(path, route_id, day, columns)
+            del columns
+            written = ArchivePartition(path)
+            written.verify()
+            if len(written) != expected[route_id] or not self._covers(written, fresh):
+                raise ArchiveVerificationError(f"{path} is missing rows read from the database")
+            fresh_rows += len(fresh["id"])
+        existing.clear()
+        # The previous files may hold rows already deleted from the table: move them aside
+        # rather than deleting them, so a crash in between leaves a copy to recover.
+        if target.exists():
+            os.replace(target, retired)
+        os.replace(staging, target)
+        shutil.rmtree(retired, ignore_errors=True)
+
+        stored = {
+            partition.route_id: len(partition)
+            for partition in map(ArchivePartition, sorted(target.glob("route-*")))
+        }
+        if stored != expected:
+            raise ArchiveVerificationError(f"{target} does not hold the rows just written")
+
+        result = await session.execute(delete(TelemetryRecord).where(*window))
+        if result.rowcount != fresh_rows:
+            # Rows arrived for this day while it was being archived; try again next run.
+            await session.rollback()
+            raise ArchiveVerificationError(
+                f"Expected to delete {fresh_rows} rows for {day:%Y-%m-%d}, found {result.rowcount}"
+            )
+        await self._record(session, end)
+        await session.commit()
+        # Days are archived oldest first, so everything before ``end`` is now in the archive.
+        horizon = self.archive.horizon()
+        self.archive.set_horizon(end if horizon is None else max(horizon, end))
+        logger.info("Archived %d telemetry rows for %s", fresh_rows, f"{day:%Y-%m-%d}")
+        return sum(expected.values()), fresh_rows
+
+    @staticmethod
+    def _recover(target: Path, staging: Path, retired: Path) -> None:
+        """Finish or roll back a swap an earlier run was interrupted in."""
+
+        if retired.exists():
+            if target.exists():
+                shutil.rmtree(retired)
+            else:
+                # Crashed between the two renames: the old day is the only complete copy.
+                os.replace(retired, target)
+        # A leftover staging directory was never swapped in, so its rows are still in the table.
+        shutil.rmtree(staging, ignore_errors=True)
+
+    async def _record(self, session: AsyncSession, end: datetime) -> None:
+        # Committed with the deletes; a concurrent first run elsewhere conflicts on the key.
+        state = await session.get(TelemetryArchiveState, STATE_NAME)
+        if state is None:
+            session.add(
+                TelemetryArchiveState(
+                    name=STATE_NAME, archive_id=self.archive.claim(), archived_through=end
+                )
+            )
+        elif epoch_micros(state.archived_through) < epoch_micros(end):
+            state.archived_through = end
+
+    async def _read_route(self, session: AsyncSession, window: tuple, route_id: int) -> Columns:
+        stmt = (
+            select(*(getattr(TelemetryRecord, name) for name in ARCHIVE_COLUMNS))
+            .join(Bus, Bus.id == TelemetryRecord.bus_id)
+            .where(*window, Bus.route_id == route_id)
+            .order_by(TelemetryRecord.bus_id, TelemetryRecord.recorded_at)
+        )
+        # Each batch becomes typed arrays as it arrives; only one batch of rows is alive.
+        chunks = []
+        result = await session.stream(stmt.execution_options(yield_per=self.batch_size))
+        async for rows in result.partitions():
+            chunks.append(columns_from_rows(rows))
+        if not chunks:
+            return columns_from_rows([])
+        return {name: np.concatenate([chunk[name] for chunk in chunks]) for name in ARCHIVE_COLUMNS}
+
+    @staticmethod
+    def _covers(written: ArchivePartition, fresh: Columns) -> bool:
+        """Whether every fresh ``(bus_id, recorded_at)`` is among the stored (unique) keys."""
+
+        union = merge_columns([written.columns, fresh])
+        return len(union["id"]) == len(written)
+
+
+@lru_cache
+def get_telemetry_archive() -> TelemetryArchive:
+    """Return the process-wide reader for the configured archive directory."""
+
+    return TelemetryArchive(Path(get_settings().telemetry_archive_path))
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import asyncio
+import bisect
+import csv
+import heapq
+import io
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Iterable, Iterator, Literal, Sequence
+
+import orjson
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import get_settings
+from ..models import Bus, TelemetryRecord
+from .archive import TelemetryArchive, as_utc, get_telemetry_archive
+
+ExportFormat = Literal["ndjson", "csv"]
+
+EXPORT_COLUMNS = (
+    "bus_id",
+    "recorded_at",
+    "latitude",
+    "longitude",
+    "speed_kph",
+    "heading",
+    "passenger_load",
+)
+MEDIA_TYPES: dict[str, str] = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def export_statement(
+    start: datetime,
+    end: datetime,
+    bus_id: int | None = None,
+    route_id: int | None = None,
+) -> Select[Any]:
+    """Build a Core select over telemetry in ``[start, end)``, ordered for index scans."""
+
+    columns = [getattr(TelemetryRecord, name) for name in EXPORT_COLUMNS]
+    stmt = select(*columns).where(
+        TelemetryRecord.recorded_at >= start, TelemetryRecord.recorded_at < end
+    )
+    if bus_id is not None:
+        stmt = stmt.where(TelemetryRecord.bus_id == bus_id)
+    if route_id is not None:
+        stmt = stmt.where(
+            TelemetryRecord.bus_id.in_(select(Bus.id).where(Bus.route_id == route_id))
+        )
+    return stmt.order_by(TelemetryRecord.bus_id, TelemetryRecord.recorded_at)
+
+
+def encode_ndjson(rows: Sequence[Sequence[Any]]) -> bytes:
+    # orjson writes datetimes in isoformat() form, so no per-row conversion is needed.
+    return b"".join(orjson.dumps(dict(zip(EXPORT_COLUMNS, row))) + b"\n" for row in rows)
+
+
+def encode_csv(rows: Sequence[Sequence[Any]], header: bool = False) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    if header:
+        writer.writerow(EXPORT_COLUMNS)
+    writer.writerows(rows)
+    return buffer.getvalue().encode()
+
+
+def _encode_next(
+    batches: Iterator[Sequence[Sequence[Any]]], encode: Callable[..., bytes]
+) -> bytes | None:
+    rows = next(batches, None)
+    return None if rows is None else encode(rows)
+
+
+def _export_key(row: Sequence[Any]) -> tuple[Any, Any]:
+    return row[0], row[1]
+
+
+async def _read_in_thread(
+    batches: Iterable[Sequence[Sequence[Any]]],
+) -> AsyncIterator[Sequence[Sequence[Any]]]:
+    iterator = iter(batches)
+    while (rows := await asyncio.to_thread(next, iterator, None)) is not None:
+        yield rows
+
+
+async def merge_sorted_batches(
+    first: AsyncIterator[Sequence[Sequence[Any]]],
+    second: AsyncIterator[Sequence[Sequence[Any]]],
+) -> AsyncIterator[list[Sequence[Any]]]:
+    """Merge two batch streams that are each ordered by ``(bus_id, recorded_at)``.
+
+    The batch whose last row sorts first goes out whole, with every row of the other
+    batch up to that point; at most one batch per stream is held at a time.
+    """
+
+    heads = [await anext(first, None), await anext(second, None)]
+    sources = (first, second)
+    while heads[0] is not None and heads[1] is not None:
+        done = 0 if _export_key(heads[0][-1]) <= _export_key(heads[1][-1]) else 1
+        other = 1 - done
+        cut = bisect.bisect_right(heads[other], _export_key(heads[done][-1]), key=_export_key)
+        yield list(heapq.merge(heads[done], heads[other][:cut], key=_export_key))
+        heads[other] = heads[other][cut:] or await anext(sources[other], None)
+        heads[done] = await anext(sources[done], None)
+    for head, source in zip(heads, sources):
+        while head is not None:
+            yield list(head)
+            head = await anext(source, None)
+
+
+class TelemetryExportService:
+    """Stream telemetry history through a server-side cursor in fixed-size batches.
+
+    Ranges reaching back past the archive horizon are read from both the memory-mapped
+    cold tier and the table, and merged so the whole export is ordered by
+    ``(bus_id, recorded_at)``.
+    """
+
+    def __init__(self, archive: TelemetryArchive | None = None) -> None:
+        self._archive = archive
+
+    def plan(
+        self,
+        start: datetime,
+        end: datetime,
+        bus_id: int | None = None,
+        route_id: int | None = None,
+    ) -> tuple[Iterable[Sequence[Sequence[Any]]] | None, Select[Any] | None]:
+        """Split ``[start, end)`` into archived row batches and a live-table statement."""
+
+        start, end = as_utc(start), as_utc(end)
+        archive = self._archive or get_telemetry_archive()
+        horizon = archive.horizon()
+        if horizon is None or start >= horizon:
+            return None, export_statement(start, end, bus_id=bus_id, route_id=route_id)
+        archived = archive.export_batches(
+            start,
+            min(end, horizon),
+            EXPORT_COLUMNS,
+            get_settings().export_batch_size,
+            bus_id=bus_id,
+            route_id=route_id,
+        )
+        if end <= horizon:
+            return archived, None
+        return archived, export_statement(horizon, end, bus_id=bus_id, route_id=route_id)
+
+    async def stream(
+        self,
+        session: AsyncSession | None,
+        stmt: Select[Any] | None,
+        export_format: ExportFormat,
+        archived: Iterable[Sequence[Sequence[Any]]] | None = None,
+    ) -> AsyncIterator[bytes]:
+        if export_format == "csv":
+            # Send the header before the query starts so clients see bytes immediately.
+            yield encode_csv([], header=True)
+        encode = encode_csv if export_format == "csv" else encode_ndjson
+
+        # Reading mapped pages and converting them to rows is CPU and disk work; it stays
+        # off the event loop one batch at a time.
+        if session is None or stmt is None:
+            if archived is not None:
+                batches = iter(archived)
+                while (chunk := await asyncio.to_thread(_encode_next, batches, encode)) is not None:
+                    yield chunk
+            return
+        batch_size = get_settings().export_batch_size
+        result = await session.stream(stmt.execution_options(yield_per=batch_size))
+        live = result.partitions()
+        if archived is not None:
+            live = merge_sorted_batches(_read_in_thread(archived), live)
+        async for rows in live:
+            yield encode(rows)
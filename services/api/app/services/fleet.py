@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Sequence
+
+from sqlalchemy import Integer, Select, column, select, true, values
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
+
+from ..models import Bus, BusStatus, Route, TelemetryRecord
+from .loaders import BatchLoader
+from .pagination import InvalidCursorError, decode_cursor, encode_cursor
+
+LATEST_FIX_COLUMNS = (
+    TelemetryRecord.bus_id,
+    TelemetryRecord.recorded_at,
+    TelemetryRecord.latitude,
+    TelemetryRecord.longitude,
+    TelemetryRecord.speed_kph,
+    TelemetryRecord.heading,
+    TelemetryRecord.passenger_load,
+)
+
+
+def latest_fix_statement(bus_ids: Sequence[int]) -> Select:
+    """Newest telemetry row for each bus, one ``ix_telemetry_bus_recorded_at`` probe each."""
+
+    wanted = values(column("bus_id", Integer), name="wanted_buses").data(
+        [(bus_id,) for bus_id in dict.fromkeys(bus_ids)]
+    )
+    latest = (
+        select(*LATEST_FIX_COLUMNS)
+        .where(TelemetryRecord.bus_id == wanted.c.bus_id)
+        .order_by(TelemetryRecord.recorded_at.desc())
+        .limit(1)
+        .lateral("latest")
+    )
+    return select(latest).select_from(wanted.join(latest, true()))
+
+
+def route_summary(route: Route) -> dict[str, Any]:
+    return {"id": route.id, "code": route.code, "name": route.name}
+
+
+def bus_summary(bus: Bus, latest_fix: dict[str, Any] | None) -> dict[str, Any]:
+    return {
+        "id": bus.id,
+        "fleet_number": bus.fleet_number,
+        "status": bus.status,
+        "capacity": bus.capacity,
+        "last_service_at": bus.last_service_at,
+        "route": route_summary(bus.route),
+        "latest_fix": latest_fix,
+    }
+
+
+class FleetLoaders:
+    """Per-request batch loaders over one session.
+
+    Handlers (or helpers they call concurrently) ask for single ids; the loaders turn
+    those into one ``IN``/``VALUES`` query per kind, whatever the page size.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+        lock = asyncio.Lock()
+        self.routes: BatchLoader[int, Route] = BatchLoader(self._routes, lock=lock)
+        self.buses: BatchLoader[int, Bus] = BatchLoader(self._buses, lock=lock)
+        self.latest_fix: BatchLoader[int, dict[str, Any]] = BatchLoader(
+            self._latest_fixes, lock=lock
+        )
+
+    async def _routes(self, ids: list[int]) -> dict[int, Route]:
+        rows = await self._session.scalars(select(Route).where(Route.id.in_(ids)))
+        return {route.id: route for route in rows}
+
+    async def _buses(self, ids: list[int]) -> dict[int, Bus]:
+        rows = await self._session.scalars(
+            select(Bus).options(joinedload(Bus.route, innerjoin=True)).where(Bus.id.in_(ids))
+        )
+        return {bus.id: bus for bus in rows}
+
+    async def _latest_fixes(self, bus_ids: list[int]) -> dict[int, dict[str, Any]]:
+        rows = await self._session.execute(latest_fix_statement(bus_ids))
+        fixes = {}
+        for row in rows.mappings():
+            fix = dict(row)
+            # Keyed by bus; ``LatestFix`` does not carry the id itself.
+            fixes[fix.pop("bus_id")] = fix
+        return fixes
+
+
+class FleetService:
+    """Bus and route reads with the eager loading each use case needs.
+
+    Relationships are declared ``lazy="raise_on_sql"``, so every read here states its
+    loading strategy up front: many-to-one parents are joined in, collections come from
+    ``selectinload``, and per-bus latest telemetry goes through :class:`FleetLoaders`.
+    """
+
+    async def list_buses(
+        self,
+        session: AsyncSession,
+        loaders: FleetLoaders,
+        limit: int,
+        cursor: str | None = None,
+        route_id: int | None = None,
+        status: BusStatus | None = None,
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        stmt = select(Bus).options(joinedload(Bus.route, innerjoin=True)).order_by(Bus.id)
+        if route_id is not None:
+            stmt = stmt.where(Bus.route_id == route_id)
+        if status is not None:
+            stmt = stmt.where(Bus.status == status)
+        if cursor is not None:
+            after = decode_cursor("buses", cursor).get("id")
+            if not isinstance(after, int):
+                raise InvalidCursorError("Malformed cursor")
+            stmt = stmt.where(Bus.id > after)
+
+        buses = list(await session.scalars(stmt.limit(limit + 1)))
+        next_cursor = None
+        if len(buses) > limit:
+            buses = buses[:limit]
+            next_cursor = encode_cursor("buses", id=buses[-1].id)
+        for bus in buses:
+            loaders.buses.prime(bus.id, bus)
+            loaders.routes.prime(bus.route.id, bus.route)
+        fixes = await loaders.latest_fix.load_many(bus.id for bus in buses)
+        return [bus_summary(bus, fix) for bus, fix in zip(buses, fixes)], next_cursor
+
+    async def get_bus(self, loaders: FleetLoaders, bus_id: int) -> dict[str, Any] | None:
+        bus, fix = await asyncio.gather(loaders.buses.load(bus_id), loaders.latest_fix.load(bus_id))
+        return None if bus is None else bus_summary(bus, fix)
+
+    async def get_route(self, session: AsyncSession, route_id: int) -> dict[str, Any] | None:
+        route = await session.scalar(
+            select(Route).options(selectinload(Route.buses)).where(Route.id == route_id)
+        )
+        if route is None:
+            return None
+        return {
+            **route_summary(route),
+            "origin": route.origin,
+            "destination": route.destination,
+            "is_active": route.is_active,
+            "buses": [
+                {"id": bus.id, "fleet_number": bus.fleet_number, "status": bus.status}
+                for bus in sorted(route.buses, key=lambda bus: bus.id)
+            ],
+        }
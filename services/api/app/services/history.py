@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Any, Literal
+
+from sqlalchemy import Select, and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models import Prediction, TelemetryRecord
+from .archive import TelemetryArchive, as_utc, get_telemetry_archive
+from .pagination import InvalidCursorError, cursor_datetime, decode_cursor, encode_cursor
+
+SortOrder = Literal["asc", "desc"]
+
+
+class HistoryService:
+    """Keyset-paginated listings backed by the composite (parent, timestamp) indexes.
+
+    Every page is a single index range scan that starts where the previous page ended,
+    so deep pages cost the same as the first one. Telemetry older than the archive
+    horizon is read from the cold-tier archive and spliced in at the horizon.
+    """
+
+    def __init__(self, archive: TelemetryArchive | None = None) -> None:
+        self._archive = archive
+
+    async def list_bus_telemetry(
+        self,
+        session: AsyncSession,
+        bus_id: int,
+        limit: int,
+        cursor: str | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        order: SortOrder = "desc",
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        # Compared with the (aware) archive horizon below; a missing offset means UTC.
+        start = as_utc(start) if start is not None else None
+        end = as_utc(end) if end is not None else None
+        recorded_at = TelemetryRecord.recorded_at
+        stmt = select(
+            TelemetryRecord.id,
+            TelemetryRecord.bus_id,
+            recorded_at,
+            TelemetryRecord.latitude,
+            TelemetryRecord.longitude,
+            TelemetryRecord.speed_kph,
+            TelemetryRecord.heading,
+            TelemetryRecord.passenger_load,
+        ).where(TelemetryRecord.bus_id == bus_id)
+        if start is not None:
+            stmt = stmt.where(recorded_at >= start)
+        if end is not None:
+            stmt = stmt.where(recorded_at < end)
+        after = None
+        if cursor is not None:
+            # (bus_id, recorded_at) is unique, so the timestamp alone is a total order.
+            after = cursor_datetime(decode_cursor("telemetry", cursor), "t")
+            stmt = stmt.where(recorded_at < after if order == "desc" else recorded_at > after)
+        stmt = stmt.order_by(recorded_at.desc() if order == "desc" else recorded_at.asc())
+
+        archive = self._archive or get_telemetry_archive()
+        horizon = archive.horizon()
+        if horizon is None or (start is not None and start >= horizon):
+            rows = await self._fetch(session, stmt, limit + 1)
+        else:
+            # Everything before the horizon has moved to the archive; newest rows come
+            # from the table, so the table leads a descending page and trails an ascending one.
+            if order == "desc":
+                archived_start, archived_end = start, after if after is not None else end
+            else:
+                archived_start = start if after is None else after + timedelta(microseconds=1)
+                archived_end = end
+            stmt = stmt.where(recorded_at >= horizon)
+            live = (end is None or end > horizon) and (
+                order == "asc" or after is None or after > horizon
+            )
+            rows = await self._fetch(session, stmt, limit + 1) if live and order == "desc" else []
+            rows += archive.bus_history(
+                bus_id, archived_start, archived_end, limit + 1 - len(rows), order
+            )
+            if live and order == "asc" and len(rows) <= limit:
+                rows += await self._fetch(session, stmt, limit + 1 - len(rows))
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor("telemetry", t=rows[-1]["recorded_at"].isoformat())
+        return rows, next_cursor
+
+    @staticmethod
+    async def _fetch(session: AsyncSession, stmt: Select[Any], limit: int) -> list[dict[str, Any]]:
+        return [dict(row) for row in (await session.execute(stmt.limit(limit))).mappings()]
+
+    async def list_route_predictions(
+        self,
+        session: AsyncSession,
+        route_id: int,
+        limit: int,
+        cursor: str | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        target = Prediction.target_arrival
+        stmt = select(
+            Prediction.id,
+            Prediction.route_id,
+            Prediction.traffic_snapshot_id,
+            target,
+            Prediction.estimated_headway_minutes,
+            Prediction.travel_time_minutes,
+            Prediction.confidence,
+            Prediction.notes,
+            Prediction.created_at,
+        ).where(Prediction.route_id == route_id)
+        if start is not None:
+            stmt = stmt.where(target >= start)
+        if end is not None:
+            stmt = stmt.where(target < end)
+        if cursor is not None:
+            position = decode_cursor("predictions", cursor)
+            after = cursor_datetime(position, "t")
+            after_id = position.get("id")
+            if not isinstance(after_id, int):
+                raise InvalidCursorError("Malformed cursor")
+            # Spelled out instead of a row comparison so target >= :t stays an index
+            # condition on ix_predictions_route_target; id only breaks ties.
+            stmt = stmt.where(
+                target >= after,
+                or_(target > after, and_(target == after, Prediction.id > after_id)),
+            )
+        stmt = stmt.order_by(target.asc(), Prediction.id.asc())
+
+        rows = [dict(row) for row in (await session.execute(stmt.limit(limit + 1))).mappings()]
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = encode_cursor(
+                "predictions", t=last["target_arrival"].isoformat(), id=last["id"]
+            )
+        return rows, next_cursor
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import logging
+
+from sqlalchemy import select
+
+from ..core.config import Settings, get_settings
+from ..db.session import get_engine, get_sessionmaker
+from ..models import Route
+from .archive import TelemetryArchiver, get_telemetry_archive
+from .map_matching import get_route_matcher
+from .partitions import TelemetryPartitionManager
+from .prediction_reads import get_prediction_reads
+from .rollups import TelemetryRollupService
+from .scheduler import CronTrigger, IntervalTrigger, Job, Scheduler, advisory_leader_lock
+from .travel_profiles import reload_travel_profiles
+
+logger = logging.getLogger(__name__)
+
+
+async def recompute_predictions() -> None:
+    # The prediction engine is only needed once the job first runs, not at startup.
+    from .predictions import PredictionEngine
+
+    async with get_sessionmaker()() as session:
+        summary = await PredictionEngine().run(session)
+    logger.info(
+        "Recomputed %d predictions for %d routes", summary.predictions_written, summary.routes
+    )
+
+
+async def refresh_rollups() -> None:
+    async with get_sessionmaker()() as session:
+        summary = await TelemetryRollupService().refresh(session)
+    logger.info("Refreshed rollups: %d rows", summary.rows_written)
+
+
+async def maintain_partitions() -> None:
+    async with get_sessionmaker()() as session:
+        result = await TelemetryPartitionManager().run_maintenance(session)
+    logger.info(
+        "Partition maintenance created %d and removed %d partitions",
+        len(result["created"]),
+        len(result["removed"]),
+    )
+
+
+async def archive_telemetry() -> None:
+    archiver = TelemetryArchiver(get_telemetry_archive())
+    async with get_sessionmaker()() as session:
+        summary = await archiver.run(session, get_settings().telemetry_archive_after_days)
+    logger.info(
+        "Archived %d telemetry rows from %d days", summary.rows_archived, summary.days
+    )
+
+
+async def warm_prediction_cache() -> None:
+    """Load upcoming predictions for every active route into this process's cache."""
+
+    reads = get_prediction_reads()
+    async with get_sessionmaker()() as session:
+        route_ids = (
+            await session.scalars(select(Route.id).where(Route.is_active.is_(True)))
+        ).all()
+        for route_id in route_ids:
+            await reads.upcoming(session, route_id)
+
+
+async def sync_route_segments() -> None:
+    """Share this process's learned segment pace and pick up shapes and pace from others."""
+
+    matcher = get_route_matcher()
+    async with get_sessionmaker()() as session:
+        await matcher.persist(session)
+        await matcher.load(session)
+
+
+async def reload_profiles() -> None:
+    if reload_travel_profiles():
+        logger.info("Reloaded travel profiles")
+
+
+def build_scheduler(settings: Settings) -> Scheduler:
+    """Register the periodic maintenance jobs enabled in ``settings``."""
+
+    scheduler = Scheduler(
+        leader_lock=advisory_leader_lock(get_engine()),
+        max_concurrent=settings.scheduler_max_concurrent_jobs,
+    )
+    jitter = settings.scheduler_jitter_seconds
+    if settings.scheduler_predictions_seconds:
+        scheduler.add_job(
+            Job(
+                "recompute_predictions",
+                recompute_predictions,
+                IntervalTrigger(settings.scheduler_predictions_seconds),
+                jitter_seconds=jitter,
+                timeout_seconds=settings.scheduler_predictions_seconds * 4,
+            )
+        )
+    if settings.scheduler_rollups_seconds:
+        scheduler.add_job(
+            Job(
+                "refresh_rollups",
+                refresh_rollups,
+                IntervalTrigger(settings.scheduler_rollups_seconds),
+                jitter_seconds=jitter,
+            )
+        )
+    if settings.scheduler_partitions_cron:
+        scheduler.add_job(
+            Job(
+                "maintain_partitions",
+                maintain_partitions,
+                CronTrigger.parse(settings.scheduler_partitions_cron),
+                jitter_seconds=jitter,
+            )
+        )
+    if settings.scheduler_archive_cron and settings.telemetry_archive_after_days:
+        scheduler.add_job(
+            Job(
+                "archive_telemetry",
+                archive_telemetry,
+                CronTrigger.parse(settings.scheduler_archive_cron),
+                jitter_seconds=jitter,
+            )
+        )
+    if settings.scheduler_cache_warm_seconds:
+        scheduler.add_job(
+            Job(
+                "warm_prediction_cache",
+                warm_prediction_cache,
+                IntervalTrigger(settings.scheduler_cache_warm_seconds),
+                jitter_seconds=jitter,
+                leader_only=False,
+            )
+        )
+    if settings.scheduler_route_segments_seconds:
+        scheduler.add_job(
+            Job(
+                "sync_route_segments",
+                sync_route_segments,
+                IntervalTrigger(settings.scheduler_route_segments_seconds),
+                jitter_seconds=jitter,
+                leader_only=False,
+            )
+        )
+    if settings.scheduler_travel_profiles_seconds:
+        scheduler.add_job(
+            Job(
+                "reload_travel_profiles",
+                reload_profiles,
+                IntervalTrigger(settings.scheduler_travel_profiles_seconds),
+                leader_only=False,
+            )
+        )
+    return scheduler
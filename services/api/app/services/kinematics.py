@@ -0,0 +1,27 @@
+"""numpy helpers shared by map matching, travel profiles and the prediction engine.
+
+Kept apart from :mod:`app.services.predictions` so the ingest path can snap fixes to
+route shapes without importing the prediction engine.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+from .spatial import EARTH_RADIUS_M
+
+# Share of the congestion index (0-100) that is applied as an extra slowdown on top of
+# the speeds buses are currently reporting.
+CONGESTION_SLOWDOWN = 0.3
+
+
+def haversine_km(
+    lat1: np.ndarray, lon1: np.ndarray, lat2: np.ndarray, lon2: np.ndarray
+) -> np.ndarray:
+    phi1 = np.radians(lat1)
+    phi2 = np.radians(lat2)
+    a = (
+        np.sin((phi2 - phi1) / 2) ** 2
+        + np.cos(phi1) * np.cos(phi2) * np.sin(np.radians(lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_M / 1000 * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Awaitable, Callable, Generic, Hashable, Iterable, Mapping, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+BatchFunction = Callable[[list[K]], Awaitable[Mapping[K, V]]]
+
+
+class BatchLoader(Generic[K, V]):
+    """DataLoader-style batcher: ``load`` calls made in the same loop tick share one query.
+
+    Keys are queued until the current task yields, then resolved by a single call to
+    ``batch`` (split into ``max_batch_size`` chunks to stay under bind-parameter limits).
+    Results are memoised for the loader's lifetime, which is meant to be one request;
+    missing keys resolve to ``None``.
+    """
+
+    def __init__(
+        self,
+        batch: BatchFunction[K, V],
+        *,
+        max_batch_size: int = 1_000,
+        lock: asyncio.Lock | None = None,
+    ) -> None:
+        self._batch = batch
+        self._max_batch_size = max_batch_size
+        # Loaders sharing an AsyncSession share a lock so their batches never overlap.
+        self._lock = lock if lock is not None else asyncio.Lock()
+        self._futures: dict[K, asyncio.Future[V | None]] = {}
+        self._queue: list[K] = []
+        self._tasks: set[asyncio.Task[None]] = set()
+        self.batches = 0
+
+    def load(self, key: K) -> asyncio.Future[V | None]:
+        future = self._futures.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._futures[key] = future
+            if not self._queue:
+                loop.call_soon(self._dispatch)
+            self._queue.append(key)
+        return future
+
+    async def load_many(self, keys: Iterable[K]) -> list[V | None]:
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def prime(self, key: K, value: V) -> None:
+        """Seed the cache with a value another query already returned."""
+
+        if key not in self._futures:
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(value)
+            self._futures[key] = future
+
+    def _dispatch(self) -> None:
+        keys, self._queue = self._queue, []
+        for start in range(0, len(keys), self._max_batch_size):
+            task = asyncio.create_task(self._resolve(keys[start : start + self._max_batch_size]))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _resolve(self, keys: list[K]) -> None:
+        try:
+            async with self._lock:
+                self.batches += 1
+                values = await self._batch(keys)
+        except BaseException as exc:
+            for key in keys:
+                future = self._futures.pop(key)
+                if not future.done():
+                    future.set_exception(exc)
+            if not isinstance(exc, Exception):
+                raise
+            return
+        for key in keys:
+            future = self._futures[key]
+            if not future.done():
+                future.set_result(values.get(key))
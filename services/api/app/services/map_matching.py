@@ -0,0 +1,470 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Iterable
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import get_settings
+from ..models import RouteSegmentStat, RouteShapePoint
+from .kinematics import haversine_km
+from .positions import PositionStore, get_position_store
+from .spatial import METERS_PER_DEGREE_LAT
+
+# Unbounded matches (stop snapping) compare every fix with every segment, in blocks of
+# at most this many pairs so a long shape never allocates more than a few MB at once.
+_MATCH_BLOCK_PAIRS = 1 << 18
+# Bounded matches only compare a fix with the segments registered in its grid cell.
+_GRID_CELL_M = 200.0
+# Progress below this is GPS jitter, above this speed (m/s) it is a mismatch.
+_MIN_PROGRESS_M = 5.0
+_MAX_SPEED_MPS = 40.0
+
+
+def cumulative_distance_m(latitude: np.ndarray, longitude: np.ndarray) -> np.ndarray:
+    """Along-polyline distance of every vertex from the first one."""
+
+    steps = haversine_km(latitude[:-1], longitude[:-1], latitude[1:], longitude[1:]) * 1000
+    return np.concatenate(([0.0], np.cumsum(steps)))
+
+
+@dataclass(slots=True)
+class SegmentMatches:
+    """Per-fix match results; ``segment`` is -1 where no segment was close enough."""
+
+    segment: np.ndarray
+    offset_m: np.ndarray
+    distance_m: np.ndarray
+
+
+def _cell_key(cx: Any, cy: Any) -> Any:
+    # Interleave signed cell coordinates into one sortable int64 key.
+    return (cx + (1 << 31)) * (1 << 32) + (cy + (1 << 31))
+
+
+class RouteGeometry:
+    """A route polyline prepared for vectorized point-to-segment projection.
+
+    Vertices are projected once onto a local equirectangular plane centred on the shape,
+    which is accurate to well under a metre over a city-sized route. A uniform grid over
+    that plane, built on first use for each match radius, lists the segments near each
+    cell.
+    """
+
+    def __init__(
+        self,
+        route_id: int,
+        latitude: np.ndarray,
+        longitude: np.ndarray,
+        distance_m: np.ndarray | None = None,
+    ) -> None:
+        if len(latitude) < 2:
+            raise ValueError("A route shape needs at least two points")
+        self.route_id = route_id
+        self.latitude = np.asarray(latitude, dtype=np.float64)
+        self.longitude = np.asarray(longitude, dtype=np.float64)
+        self.distance_m = (
+            cumulative_distance_m(self.latitude, self.longitude)
+            if distance_m is None
+            else np.asarray(distance_m, dtype=np.float64)
+        )
+        self._lat0 = float(self.latitude.mean())
+        self._kx = METERS_PER_DEGREE_LAT * math.cos(math.radians(self._lat0))
+        x, y = self._project(self.latitude, self.longitude)
+        self._x, self._y = x[:-1], y[:-1]
+        self._dx, self._dy = np.diff(x), np.diff(y)
+        self._length_sq = self._dx**2 + self._dy**2
+        self._grids: dict[float, tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+
+    @property
+    def length_m(self) -> float:
+        return float(self.distance_m[-1])
+
+    @property
+    def segment_count(self) -> int:
+        return len(self.distance_m) - 1
+
+    @property
+    def segment_lengths(self) -> np.ndarray:
+        return np.diff(self.distance_m)
+
+    def _project(self, latitude: np.ndarray, longitude: np.ndarray) -> tuple[np.ndarray, ...]:
+        return longitude * self._kx, (latitude - self._lat0) * METERS_PER_DEGREE_LAT
+
+    def match(
+        self, latitude: np.ndarray, longitude: np.ndarray, max_distance_m: float = math.inf
+    ) -> SegmentMatches:
+        """Snap each fix to its nearest segment and return the along-route offset.
+
+        With a finite ``max_distance_m`` only segments sharing a grid cell with the fix
+        are compared, so the cost grows with the fixes rather than fixes x segments.
+        """
+
+        px, py = self._project(np.asarray(latitude, np.float64), np.asarray(longitude, np.float64))
+        if math.isfinite(max_distance_m):
+            return self._match_nearby(px, py, max_distance_m)
+        count = len(px)
+        segment = np.empty(count, dtype=np.int64)
+        fraction = np.empty(count)
+        distance_sq = np.empty(count)
+        block = max(_MATCH_BLOCK_PAIRS // self.segment_count, 1)
+        rows = np.arange(min(block, count))
+        for start in range(0, count, block):
+            stop = min(start + block, count)
+            rx = px[start:stop, None] - self._x
+            ry = py[start:stop, None] - self._y
+            with np.errstate(divide="ignore", invalid="ignore"):
+                t = np.clip((rx * self._dx + ry * self._dy) / self._length_sq, 0.0, 1.0)
+            t = np.nan_to_num(t, copy=False)
+            d2 = (rx - t * self._dx) ** 2 + (ry - t * self._dy) ** 2
+            best = d2.argmin(axis=1)
+            picked = rows[: stop - start]
+            segment[start:stop] = best
+            fraction[start:stop] = t[picked, best]
+            distance_sq[start:stop] = d2[picked, best]
+
+        return self._matches(segment, fraction, distance_sq)
+
+    def _matches(
+        self, segment: np.ndarray, fraction: np.ndarray, distance_sq: np.ndarray
+    ) -> SegmentMatches:
+        offset = self.distance_m[segment] + fraction * self.segment_lengths[segment]
+        return SegmentMatches(segment=segment, offset_m=offset, distance_m=np.sqrt(distance_sq))
+
+    def _grid(self, radius_m: float) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Sorted cell keys, CSR offsets and segment ids for segments within ``radius_m``."""
+
+        grid = self._grids.get(radius_m)
+        if grid is not None:
+            return grid
+        x1, y1 = self._x + self._dx, self._y + self._dy
+        low_x = np.floor((np.minimum(self._x, x1) - radius_m) / _GRID_CELL_M).astype(np.int64)
+        high_x = np.floor((np.maximum(self._x, x1) + radius_m) / _GRID_CELL_M).astype(np.int64)
+        low_y = np.floor((np.minimum(self._y, y1) - radius_m) / _GRID_CELL_M).astype(np.int64)
+        high_y = np.floor((np.maximum(self._y, y1) + radius_m) / _GRID_CELL_M).astype(np.int64)
+        keys: list[int] = []
+        segments: list[int] = []
+        for index in range(self.segment_count):
+            for cx in range(low_x[index], high_x[index] + 1):
+                for cy in range(low_y[index], high_y[index] + 1):
+                    keys.append(_cell_key(cx, cy))
+                    segments.append(index)
+        key_array = np.asarray(keys, dtype=np.int64)
+        order = np.argsort(key_array, kind="stable")
+        cell_keys, starts = np.unique(key_array[order], return_index=True)
+        offsets = np.append(starts, len(order))
+        grid = (cell_keys, offsets, np.asarray(segments, dtype=np.int64)[order])
+        self._grids[radius_m] = grid
+        return grid
+
+    def _match_nearby(self, px: np.ndarray, py: np.ndarray, radius_m: float) -> SegmentMatches:
+        cell_keys, offsets, cell_segments = self._grid(radius_m)
+        keys = _cell_key(
+            np.floor(px / _GRID_CELL_M).astype(np.int64),
+            np.floor(py / _GRID_CELL_M).astype(np.int64),
+        )
+        slot = np.minimum(np.searchsorted(cell_keys, keys), len(cell_keys) - 1)
+        found = cell_keys[slot] == keys
+        counts = np.where(found, offsets[slot + 1] - offsets[slot], 0)
+
+        # One entry per (fix, candidate segment) pair, then the closest pair per fix.
+        fix = np.repeat(np.arange(len(px)), counts)
+        within = np.arange(len(fix)) - np.repeat(np.cumsum(counts) - counts, counts)
+        candidate = cell_segments[np.repeat(offsets[slot], counts) + within]
+        rx = px[fix] - self._x[candidate]
+        ry = py[fix] - self._y[candidate]
+        dx, dy = self._dx[candidate], self._dy[candidate]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = np.clip((rx * dx + ry * dy) / self._length_sq[candidate], 0.0, 1.0)
+        t = np.nan_to_num(t, copy=False)
+        d2 = (rx - t * dx) ** 2 + (ry - t * dy) ** 2
+        order = np.lexsort((d2, fix))
+        fixes, first = np.unique(fix[order], return_index=True)
+        best = order[first]
+
+        segment = np.full(len(px), -1, dtype=np.int64)
+        fraction = np.zeros(len(px))
+        distance_sq = np.full(len(px), np.inf)
+        segment[fixes] = candidate[best]
+        fraction[fixes] = t[best]
+        distance_sq[fixes] = d2[best]
+        close = distance_sq <= radius_m**2
+        matches = self._matches(np.where(close, segment, 0), fraction, distance_sq)
+        matches.segment[~close] = -1
+        return matches
+
+    def segment_overlaps(
+        self, start_m: np.ndarray, end_m: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Split ``[start_m, end_m]`` intervals into per-segment pieces.
+
+        Returns ``(interval, segment, metres)`` arrays with one entry per touched segment.
+        """
+
+        last = self.segment_count - 1
+        first_seg = np.clip(np.searchsorted(self.distance_m, start_m, "right") - 1, 0, last)
+        last_seg = np.clip(np.searchsorted(self.distance_m, end_m, "right") - 1, 0, last)
+        counts = last_seg - first_seg + 1
+        interval = np.repeat(np.arange(len(start_m)), counts)
+        within = np.arange(len(interval)) - np.repeat(np.cumsum(counts) - counts, counts)
+        segment = first_seg[interval] + within
+        metres = np.minimum(end_m[interval], self.distance_m[segment + 1]) - np.maximum(
+            start_m[interval], self.distance_m[segment]
+        )
+        return interval, segment, np.clip(metres, 0.0, None)
+
+
+class RouteMatcher:
+    """Snap ingested fixes onto route shapes and learn per-segment traversal pace.
+
+    Consecutive matched fixes of a bus give a pace (seconds per metre) over the stretch
+    between them; it is split across the segments covered and folded into a per-segment
+    EWMA. Everything is held in memory, batched per route and computed with numpy, so it
+    runs inline on the ingest path. :meth:`persist` and :meth:`load` share the learned
+    pace through ``route_segment_stats``.
+    """
+
+    def __init__(
+        self,
+        positions: PositionStore | None = None,
+        *,
+        max_distance_m: float = 75.0,
+        smoothing: float = 0.2,
+        max_gap_seconds: float = 300.0,
+    ) -> None:
+        self._positions = positions if positions is not None else get_position_store()
+        self._max_distance_m = max_distance_m
+        self._smoothing = smoothing
+        self._max_gap_seconds = max_gap_seconds
+        self._geometries: dict[int, RouteGeometry] = {}
+        self._pace: dict[int, np.ndarray] = {}
+        self._samples: dict[int, np.ndarray] = {}
+        self._unsaved: dict[int, np.ndarray] = {}
+        self._last: dict[int, tuple[int, float, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._geometries)
+
+    def geometry(self, route_id: int) -> RouteGeometry | None:
+        return self._geometries.get(route_id)
+
+    def set_geometry(
+        self,
+        geometry: RouteGeometry,
+        pace: np.ndarray | None = None,
+        samples: np.ndarray | None = None,
+    ) -> None:
+        """Install (or replace) a route's shape; a new shape starts with no learned pace."""
+
+        segments = geometry.segment_count
+        self._geometries[geometry.route_id] = geometry
+        self._pace[geometry.route_id] = (
+            np.full(segments, np.nan) if pace is None else np.asarray(pace, np.float64)
+        )
+        self._samples[geometry.route_id] = (
+            np.zeros(segments, np.int64) if samples is None else np.asarray(samples, np.int64)
+        )
+        self._unsaved[geometry.route_id] = np.zeros(segments, np.int64)
+
+    def position(self, bus_id: int) -> tuple[int, float] | None:
+        """Route and along-route offset of the bus's last matched fix."""
+
+        last = self._last.get(bus_id)
+        return None if last is None else (last[0], last[1])
+
+    def observe(self, rows: Iterable[dict[str, Any]]) -> int:
+        """Match ingested rows, update segment pace, and return how many fixes matched."""
+
+        by_route: dict[int, list[dict[str, Any]]] = {}
+        for row in rows:
+            route_id = self._positions.route_of(row["bus_id"])
+            if route_id is not None and route_id in self._geometries:
+                by_route.setdefault(route_id, []).append(row)
+        return sum(self._observe_route(route_id, group) for route_id, group in by_route.items())
+
+    def _observe_route(self, route_id: int, rows: list[dict[str, Any]]) -> int:
+        geometry = self._geometries[route_id]
+        count = len(rows)
+        bus = np.fromiter((row["bus_id"] for row in rows), np.int64, count)
+        ts = np.fromiter((row["recorded_at"].timestamp() for row in rows), np.float64, count)
+        matches = geometry.match(
+            np.fromiter((row["latitude"] for row in rows), np.float64, count),
+            np.fromiter((row["longitude"] for row in rows), np.float64, count),
+            self._max_distance_m,
+        )
+        matched = matches.segment >= 0
+        bus, ts, offset = bus[matched], ts[matched], matches.offset_m[matched]
+
+        # Seed each bus with its previous matched fix so pace spans batch boundaries.
+        previous = [
+            (bus_id, *state[1:])
+            for bus_id in np.unique(bus).tolist()
+            if (state := self._last.get(bus_id)) is not None and state[0] == route_id
+        ]
+        if previous:
+            prev_bus, prev_offset, prev_ts = (np.asarray(column) for column in zip(*previous))
+            bus = np.concatenate((prev_bus.astype(np.int64), bus))
+            offset = np.concatenate((prev_offset, offset))
+            ts = np.concatenate((prev_ts, ts))
+
+        order = np.lexsort((ts, bus))
+        bus, ts, offset = bus[order], ts[order], offset[order]
+        if len(bus):
+            ends = np.flatnonzero(np.r_[bus[1:] != bus[:-1], True])
+            for index in ends.tolist():
+                self._last[int(bus[index])] = (route_id, float(offset[index]), float(ts[index]))
+
+        dt = np.diff(ts)
+        ds = np.diff(offset)
+        step = (
+            (bus[1:] == bus[:-1])
+            & (dt > 0)
+            & (dt <= self._max_gap_seconds)
+            & (ds >= _MIN_PROGRESS_M)
+            & (ds <= dt * _MAX_SPEED_MPS)
+        )
+        if step.any():
+            self._fold_pace(geometry, offset[:-1][step], offset[1:][step], dt[step] / ds[step])
+        return int(matched.sum())
+
+    def _fold_pace(
+        self, geometry: RouteGeometry, start_m: np.ndarray, end_m: np.ndarray, pace: np.ndarray
+    ) -> None:
+        interval, segment, metres = geometry.segment_overlaps(start_m, end_m)
+        segments = geometry.segment_count
+        weight = np.bincount(segment, weights=metres, minlength=segments)
+        seconds = np.bincount(segment, weights=metres * pace[interval], minlength=segments)
+        seen = weight > 0
+        batch_pace = seconds[seen] / weight[seen]
+
+        route_id = geometry.route_id
+        current = self._pace[route_id]
+        prior = current[seen]
+        current[seen] = np.where(
+            np.isnan(prior), batch_pace, prior + self._smoothing * (batch_pace - prior)
+        )
+        observations = np.bincount(segment[metres > 0], minlength=segments)
+        self._samples[route_id] += observations
+        self._unsaved[route_id] += observations
+
+    def segment_seconds(self, route_id: int) -> np.ndarray | None:
+        """Learned traversal time of each segment (NaN where nothing was observed)."""
+
+        geometry = self._geometries.get(route_id)
+        if geometry is None:
+            return None
+        return self._pace[route_id] * geometry.segment_lengths
+
+    def travel_seconds(self, route_id: int, start_m: float, end_m: float) -> float | None:
+        """Expected seconds to travel between two offsets on the route.
+
+        Segments without observations use the route's mean learned pace; ``None`` means
+        the route has no shape or no pace at all yet.
+        """
+
+        geometry = self._geometries.get(route_id)
+        if geometry is None or end_m <= start_m:
+            return None
+        pace = self._pace[route_id]
+        if np.isnan(pace).all():
+            return None
+        filled = np.where(np.isnan(pace), np.nanmean(pace), pace)
+        _, segment, metres = geometry.segment_overlaps(np.array([start_m]), np.array([end_m]))
+        return float((filled[segment] * metres).sum())
+
+    async def load(self, session: AsyncSession) -> int:
+        """Replace in-memory shapes and pace with what is stored; return routes loaded."""
+
+        shapes = await session.execute(
+            select(
+                RouteShapePoint.route_id,
+                RouteShapePoint.latitude,
+                RouteShapePoint.longitude,
+                RouteShapePoint.distance_m,
+            ).order_by(RouteShapePoint.route_id, RouteShapePoint.sequence)
+        )
+        points: dict[int, list[tuple[float, float, float]]] = {}
+        for route_id, latitude, longitude, distance in shapes:
+            points.setdefault(route_id, []).append((latitude, longitude, distance))
+        stats: dict[int, list[tuple[int, float, int]]] = {}
+        rows = await session.execute(
+            select(
+                RouteSegmentStat.route_id,
+                RouteSegmentStat.segment_index,
+                RouteSegmentStat.seconds_per_meter,
+                RouteSegmentStat.samples,
+            )
+        )
+        for route_id, segment_index, pace, samples in rows:
+            stats.setdefault(route_id, []).append((segment_index, pace, samples))
+
+        self._geometries.clear()
+        for route_id, vertices in points.items():
+            if len(vertices) < 2:
+                continue
+            latitude, longitude, distance = (np.asarray(column) for column in zip(*vertices))
+            geometry = RouteGeometry(route_id, latitude, longitude, distance)
+            pace = np.full(geometry.segment_count, np.nan)
+            samples = np.zeros(geometry.segment_count, np.int64)
+            for segment_index, value, count in stats.get(route_id, []):
+                if segment_index < geometry.segment_count:
+                    pace[segment_index] = value
+                    samples[segment_index] = count
+            self.set_geometry(geometry, pace, samples)
+        return len(self._geometries)
+
+    async def persist(self, session: AsyncSession) -> int:
+        """Write segments with new observations to ``route_segment_stats``.
+
+        Each process writes its own EWMA, which started from the stored value when it
+        was loaded; concurrent writers therefore converge instead of averaging per row.
+        """
+
+        values = []
+        for route_id, unsaved in self._unsaved.items():
+            pace = self._pace[route_id]
+            for segment_index in np.flatnonzero(unsaved).tolist():
+                values.append(
+                    {
+                        "route_id": route_id,
+                        "segment_index": segment_index,
+                        "seconds_per_meter": float(pace[segment_index]),
+                        "samples": int(self._samples[route_id][segment_index]),
+                    }
+                )
+        if not values:
+            return 0
+        # Four bind parameters per row; stay well under asyncpg's 32767 per statement.
+        chunk_size = get_settings().telemetry_insert_chunk_size
+        for start in range(0, len(values), chunk_size):
+            stmt = insert(RouteSegmentStat).values(values[start : start + chunk_size])
+            await session.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=["route_id", "segment_index"],
+                    set_={
+                        "seconds_per_meter": stmt.excluded.seconds_per_meter,
+                        "samples": stmt.excluded.samples,
+                        "updated_at": func.now(),
+                    },
+                )
+            )
+        await session.commit()
+        for unsaved in self._unsaved.values():
+            unsaved[:] = 0
+        return len(values)
+
+
+@lru_cache
+def get_route_matcher() -> RouteMatcher:
+    """Return the process-wide route matcher."""
+
+    settings = get_settings()
+    return RouteMatcher(
+        max_distance_m=settings.map_match_max_distance_m,
+        smoothing=settings.map_match_smoothing,
+    )
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from datetime import datetime, timezone
+from typing import Any
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1_000
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a continuation token cannot be decoded."""
+
+
+def encode_cursor(kind: str, **position: Any) -> str:
+    """Encode a keyset position into an opaque, URL-safe continuation token."""
+
+    payload = json.dumps({"k": kind, **position}, separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(kind: str, token: str) -> dict[str, Any]:
+    """Decode a token produced by :func:`encode_cursor` for the same listing ``kind``."""
+
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise InvalidCursorError("Malformed cursor") from exc
+    if not isinstance(position, dict) or position.pop("k", None) != kind:
+        raise InvalidCursorError("Cursor does not belong to this listing")
+    return position
+
+
+def cursor_datetime(position: dict[str, Any], key: str) -> datetime:
+    """Read an ISO timestamp stored in a decoded cursor position."""
+
+    try:
+        moment = datetime.fromisoformat(position[key])
+    except (KeyError, TypeError, ValueError) as exc:
+        raise InvalidCursorError("Malformed cursor") from exc
+    # Timestamps are stored in UTC; a cursor without an offset came from a naive driver value.
+    return moment if moment.tzinfo is not None else moment.replace(tzinfo=timezone.utc)
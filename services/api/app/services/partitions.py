@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta, timezone
+from typing import Literal
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "telemetry_records"
+DEFAULT_PARTITION = f"{PARENT_TABLE}_default"
+
+PartitionInterval = Literal["daily", "weekly"]
+
+
+@dataclass(frozen=True, slots=True)
+class PartitionRange:
+    name: str
+    start: datetime
+    end: datetime
+
+    def overlaps(self, other: PartitionRange) -> bool:
+        return self.start < other.end and other.start < self.end
+
+
+def partition_start(moment: datetime, interval: PartitionInterval) -> datetime:
+    """Floor ``moment`` to the UTC day (or ISO week) that contains it."""
+
+    day = datetime.combine(moment.astimezone(timezone.utc).date(), time(), tzinfo=timezone.utc)
+    if interval == "weekly":
+        day -= timedelta(days=day.weekday())
+    return day
+
+
+def partition_step(interval: PartitionInterval) -> timedelta:
+    return timedelta(weeks=1) if interval == "weekly" else timedelta(days=1)
+
+
+def partition_for(start: datetime, interval: PartitionInterval) -> PartitionRange:
+    return PartitionRange(
+        name=f"{PARENT_TABLE}_p{start:%Y%m%d}",
+        start=start,
+        end=start + partition_step(interval),
+    )
+
+
+def planned_partitions(
+    first: datetime, last: datetime, interval: PartitionInterval
+) -> list[PartitionRange]:
+    """Return the partitions needed to cover ``[first, last]`` inclusive."""
+
+    start = partition_start(first, interval)
+    planned = []
+    while start <= last:
+        partition = partition_for(start, interval)
+        planned.append(partition)
+        start = partition.end
+    return planned
+
+
+def parse_partition_bound(name: str, bound: str) -> PartitionRange | None:
+    """Parse ``pg_get_expr(relpartbound)`` output; ``None`` for the DEFAULT partition."""
+
+    if "FROM (" not in bound:
+        return None
+    lower = bound.split("FROM ('", 1)[1].split("')", 1)[0]
+    upper = bound.split("TO ('", 1)[1].split("')", 1)[0]
+    return PartitionRange(
+        name=name, start=datetime.fromisoformat(lower), end=datetime.fromisoformat(upper)
+    )
+
+
+def expired_partitions(
+    partitions: list[PartitionRange], now: datetime, retention_days: int | None
+) -> list[PartitionRange]:
+    """Return partitions whose whole range is older than the retention window."""
+
+    if retention_days is None:
+        return []
+    cutoff = now - timedelta(days=retention_days)
+    return [partition for partition in partitions if partition.end <= cutoff]
+
+
+class TelemetryPartitionManager:
+    """Pre-create upcoming ``telemetry_records`` partitions and retire expired ones.
+
+    Retention is a metadata operation: whole partitions are detached (and optionally
+    dropped) instead of deleting rows.
+    """
+
+    async def existing_partitions(self, session: AsyncSession) -> list[PartitionRange]:
+        # Render bounds in UTC so they parse back into the same instants we created.
+        await session.execute(text("SET LOCAL TIME ZONE 'UTC'"))
+        result = await session.execute(
+            text(
+                "SELECT child.relname, pg_get_expr(child.relpartbound, child.oid) "
+                "FROM pg_inherits "
+                "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                "WHERE pg_inherits.inhparent = CAST(:parent AS regclass)"
+            ),
+            {"parent": PARENT_TABLE},
+        )
+        partitions = [parse_partition_bound(name, bound) for name, bound in result]
+        return sorted(
+            (partition for partition in partitions if partition is not None),
+            key=lambda partition: partition.start,
+        )
+
+    async def ensure_partitions(
+        self, session: AsyncSession, now: datetime | None = None
+    ) -> list[str]:
+        """Create partitions from the retention horizon through the premake window."""
+
+        settings = get_settings()
+        now = now or datetime.now(timezone.utc)
+        step = partition_step(settings.telemetry_partition_interval)
+        horizon = settings.telemetry_retention_days
+        first = now - timedelta(days=horizon) if horizon is not None else now
+        last = now + step * settings.telemetry_partition_premake
+        return await self.create_partitions(session, first, last)
+
+    async def create_partitions(
+        self, session: AsyncSession, first: datetime, last: datetime
+    ) -> list[str]:
+        """Create any missing partitions covering ``[first, last]``."""
+
+        interval = get_settings().telemetry_partition_interval
+        existing = await self.existing_partitions(session)
+        created = []
+        for partition in planned_partitions(first, last, interval):
+            # Ranges created under a different interval setting stay authoritative.
+            if any(partition.overlaps(current) for current in existing):
+                continue
+            try:
+                async with session.begin_nested():
+                    await session.execute(
+                        text(
+                            f'CREATE TABLE "{partition.name}" PARTITION OF "{PARENT_TABLE}" '
+                            f"FOR VALUES FROM ('{partition.start.isoformat()}') "
+                            f"TO ('{partition.end.isoformat()}')"
+                        )
+                    )
+            except DBAPIError:
+                # Rows for this range already landed in the DEFAULT partition.
+                logger.warning("Could not create partition %s", partition.name, exc_info=True)
+                continue
+            created.append(partition.name)
+        await session.commit()
+        return created
+
+    async def apply_retention(
+        self, session: AsyncSession, now: datetime | None = None
+    ) -> list[str]:
+        """Detach (and drop, unless configured otherwise) partitions past retention."""
+
+        settings = get_settings()
+        now = now or datetime.now(timezone.utc)
+        existing = await self.existing_partitions(session)
+        removed = []
+        for partition in expired_partitions(existing, now, settings.telemetry_retention_days):
+            await session.execute(
+                text(f'ALTER TABLE "{PARENT_TABLE}" DETACH PARTITION "{partition.name}"')
+            )
+            if settings.telemetry_retention_action == "drop":
+                await session.execute(text(f'DROP TABLE "{partition.name}"'))
+            removed.append(partition.name)
+        await session.commit()
+        return removed
+
+    async def run_maintenance(
+        self, session: AsyncSession, now: datetime | None = None
+    ) -> dict[str, list[str]]:
+        created = await self.ensure_partitions(session, now)
+        removed = await self.apply_retention(session, now)
+        return {"created": created, "removed": removed}
@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import math
+from array import array
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any
+
+from sqlalchemy import select, true
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import get_settings
+from ..models import Bus, BusStatus, TelemetryRecord
+from .spatial import SpatialGrid
+
+_STATUSES = tuple(BusStatus)
+_STATUS_CODES = {status: code for code, status in enumerate(_STATUSES)}
+_MISSING = -1
+
+
+class PositionStore:
+    """Latest GPS fix per bus held in parallel, append-only typed arrays.
+
+    Each bus owns a fixed slot; updates overwrite the slot in place and only move it
+    forward in time, so a fleet-wide snapshot never touches the database. An optional
+    :class:`SpatialGrid` is kept in step with every applied fix for proximity queries.
+    """
+
+    def __init__(self, grid: SpatialGrid | None = None) -> None:
+        self._grid = grid
+        self._slots: dict[int, int] = {}
+        self._route_slots: dict[int, list[int]] = {}
+        self._bus_ids = array("q")
+        self._route_ids = array("q")
+        self._status = array("b")
+        self._recorded_at = array("d")
+        self._latitude = array("d")
+        self._longitude = array("d")
+        self._speed_kph = array("d")
+        self._heading = array("h")
+        self._passenger_load = array("l")
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, bus_id: object) -> bool:
+        return bus_id in self._slots
+
+    def register_bus(self, bus_id: int, route_id: int, status: BusStatus) -> int:
+        """Allocate (or refresh) the slot holding ``bus_id`` and return its index."""
+
+        slot = self._slots.get(bus_id)
+        if slot is None:
+            slot = len(self._bus_ids)
+            self._slots[bus_id] = slot
+            self._bus_ids.append(bus_id)
+            self._route_ids.append(route_id)
+            self._status.append(_STATUS_CODES[status])
+            self._recorded_at.append(math.nan)
+            self._latitude.append(math.nan)
+            self._longitude.append(math.nan)
+            self._speed_kph.append(math.nan)
+            self._heading.append(_MISSING)
+            self._passenger_load.append(_MISSING)
+            self._route_slots.setdefault(route_id, []).append(slot)
+            return slot
+
+        previous_route = self._route_ids[slot]
+        if previous_route != route_id:
+            self._route_slots[previous_route].remove(slot)
+            self._route_slots.setdefault(route_id, []).append(slot)
+            self._route_ids[slot] = route_id
+        self._status[slot] = _STATUS_CODES[status]
+        return slot
+
+    def update(
+        self,
+        bus_id: int,
+        recorded_at: datetime,
+        latitude: float,
+        longitude: float,
+        speed_kph: float | None = None,
+        heading: int | None = None,
+        passenger_load: int | None = None,
+    ) -> bool:
+        """Record a fix if it is newer than the stored one; return whether it was applied."""
+
+        slot = self._slots.get(bus_id)
+        if slot is None:
+            return False
+        timestamp = recorded_at.timestamp()
+        current = self._recorded_at[slot]
+        if current == current and timestamp <= current:
+            return False
+
+        self._recorded_at[slot] = timestamp
+        self._latitude[slot] = latitude
+        self._longitude[slot] = longitude
+        self._speed_kph[slot] = math.nan if speed_kph is None else speed_kph
+        self._heading[slot] = _MISSING if heading is None else heading
+        self._passenger_load[slot] = _MISSING if passenger_load is None else passenger_load
+        if self._grid is not None:
+            self._grid.upsert(bus_id, latitude, longitude)
+        return True
+
+    def route_of(self, bus_id: int) -> int | None:
+        slot = self._slots.get(bus_id)
+        return None if slot is None else self._route_ids[slot]
+
+    def get(self, bus_id: int) -> dict[str, Any] | None:
+        slot = self._slots.get(bus_id)
+        if slot is None or self._recorded_at[slot] != self._recorded_at[slot]:
+            return None
+        return self._row(slot)
+
+    def snapshot(
+        self, route_id: int | None = None, status: BusStatus | None = None
+    ) -> list[dict[str, Any]]:
+        """Return the latest fix for every bus matching the optional filters."""
+
+        if route_id is None:
+            slots: list[int] | range = range(len(self._bus_ids))
+        else:
+            slots = self._route_slots.get(route_id, [])
+        status_code = None if status is None else _STATUS_CODES[status]
+        recorded_at = self._recorded_at
+        status_codes = self._status
+
+        rows = []
+        for slot in slots:
+            if recorded_at[slot] != recorded_at[slot]:
+                continue
+            if status_code is not None and status_codes[slot] != status_code:
+                continue
+            rows.append(self._row(slot))
+        return rows
+
+    def nearby(
+        self,
+        latitude: float,
+        longitude: float,
+        radius_m: float,
+        limit: int | None = None,
+        route_id: int | None = None,
+        status: BusStatus | None = None,
+    ) -> list[dict[str, Any]]:
+        """Return buses within ``radius_m`` of a point, nearest first, with ``distance_m``."""
+
+        rows = []
+        for bus_id, distance in self._spatial_index().nearby(latitude, longitude, radius_m):
+            slot = self._slots[bus_id]
+            if self._matches(slot, route_id, status):
+                rows.append({**self._row(slot), "distance_m": round(distance, 1)})
+                if limit is not None and len(rows) >= limit:
+                    break
+        return rows
+
+    def within(
+        self,
+        min_latitude: float,
+        min_longitude: float,
+        max_latitude: float,
+        max_longitude: float,
+        route_id: int | None = None,
+        status: BusStatus | None = None,
+    ) -> list[dict[str, Any]]:
+        """Return buses whose latest fix lies inside the bounding box."""
+
+        bus_ids = self._spatial_index().within(
+            min_latitude, min_longitude, max_latitude, max_longitude
+        )
+        slots = (self._slots[bus_id] for bus_id in bus_ids)
+        return [self._row(slot) for slot in slots if self._matches(slot, route_id, status)]
+
+    def _spatial_index(self) -> SpatialGrid:
+        if self._grid is None:
+            raise RuntimeError("PositionStore was created without a spatial grid")
+        return self._grid
+
+    def _matches(self, slot: int, route_id: int | None, status: BusStatus | None) -> bool:
+        if route_id is not None and self._route_ids[slot] != route_id:
+            return False
+        return status is None or self._status[slot] == _STATUS_CODES[status]
+
+    def _row(self, slot: int) -> dict[str, Any]:
+        speed = self._speed_kph[slot]
+        heading = self._heading[slot]
+        load = self._passenger_load[slot]
+        return {
+            "bus_id": self._bus_ids[slot],
+            "route_id": self._route_ids[slot],
+            "status": _STATUSES[self._status[slot]],
+            "recorded_at": datetime.fromtimestamp(self._recorded_at[slot], tz=timezone.utc),
+            "latitude": self._latitude[slot],
+            "longitude": self._longitude[slot],
+            "speed_kph": None if speed != speed else speed,
+            "heading": None if heading == _MISSING else heading,
+            "passenger_load": None if load == _MISSING else load,
+        }
+
+
+@lru_cache
+def get_position_store() -> PositionStore:
+    """Return the process-wide position store."""
+
+    return PositionStore(grid=SpatialGrid(get_settings().spatial_grid_cell_degrees))
+
+
+async def warm_position_store(session: AsyncSession, store: PositionStore) -> int:
+    """Load every bus and its latest fix into ``store``; return the number of fixes loaded."""
+
+    # A LATERAL top-1 per bus walks ix_telemetry_bus_recorded_at backwards once per bus
+    # instead of aggregating the whole telemetry table.
+    latest = (
+        select(TelemetryRecord)
+        .where(TelemetryRecord.bus_id == Bus.id)
+        .order_by(TelemetryRecord.recorded_at.desc())
+        .limit(1)
+        .lateral("latest")
+    )
+    stmt = select(
+        Bus.id,
+        Bus.route_id,
+        Bus.status,
+        latest.c.recorded_at,
+        latest.c.latitude,
+        latest.c.longitude,
+        latest.c.speed_kph,
+        latest.c.heading,
+        latest.c.passenger_load,
+    ).outerjoin(latest, true())
+
+    loaded = 0
+    for row in await session.execute(stmt):
+        store.register_bus(row.id, row.route_id, row.status)
+        if row.recorded_at is not None:
+            loaded += store.update(
+                row.id,
+                row.recorded_at,
+                row.latitude,
+                row.longitude,
+                row.speed_kph,
+                row.heading,
+                row.passenger_load,
+            )
+    return loaded
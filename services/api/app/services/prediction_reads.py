@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Iterable
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+
+from ..core.config import get_settings
+from ..core.responses import dumps
+from ..models import Prediction
+from .cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "prediction_updates"
+# pg_notify payloads are capped at 8000 bytes; past this many ids, invalidate everything.
+_MAX_NOTIFIED_ROUTES = 500
+
+
+@dataclass(frozen=True, slots=True)
+class CachedPredictions:
+    etag: str
+    body: bytes
+
+
+class PredictionReadService:
+    """Route-keyed read-through cache for upcoming predictions.
+
+    Concurrent misses for the same route share one query, and a load that races with an
+    invalidation is returned but not cached, so writers never leave stale entries behind.
+    """
+
+    def __init__(self, cache: TTLCache[int, CachedPredictions]) -> None:
+        self._cache = cache
+        self._inflight: dict[int, asyncio.Future[CachedPredictions]] = {}
+        self._generations: dict[int, int] = {}
+        self._epoch = 0
+
+    async def upcoming(self, session: AsyncSession, route_id: int) -> CachedPredictions:
+        cached = self._cache.get(route_id)
+        if cached is not None:
+            return cached
+        inflight = self._inflight.get(route_id)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        future: asyncio.Future[CachedPredictions] = asyncio.get_running_loop().create_future()
+        self._inflight[route_id] = future
+        version = (self._epoch, self._generations.get(route_id, 0))
+        try:
+            rows = await self._load(session, route_id)
+            entry = _render(route_id, rows)
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Mark the exception as retrieved when no other request was waiting on it.
+            future.exception()
+            raise
+        finally:
+            del self._inflight[route_id]
+
+        if version == (self._epoch, self._generations.get(route_id, 0)):
+            self._cache.set(route_id, entry)
+        future.set_result(entry)
+        return entry
+
+    def invalidate(self, route_ids: Iterable[int] | None = None) -> None:
+        """Drop cached entries for ``route_ids``, or for every route when ``None``."""
+
+        if route_ids is None:
+            self._epoch += 1
+            self._cache.clear()
+            return
+        for route_id in route_ids:
+            self._generations[route_id] = self._generations.get(route_id, 0) + 1
+            self._cache.invalidate(route_id)
+
+    async def _load(self, session: AsyncSession, route_id: int) -> list[dict[str, Any]]:
+        stmt = (
+            select(
+                Prediction.id,
+                Prediction.route_id,
+                Prediction.traffic_snapshot_id,
+                Prediction.target_arrival,
+                Prediction.estimated_headway_minutes,
+                Prediction.travel_time_minutes,
+                Prediction.confidence,
+                Prediction.notes,
+                Prediction.created_at,
+            )
+            .where(
+                Prediction.route_id == route_id,
+                Prediction.target_arrival >= datetime.now(timezone.utc),
+            )
+            .order_by(Prediction.target_arrival.asc(), Prediction.id.asc())
+            .limit(get_settings().prediction_cache_items)
+        )
+        return [dict(row) for row in (await session.execute(stmt)).mappings()]
+
+
+def _render(route_id: int, rows: list[dict[str, Any]]) -> CachedPredictions:
+    body = dumps({"route_id": route_id, "items": rows})
+    digest = hashlib.blake2b(body, digest_size=12).hexdigest()
+    return CachedPredictions(etag=f'"{digest}"', body=body)
+
+
+@lru_cache
+def get_prediction_reads() -> PredictionReadService:
+    """Return the process-wide prediction read cache."""
+
+    settings = get_settings()
+    cache: TTLCache[int, CachedPredictions] = TTLCache(
+        maxsize=settings.prediction_cache_size, ttl_seconds=settings.prediction_cache_ttl_seconds
+    )
+    return PredictionReadService(cache)
+
+
+async def notify_prediction_updates(session: AsyncSession, route_ids: list[int]) -> None:
+    """Queue a cross-process invalidation; Postgres delivers it when the session commits."""
+
+    if len(route_ids) > _MAX_NOTIFIED_ROUTES:
+        payload = "*"
+    else:
+        payload = ",".join(str(route_id) for route_id in route_ids)
+    await session.execute(select(func.pg_notify(INVALIDATION_CHANNEL, payload)))
+
+
+def parse_invalidation(payload: str) -> list[int] | None:
+    """Return the route ids in a notification payload, or ``None`` for "all routes"."""
+
+    if payload == "*":
+        return None
+    return [int(part) for part in payload.split(",") if part]
+
+
+class PredictionInvalidationListener:
+    """Hold a dedicated connection that LISTENs for prediction writes from any process."""
+
+    def __init__(self, reads: PredictionReadService) -> None:
+        self._reads = reads
+        self._connection: AsyncConnection | None = None
+
+    async def start(self, engine: AsyncEngine) -> None:
+        self._connection = await engine.connect()
+        raw = await self._connection.get_raw_connection()
+        await raw.driver_connection.add_listener(INVALIDATION_CHANNEL, self._on_notify)
+
+    async def stop(self) -> None:
+        if self._connection is not None:
+            await self._connection.close()
+            self._connection = None
+
+    def _on_notify(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        try:
+            self._reads.invalidate(parse_invalidation(payload))
+        except ValueError:
+            logger.warning("Ignoring malformed %s payload: %r", channel, payload)
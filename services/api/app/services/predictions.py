@@ -0,0 +1,310 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+from sqlalchemy import Float, case, cast, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import get_settings
+from ..models import (
+    Bus,
+    BusStatus,
+    Prediction,
+    Route,
+    RouteSegmentStat,
+    RouteShapePoint,
+    TelemetryRecord,
+    TrafficSnapshot,
+)
+from .kinematics import CONGESTION_SLOWDOWN, haversine_km
+from .prediction_reads import get_prediction_reads, notify_prediction_updates
+
+if TYPE_CHECKING:
+    from .travel_profiles import TravelProfiles
+
+# Learned segment pace only replaces the speed-based travel time once it covers at least
+# this share of the route; the uncovered remainder is scaled at the covered pace.
+MIN_SEGMENT_COVERAGE = 0.5
+
+
+@dataclass(slots=True)
+class RouteForecasts:
+    """Per-route forecast arrays, aligned with the route index used to build them."""
+
+    valid: np.ndarray
+    fixes: np.ndarray
+    active_buses: np.ndarray
+    speed_kph: np.ndarray
+    route_length_km: np.ndarray
+    travel_time_minutes: np.ndarray
+    headway_minutes: np.ndarray
+    confidence: np.ndarray
+
+
+@dataclass(slots=True)
+class PredictionRunSummary:
+    routes: int = 0
+    predictions_written: int = 0
+    fixes_used: int = 0
+    elapsed_ms: float = 0.0
+
+
+def compute_route_forecasts(
+    route_idx: np.ndarray,
+    bus_ids: np.ndarray,
+    timestamps: np.ndarray,
+    latitude: np.ndarray,
+    longitude: np.ndarray,
+    speed_kph: np.ndarray,
+    n_routes: int,
+    congestion_index: float = 0.0,
+    window_minutes: float = 15.0,
+    min_route_length_km: float = 5.0,
+    max_gap_seconds: float = 300.0,
+    route_length_km: np.ndarray | None = None,
+    baseline_pace: np.ndarray | None = None,
+    segment_travel_minutes: np.ndarray | None = None,
+) -> RouteForecasts:
+    """Estimate speed, travel time and headway for every route in one vectorized pass.
+
+    Inputs are parallel arrays of recent fixes (``speed_kph`` uses NaN for missing
+    readings). Per-route aggregates are built with ``bincount``/``ufunc.at`` over the
+    route index rather than by looping over routes or rows. ``route_length_km`` and
+    ``segment_travel_minutes`` come from stored route shapes and learned segment pace,
+    ``baseline_pace`` (minutes per km) from historical travel profiles; where they are
+    finite they replace the estimates derived from the fixes alone, with live segment
+    pace taking precedence over the historical baseline.
+    """
+
+    fixes = np.bincount(route_idx, minlength=n_routes)
+    has_data = fixes > 0
+
+    # Distance covered between consecutive fixes of the same bus, for routes whose
+    # buses do not report speed.
+    order = np.lexsort((timestamps, bus_ids))
+    bus_sorted = bus_ids[order]
+    time_sorted = timestamps[order]
+    lat_sorted = latitude[order]
+    lon_sorted = longitude[order]
+    dt = np.diff(time_sorted)
+    step = (bus_sorted[1:] == bus_sorted[:-1]) & (dt > 0) & (dt <= max_gap_seconds)
+    step_km = haversine_km(lat_sorted[:-1], lon_sorted[:-1], lat_sorted[1:], lon_sorted[1:])
+    step_route = route_idx[order][1:][step]
+    moved_km = np.bincount(step_route, weights=step_km[step], minlength=n_routes)
+    moved_hours = np.bincount(step_route, weights=dt[step], minlength=n_routes) / 3600
+
+    reported = ~np.isnan(speed_kph)
+    reported_sum = np.bincount(
+        route_idx[reported], weights=speed_kph[reported], minlength=n_routes
+    )
+    reported_count = np.bincount(route_idx[reported], minlength=n_routes)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        speed = np.where(
+            reported_count > 0,
+            reported_sum / reported_count,
+            np.where(moved_hours > 0, moved_km / moved_hours, np.nan),
+        )
+    speed = speed * (1 - CONGESTION_SLOWDOWN * congestion_index / 100)
+
+    # Without a stored shape, approximate length by the diagonal of the area the
+    # route's buses have covered, floored at a configured minimum.
+    min_lat = np.full(n_routes, np.inf)
+    max_lat = np.full(n_routes, -np.inf)
+    min_lon = np.full(n_routes, np.inf)
+    max_lon = np.full(n_routes, -np.inf)
+    np.minimum.at(min_lat, route_idx, latitude)
+    np.maximum.at(max_lat, route_idx, latitude)
+    np.minimum.at(min_lon, route_idx, longitude)
+    np.maximum.at(max_lon, route_idx, longitude)
+    extent = np.zeros(n_routes)
+    extent[has_data] = haversine_km(
+        min_lat[has_data], min_lon[has_data], max_lat[has_data], max_lon[has_data]
+    )
+    route_length = np.maximum(extent, min_route_length_km)
+    if route_length_km is not None:
+        route_length = np.where(np.isfinite(route_length_km), route_length_km, route_length)
+
+    stride = int(bus_ids.max(initial=0)) + 1
+    pairs = np.unique(route_idx.astype(np.int64) * stride + bus_ids)
+    active_buses = np.bincount(pairs // stride, minlength=n_routes)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        travel = np.where(speed > 0, route_length / speed * 60, np.nan)
+        if baseline_pace is not None:
+            travel = np.where(np.isfinite(baseline_pace), baseline_pace * route_length, travel)
+        if segment_travel_minutes is not None:
+            # Learned pace already reflects current traffic, so no congestion slowdown.
+            travel = np.where(np.isfinite(segment_travel_minutes), segment_travel_minutes, travel)
+        # Buses are spread over both directions, so a stop sees one every 2T / n minutes.
+        headway = np.where(active_buses > 0, 2 * travel / active_buses, np.nan)
+        coverage = np.clip(fixes / (active_buses * window_minutes), 0.0, 1.0)
+    confidence = (0.3 + 0.6 * coverage) * (1 - congestion_index / 200)
+
+    valid = has_data & np.isfinite(travel) & np.isfinite(headway)
+    return RouteForecasts(
+        valid=valid,
+        fixes=fixes,
+        active_buses=active_buses,
+        speed_kph=speed,
+        route_length_km=route_length,
+        travel_time_minutes=travel,
+        headway_minutes=headway,
+        confidence=np.where(valid, confidence, np.nan),
+    )
+
+
+class PredictionEngine:
+    """Recompute headway and travel-time predictions for all active routes in bulk."""
+
+    def __init__(self, profiles: TravelProfiles | None = None) -> None:
+        if profiles is None:
+            # travel_profiles builds on this module, so resolve the shared store lazily.
+            from .travel_profiles import get_travel_profiles
+
+            profiles = get_travel_profiles()
+        self._profiles = profiles
+
+    async def _load_inputs(
+        self, session: AsyncSession, since: datetime
+    ) -> tuple[list[int], list[Any], tuple[int, int] | None]:
+        route_ids = list(
+            (await session.execute(select(Route.id).where(Route.is_active.is_(True)))).scalars()
+        )
+        telemetry = await session.execute(
+            select(
+                Bus.route_id,
+                TelemetryRecord.bus_id,
+                cast(func.extract("epoch", TelemetryRecord.recorded_at), Float),
+                TelemetryRecord.latitude,
+                TelemetryRecord.longitude,
+                TelemetryRecord.speed_kph,
+            )
+            .join(Bus, Bus.id == TelemetryRecord.bus_id)
+            .join(Route, Route.id == Bus.route_id)
+            .where(
+                TelemetryRecord.recorded_at >= since,
+                Bus.status == BusStatus.IN_SERVICE,
+                Route.is_active.is_(True),
+            )
+        )
+        snapshot = (
+            await session.execute(
+                select(TrafficSnapshot.id, TrafficSnapshot.congestion_index)
+                .order_by(TrafficSnapshot.captured_at.desc())
+                .limit(1)
+            )
+        ).first()
+        return route_ids, telemetry.all(), tuple(snapshot) if snapshot is not None else None
+
+    async def _load_geometry(
+        self, session: AsyncSession, route_ids: list[int]
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Per-route shape length (km) and learned end-to-end travel time (minutes)."""
+
+        segment = (
+            select(
+                RouteShapePoint.route_id,
+                RouteShapePoint.sequence,
+                (
+                    func.lead(RouteShapePoint.distance_m).over(
+                        partition_by=RouteShapePoint.route_id, order_by=RouteShapePoint.sequence
+                    )
+                    - RouteShapePoint.distance_m
+                ).label("length_m"),
+            )
+            .where(RouteShapePoint.route_id.in_(route_ids))
+            .subquery()
+        )
+        learned = RouteSegmentStat.seconds_per_meter.is_not(None)
+        rows = await session.execute(
+            select(
+                segment.c.route_id,
+                func.sum(segment.c.length_m),
+                func.sum(case((learned, segment.c.length_m), else_=0.0)),
+                func.sum(RouteSegmentStat.seconds_per_meter * segment.c.length_m),
+            )
+            .outerjoin(
+                RouteSegmentStat,
+                (RouteSegmentStat.route_id == segment.c.route_id)
+                & (RouteSegmentStat.segment_index == segment.c.sequence),
+            )
+            .group_by(segment.c.route_id)
+        )
+        slots = {route_id: index for index, route_id in enumerate(route_ids)}
+        length_km = np.full(len(route_ids), np.nan)
+        travel_minutes = np.full(len(route_ids), np.nan)
+        for route_id, length_m, covered_m, covered_seconds in rows:
+            if not length_m:
+                continue
+            index = slots[route_id]
+            length_km[index] = length_m / 1000
+            if covered_m and covered_m / length_m >= MIN_SEGMENT_COVERAGE:
+                travel_minutes[index] = covered_seconds * (length_m / covered_m) / 60
+        return length_km, travel_minutes
+
+    async def run(self, session: AsyncSession, now: datetime | None = None) -> PredictionRunSummary:
+        started = time.perf_counter()
+        settings = get_settings()
+        now = now or datetime.now(timezone.utc)
+        since = now - timedelta(minutes=settings.prediction_window_minutes)
+
+        route_ids, rows, snapshot = await self._load_inputs(session, since)
+        snapshot_id, congestion = snapshot if snapshot is not None else (None, 0)
+        if not route_ids or not rows:
+            return PredictionRunSummary(routes=len(route_ids))
+
+        length_km, travel_minutes = await self._load_geometry(session, route_ids)
+        paces = (
+            self._profiles.pace(route_id, now, congestion_index=float(congestion))
+            for route_id in route_ids
+        )
+        baseline = np.array([np.nan if pace is None else pace for pace in paces])
+        slots = {route_id: index for index, route_id in enumerate(route_ids)}
+        columns = list(zip(*rows))
+        forecasts = await asyncio.to_thread(
+            compute_route_forecasts,
+            np.fromiter((slots[route_id] for route_id in columns[0]), np.int64, len(rows)),
+            np.asarray(columns[1], dtype=np.int64),
+            np.asarray(columns[2], dtype=np.float64),
+            np.asarray(columns[3], dtype=np.float64),
+            np.asarray(columns[4], dtype=np.float64),
+            np.asarray(columns[5], dtype=np.float64),
+            len(route_ids),
+            congestion_index=float(congestion),
+            window_minutes=float(settings.prediction_window_minutes),
+            min_route_length_km=settings.prediction_min_route_length_km,
+            route_length_km=length_km,
+            baseline_pace=baseline,
+            segment_travel_minutes=travel_minutes,
+        )
+
+        predictions = [
+            {
+                "route_id": route_ids[index],
+                "traffic_snapshot_id": snapshot_id,
+                "target_arrival": now + timedelta(minutes=float(forecasts.headway_minutes[index])),
+                "estimated_headway_minutes": round(float(forecasts.headway_minutes[index])),
+                "travel_time_minutes": round(float(forecasts.travel_time_minutes[index])),
+                "confidence": round(float(forecasts.confidence[index]), 3),
+            }
+            for index in np.flatnonzero(forecasts.valid)
+        ]
+        if predictions:
+            updated_routes = [prediction["route_id"] for prediction in predictions]
+            await session.execute(insert(Prediction), predictions)
+            await notify_prediction_updates(session, updated_routes)
+            await session.commit()
+            get_prediction_reads().invalidate(updated_routes)
+
+        return PredictionRunSummary(
+            routes=len(route_ids),
+            predictions_written=len(predictions),
+            fixes_used=len(rows),
+            elapsed_ms=round((time.perf_counter() - started) * 1000, 3),
+        )
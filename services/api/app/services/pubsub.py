@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from collections import deque
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Iterable
+
+from ..core.config import get_settings
+
+
+class Subscription:
+    """A subscriber's bounded mailbox; when full, the oldest message is dropped."""
+
+    def __init__(self, route_ids: frozenset[int], bus_ids: frozenset[int], maxlen: int) -> None:
+        self.route_ids = route_ids
+        self.bus_ids = bus_ids
+        self.dropped = 0
+        self._queue: deque[str] = deque(maxlen=maxlen)
+        self._ready = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def push(self, message: str) -> None:
+        if len(self._queue) == self._queue.maxlen:
+            self.dropped += 1
+        self._queue.append(message)
+        self._ready.set()
+
+    async def next_batch(self, timeout: float | None = None) -> list[str]:
+        """Wait for messages and drain everything queued; ``[]`` if ``timeout`` elapses."""
+
+        if not self._queue:
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return []
+        batch = list(self._queue)
+        self._queue.clear()
+        self._ready.clear()
+        return batch
+
+
+class TelemetryHub:
+    """In-process fan-out of position updates to route and bus subscribers.
+
+    Publishing encodes each update once and appends it to the matching mailboxes without
+    awaiting, so a slow consumer only ever loses its own oldest messages.
+    """
+
+    def __init__(self, queue_size: int = 256) -> None:
+        self._queue_size = queue_size
+        self._by_route: dict[int, set[Subscription]] = {}
+        self._by_bus: dict[int, set[Subscription]] = {}
+        self._subscriptions: set[Subscription] = set()
+
+    def __len__(self) -> int:
+        return len(self._subscriptions)
+
+    def subscribe(
+        self, route_ids: Iterable[int] = (), bus_ids: Iterable[int] = ()
+    ) -> Subscription:
+        subscription = Subscription(frozenset(route_ids), frozenset(bus_ids), self._queue_size)
+        for route_id in subscription.route_ids:
+            self._by_route.setdefault(route_id, set()).add(subscription)
+        for bus_id in subscription.bus_ids:
+            self._by_bus.setdefault(bus_id, set()).add(subscription)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        for index, keys in (
+            (self._by_route, subscription.route_ids),
+            (self._by_bus, subscription.bus_ids),
+        ):
+            for key in keys:
+                members = index.get(key)
+                if members is not None:
+                    members.discard(subscription)
+                    if not members:
+                        del index[key]
+        self._subscriptions.discard(subscription)
+
+    def publish(self, update: dict[str, Any]) -> int:
+        """Deliver ``update`` (a bus position) to every matching subscriber."""
+
+        by_route = self._by_route.get(update["route_id"])
+        by_bus = self._by_bus.get(update["bus_id"])
+        if not by_route and not by_bus:
+            return 0
+        targets = (by_route | by_bus) if by_route and by_bus else (by_route or by_bus or set())
+
+        message = json.dumps(update, default=_encode_default, separators=(",", ":"))
+        for subscription in targets:
+            subscription.push(message)
+        return len(targets)
+
+    def dropped_messages(self) -> int:
+        return sum(subscription.dropped for subscription in self._subscriptions)
+
+
+def _encode_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot encode {type(value).__name__}")
+
+
+@lru_cache
+def get_telemetry_hub() -> TelemetryHub:
+    """Return the process-wide live telemetry hub."""
+
+    return TelemetryHub(queue_size=get_settings().live_queue_size)
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import ColumnElement, Float, Select, cast, func, literal, literal_column, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import get_settings
+from ..models import Bus, RollupWatermark, TelemetryRecord, TelemetryRollup
+
+ROLLUP_RESOLUTIONS = (60, 300, 3600)
+WATERMARK_NAME = "telemetry_rollups"
+MAX_QUERY_BUCKETS = 10_000
+
+_AGGREGATE_COLUMNS = (
+    "route_id",
+    "ping_count",
+    "speed_sum",
+    "speed_count",
+    "load_sum",
+    "load_count",
+)
+
+
+@dataclass(slots=True)
+class RollupRefreshSummary:
+    window_start: datetime
+    window_end: datetime
+    rows_written: int
+    elapsed_ms: float
+
+
+def bucket_floor(column: Any, width_seconds: int) -> ColumnElement[datetime]:
+    """SQL expression flooring a timestamp to a ``width_seconds`` bucket (UTC epoch aligned)."""
+
+    # Inline the width so the SELECT and GROUP BY render the identical expression.
+    width = literal_column(str(int(width_seconds)))
+    return func.to_timestamp(func.floor(func.extract("epoch", column) / width) * width)
+
+
+def align_down(moment: datetime, width_seconds: int) -> datetime:
+    epoch = int(moment.timestamp())
+    return datetime.fromtimestamp(epoch - epoch % width_seconds, tz=timezone.utc)
+
+
+def pick_source_resolution(requested_seconds: int) -> int | None:
+    """Return the coarsest stored resolution whose buckets tile ``requested_seconds``."""
+
+    for resolution in reversed(ROLLUP_RESOLUTIONS):
+        if requested_seconds >= resolution and requested_seconds % resolution == 0:
+            return resolution
+    return None
+
+
+def _mean(total: Any, count: Any) -> ColumnElement[float]:
+    return cast(func.sum(total), Float) / func.nullif(func.sum(count), 0)
+
+
+def _from_raw(start: datetime, end: datetime) -> Select[Any]:
+    bucket = bucket_floor(TelemetryRecord.recorded_at, ROLLUP_RESOLUTIONS[0]).label("bucket")
+    return (
+        select(
+            literal(ROLLUP_RESOLUTIONS[0]),
+            TelemetryRecord.bus_id,
+            bucket,
+            Bus.route_id,
+            func.count(),
+            func.sum(TelemetryRecord.speed_kph),
+            func.count(TelemetryRecord.speed_kph),
+            func.sum(TelemetryRecord.passenger_load),
+            func.count(TelemetryRecord.passenger_load),
+        )
+        .join(Bus, Bus.id == TelemetryRecord.bus_id)
+        .where(TelemetryRecord.recorded_at >= start, TelemetryRecord.recorded_at < end)
+        .group_by(TelemetryRecord.bus_id, bucket, Bus.route_id)
+    )
+
+
+def _from_rollup(source: int, target: int, start: datetime, end: datetime) -> Select[Any]:
+    rollup = TelemetryRollup
+    bucket = bucket_floor(rollup.bucket_start, target).label("bucket")
+    return (
+        select(
+            literal(target),
+            rollup.bus_id,
+            bucket,
+            func.max(rollup.route_id),
+            func.sum(rollup.ping_count),
+            func.sum(rollup.speed_sum),
+            func.sum(rollup.speed_count),
+            func.sum(rollup.load_sum),
+            func.sum(rollup.load_count),
+        )
+        .where(
+            rollup.resolution_seconds == source,
+            rollup.bucket_start >= start,
+            rollup.bucket_start < end,
+        )
+        .group_by(rollup.bus_id, bucket)
+    )
+
+
+class TelemetryRollupService:
+    """Maintain 1-minute, 5-minute and hourly telemetry rollups incrementally.
+
+    Each refresh re-aggregates only the buckets touched since the stored watermark, moved
+    back by the late-arrival allowance so fixes that arrive late are folded in. Buckets
+    are recomputed from scratch and upserted, which keeps refreshes idempotent.
+    """
+
+    async def refresh(
+        self, session: AsyncSession, now: datetime | None = None
+    ) -> RollupRefreshSummary:
+        started = time.perf_counter()
+        settings = get_settings()
+        now = now or datetime.now(timezone.utc)
+
+        watermark = await session.scalar(
+            select(RollupWatermark.watermark).where(RollupWatermark.name == WATERMARK_NAME)
+        )
+        if watermark is None:
+            watermark = now - timedelta(hours=settings.rollup_initial_lookback_hours)
+        # Align to the coarsest bucket so every bucket in the window is rebuilt completely.
+        window_start = align_down(
+            watermark - timedelta(minutes=settings.rollup_late_arrival_minutes),
+            ROLLUP_RESOLUTIONS[-1],
+        )
+
+        rows_written = await self._upsert(session, _from_raw(window_start, now))
+        for source, target in zip(ROLLUP_RESOLUTIONS, ROLLUP_RESOLUTIONS[1:]):
+            rows_written += await self._upsert(
+                session, _from_rollup(source, target, window_start, now)
+            )
+
+        await session.execute(
+            insert(RollupWatermark)
+            .values(name=WATERMARK_NAME, watermark=now)
+            .on_conflict_do_update(
+                index_elements=[RollupWatermark.name],
+                set_={"watermark": now, "updated_at": func.now()},
+            )
+        )
+        await session.commit()
+        return RollupRefreshSummary(
+            window_start=window_start,
+            window_end=now,
+            rows_written=rows_written,
+            elapsed_ms=round((time.perf_counter() - started) * 1000, 3),
+        )
+
+    async def _upsert(self, session: AsyncSession, source: Select[Any]) -> int:
+        table = TelemetryRollup.__table__
+        stmt = insert(table).from_select(
+            ["resolution_seconds", "bus_id", "bucket_start", *_AGGREGATE_COLUMNS], source
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["resolution_seconds", "bus_id", "bucket_start"],
+            set_={column: stmt.excluded[column] for column in _AGGREGATE_COLUMNS},
+        )
+        result = await session.execute(stmt)
+        return result.rowcount or 0
+
+    def series_statement(
+        self,
+        resolution_seconds: int,
+        start: datetime,
+        end: datetime,
+        bus_id: int | None = None,
+        route_id: int | None = None,
+    ) -> tuple[int, Select[Any]]:
+        """Build the bucket query for a series, reading from the coarsest usable rollup."""
+
+        source = pick_source_resolution(resolution_seconds)
+        if source is None:
+            raise ValueError(
+                f"resolution_seconds must be a multiple of {ROLLUP_RESOLUTIONS[0]}"
+            )
+        if (end - start).total_seconds() / resolution_seconds > MAX_QUERY_BUCKETS:
+            raise ValueError(f"Requested range spans more than {MAX_QUERY_BUCKETS} buckets")
+
+        rollup = TelemetryRollup
+        bucket = bucket_floor(rollup.bucket_start, resolution_seconds).label("bucket_start")
+        stmt = select(
+            bucket,
+            func.sum(rollup.ping_count).label("ping_count"),
+            _mean(rollup.speed_sum, rollup.speed_count).label("avg_speed_kph"),
+            _mean(rollup.load_sum, rollup.load_count).label("avg_passenger_load"),
+        ).where(
+            rollup.resolution_seconds == source,
+            rollup.bucket_start >= start,
+            rollup.bucket_start < end,
+        )
+        if bus_id is not None:
+            stmt = stmt.where(rollup.bus_id == bus_id)
+        if route_id is not None:
+            stmt = stmt.where(rollup.route_id == route_id)
+        return source, stmt.group_by(bucket).order_by(bucket)
+
+    async def series(
+        self,
+        session: AsyncSession,
+        resolution_seconds: int,
+        start: datetime,
+        end: datetime,
+        bus_id: int | None = None,
+        route_id: int | None = None,
+    ) -> tuple[int, list[dict[str, Any]]]:
+        source, stmt = self.series_statement(
+            resolution_seconds, start, end, bus_id=bus_id, route_id=route_id
+        )
+        rows = [dict(row) for row in (await session.execute(stmt)).mappings()]
+        return source, rows
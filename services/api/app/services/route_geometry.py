@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models import Route, RouteSegmentStat, RouteShapePoint, RouteStop
+from ..schemas.route_geometry import RouteShapeRequest
+from .map_matching import RouteGeometry, RouteMatcher, get_route_matcher
+
+
+def prepare_shape(
+    route_id: int, shape: RouteShapeRequest
+) -> tuple[RouteGeometry, list[dict[str, Any]], list[dict[str, Any]]]:
+    """Measure the polyline once and snap stops onto it, returning the rows to store."""
+
+    geometry = RouteGeometry(
+        route_id,
+        np.array([point.latitude for point in shape.points]),
+        np.array([point.longitude for point in shape.points]),
+    )
+    points = [
+        {
+            "route_id": route_id,
+            "sequence": sequence,
+            "latitude": point.latitude,
+            "longitude": point.longitude,
+            "distance_m": round(float(distance), 2),
+        }
+        for sequence, (point, distance) in enumerate(zip(shape.points, geometry.distance_m))
+    ]
+    stops: list[dict[str, Any]] = []
+    if shape.stops:
+        snapped = geometry.match(
+            np.array([stop.latitude for stop in shape.stops]),
+            np.array([stop.longitude for stop in shape.stops]),
+        )
+        stops = [
+            {
+                "route_id": route_id,
+                "sequence": sequence,
+                "name": stop.name,
+                "latitude": stop.latitude,
+                "longitude": stop.longitude,
+                "distance_m": round(float(offset), 2),
+            }
+            for sequence, (stop, offset) in enumerate(zip(shape.stops, snapped.offset_m))
+        ]
+    return geometry, points, stops
+
+
+class RouteGeometryService:
+    """Store route shapes and stops and report learned per-segment traversal times."""
+
+    def __init__(self, matcher: RouteMatcher | None = None) -> None:
+        self._matcher = matcher if matcher is not None else get_route_matcher()
+
+    async def save_shape(
+        self, session: AsyncSession, route_id: int, shape: RouteShapeRequest
+    ) -> dict[str, Any] | None:
+        """Replace a route's shape and stops; returns ``None`` if the route does not exist.
+
+        Segment numbering changes with the shape, so learned pace is discarded too.
+        """
+
+        if await session.get(Route, route_id) is None:
+            return None
+        geometry, points, stops = prepare_shape(route_id, shape)
+        for model in (RouteSegmentStat, RouteStop, RouteShapePoint):
+            await session.execute(delete(model).where(model.route_id == route_id))
+        await session.execute(insert(RouteShapePoint), points)
+        if stops:
+            await session.execute(insert(RouteStop), stops)
+        await session.commit()
+        # Other processes pick the new shape up on their next matcher reload.
+        self._matcher.set_geometry(geometry)
+        return _shape_payload(route_id, points, stops)
+
+    async def shape(self, session: AsyncSession, route_id: int) -> dict[str, Any] | None:
+        point_columns = (
+            RouteShapePoint.sequence,
+            RouteShapePoint.latitude,
+            RouteShapePoint.longitude,
+            RouteShapePoint.distance_m,
+        )
+        points = (
+            await session.execute(
+                select(*point_columns)
+                .where(RouteShapePoint.route_id == route_id)
+                .order_by(RouteShapePoint.sequence)
+            )
+        ).mappings().all()
+        if not points:
+            return None
+        stops = (
+            await session.execute(
+                select(
+                    RouteStop.sequence,
+                    RouteStop.name,
+                    RouteStop.latitude,
+                    RouteStop.longitude,
+                    RouteStop.distance_m,
+                )
+                .where(RouteStop.route_id == route_id)
+                .order_by(RouteStop.sequence)
+            )
+        ).mappings().all()
+        return _shape_payload(route_id, list(points), list(stops))
+
+    async def segments(self, session: AsyncSession, route_id: int) -> list[dict[str, Any]] | None:
+        """Every segment of the route's shape with its stored traversal estimate."""
+
+        vertex = (
+            select(
+                RouteShapePoint.sequence,
+                RouteShapePoint.distance_m.label("start_m"),
+                (
+                    func.lead(RouteShapePoint.distance_m).over(order_by=RouteShapePoint.sequence)
+                    - RouteShapePoint.distance_m
+                ).label("length_m"),
+            )
+            .where(RouteShapePoint.route_id == route_id)
+            .subquery()
+        )
+        rows = await session.execute(
+            select(
+                vertex.c.sequence,
+                vertex.c.start_m,
+                vertex.c.length_m,
+                RouteSegmentStat.seconds_per_meter,
+                RouteSegmentStat.samples,
+            )
+            .outerjoin(
+                RouteSegmentStat,
+                (RouteSegmentStat.route_id == route_id)
+                & (RouteSegmentStat.segment_index == vertex.c.sequence),
+            )
+            .where(vertex.c.length_m.is_not(None))
+            .order_by(vertex.c.sequence)
+        )
+        segments = [
+            {
+                "segment_index": sequence,
+                "start_m": start_m,
+                "length_m": length_m,
+                "traversal_seconds": None if pace is None else round(pace * length_m, 2),
+                "samples": samples or 0,
+            }
+            for sequence, start_m, length_m, pace, samples in rows
+        ]
+        return segments or None
+
+
+def _shape_payload(
+    route_id: int, points: list[dict[str, Any]], stops: list[dict[str, Any]]
+) -> dict[str, Any]:
+    point_keys = ("sequence", "latitude", "longitude", "distance_m")
+    stop_keys = (*point_keys, "name")
+    return {
+        "route_id": route_id,
+        "length_m": points[-1]["distance_m"],
+        "points": [{key: point[key] for key in point_keys} for point in points],
+        "stops": [{key: stop[key] for key in stop_keys} for stop in stops],
+    }
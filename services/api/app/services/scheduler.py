@@ -0,0 +1,299 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import hashlib
+import logging
+import math
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import AsyncContextManager, AsyncIterator, Awaitable, Callable, Protocol
+
+from sqlalchemy import Insert, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from ..core.metrics import REGISTRY
+from ..models import ScheduledJobSlot
+
+logger = logging.getLogger(__name__)
+
+JOB_RUNS = REGISTRY.counter(
+    "scheduler_job_runs_total", "Scheduled job runs by outcome", ("job", "outcome")
+)
+JOB_DURATION = REGISTRY.histogram(
+    "scheduler_job_duration_seconds",
+    "Wall time of scheduled job runs",
+    ("job",),
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 15.0, 60.0, 300.0, 900.0),
+)
+JOBS_RUNNING = REGISTRY.gauge("scheduler_jobs_running", "Scheduled job runs in progress", ("job",))
+
+LeaderLock = Callable[[str, datetime], AsyncContextManager[bool]]
+
+
+class Trigger(Protocol):
+    def next_run(self, after: datetime) -> datetime: ...
+
+
+@dataclass(frozen=True)
+class IntervalTrigger:
+    """Every ``seconds``, aligned to the epoch so that all replicas share slot boundaries."""
+
+    seconds: float
+
+    def next_run(self, after: datetime) -> datetime:
+        slot = math.floor(after.timestamp() / self.seconds) + 1
+        return datetime.fromtimestamp(slot * self.seconds, timezone.utc)
+
+
+def _parse_cron_field(spec: str, low: int, high: int) -> frozenset[int]:
+    values: set[int] = set()
+    for part in spec.split(","):
+        body, _, step_text = part.partition("/")
+        step = int(step_text) if step_text else 1
+        if body == "*":
+            start, end = low, high
+        elif "-" in body:
+            start_text, end_text = body.split("-", 1)
+            start, end = int(start_text), int(end_text)
+        else:
+            start = int(body)
+            end = high if step_text else start
+        if step < 1 or start < low or end > high or start > end:
+            raise ValueError(f"Invalid cron field {spec!r}")
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+@dataclass(frozen=True)
+class CronTrigger:
+    """Five-field cron schedule (minute hour day-of-month month day-of-week) in UTC.
+
+    Fields accept ``*``, numbers, ranges, lists and ``/step``; day-of-week runs 0-6 from
+    Sunday (7 is also Sunday). As in cron, when both day fields are restricted a day
+    matching either one qualifies.
+    """
+
+    minutes: frozenset[int]
+    hours: frozenset[int]
+    days: frozenset[int]
+    months: frozenset[int]
+    weekdays: frozenset[int]
+    any_day: bool
+    any_weekday: bool
+
+    @classmethod
+    def parse(cls, expression: str) -> CronTrigger:
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields: {expression!r}")
+        minute, hour, day, month, weekday = fields
+        weekdays = {value % 7 for value in _parse_cron_field(weekday, 0, 7)}
+        return cls(
+            minutes=_parse_cron_field(minute, 0, 59),
+            hours=_parse_cron_field(hour, 0, 23),
+            days=_parse_cron_field(day, 1, 31),
+            months=_parse_cron_field(month, 1, 12),
+            weekdays=frozenset(weekdays),
+            any_day=day == "*",
+            any_weekday=weekday == "*",
+        )
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day_ok = moment.day in self.days
+        weekday_ok = (moment.isoweekday() % 7) in self.weekdays
+        if self.any_day or self.any_weekday:
+            return day_ok and weekday_ok
+        return day_ok or weekday_ok
+
+    def next_run(self, after: datetime) -> datetime:
+        moment = after.astimezone(timezone.utc).replace(second=0, microsecond=0)
+        moment += timedelta(minutes=1)
+        limit = moment + timedelta(days=366 * 5)
+        while moment < limit:
+            if moment.month not in self.months:
+                year = moment.year + moment.month // 12
+                month = moment.month % 12 + 1
+                moment = moment.replace(year=year, month=month, day=1, hour=0, minute=0)
+                continue
+            if not self._day_matches(moment):
+                moment = (moment + timedelta(days=1)).replace(hour=0, minute=0)
+                continue
+            if moment.hour not in self.hours:
+                moment = (moment + timedelta(hours=1)).replace(minute=0)
+                continue
+            if moment.minute not in self.minutes:
+                moment += timedelta(minutes=1)
+                continue
+            return moment
+        raise ValueError("Cron expression never matches")
+
+
+@dataclass
+class Job:
+    name: str
+    func: Callable[[], Awaitable[object]]
+    trigger: Trigger
+    max_instances: int = 1
+    jitter_seconds: float = 0.0
+    leader_only: bool = True
+    timeout_seconds: float | None = None
+    running: int = field(default=0, init=False)
+
+
+def advisory_lock_key(name: str) -> int:
+    """Stable signed 64-bit key for ``pg_try_advisory_lock``."""
+
+    digest = hashlib.blake2b(f"scheduler:{name}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+def claim_slot_statement(name: str, slot: datetime) -> Insert:
+    """Record ``slot`` as the last one ``name`` ran for; returns a row only if it is newer."""
+
+    stmt = insert(ScheduledJobSlot).values(job=name, slot_start=slot)
+    return stmt.on_conflict_do_update(
+        index_elements=[ScheduledJobSlot.job],
+        set_={"slot_start": stmt.excluded.slot_start, "updated_at": func.now()},
+        where=ScheduledJobSlot.slot_start < stmt.excluded.slot_start,
+    ).returning(ScheduledJobSlot.job)
+
+
+def advisory_leader_lock(engine: AsyncEngine) -> LeaderLock:
+    """Leader election per job via a session-level PostgreSQL advisory lock.
+
+    The lock is held on its own connection for the whole run, so whichever replica
+    gets it first runs the job and the others skip that slot. Jitter can start a
+    replica only after the winner has finished and unlocked, so the lock holder also
+    claims the slot in ``scheduled_job_slots`` and runs only if nobody claimed it yet.
+    """
+
+    @contextlib.asynccontextmanager
+    async def acquire(name: str, slot: datetime) -> AsyncIterator[bool]:
+        key = advisory_lock_key(name)
+        async with engine.connect() as connection:
+            acquired = bool(
+                (await connection.execute(select(func.pg_try_advisory_lock(key)))).scalar()
+            )
+            await connection.commit()
+            try:
+                claimed = False
+                if acquired:
+                    result = await connection.execute(claim_slot_statement(name, slot))
+                    claimed = result.first() is not None
+                    await connection.commit()
+                yield claimed
+            finally:
+                if acquired:
+                    await connection.execute(select(func.pg_advisory_unlock(key)))
+                    await connection.commit()
+
+    return acquire
+
+
+class Scheduler:
+    """Runs async jobs on interval or cron triggers inside the API process.
+
+    Runs that are still going when the next slot arrives count against
+    ``max_instances``; excess slots are skipped rather than queued, so slow jobs never
+    pile up. ``max_concurrent`` caps simultaneous runs across all jobs, bounding how many
+    pooled connections periodic work can take from request handling.
+    """
+
+    def __init__(
+        self,
+        leader_lock: LeaderLock | None = None,
+        max_concurrent: int = 2,
+        clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+    ) -> None:
+        self._jobs: dict[str, Job] = {}
+        self._leader_lock = leader_lock
+        self._slots = asyncio.Semaphore(max_concurrent)
+        self._clock = clock
+        self._loops: list[asyncio.Task[None]] = []
+        self._runs: set[asyncio.Task[None]] = set()
+
+    @property
+    def jobs(self) -> list[Job]:
+        return list(self._jobs.values())
+
+    def add_job(self, job: Job) -> Job:
+        if job.name in self._jobs:
+            raise ValueError(f"Job {job.name} is already scheduled")
+        self._jobs[job.name] = job
+        return job
+
+    def start(self) -> None:
+        for job in self._jobs.values():
+            self._loops.append(asyncio.create_task(self._loop(job), name=f"job:{job.name}"))
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Stop scheduling and give in-flight runs ``timeout`` seconds to finish."""
+
+        for loop in self._loops:
+            loop.cancel()
+        await asyncio.gather(*self._loops, return_exceptions=True)
+        self._loops.clear()
+        if self._runs:
+            _, pending = await asyncio.wait(self._runs, timeout=timeout)
+            for run in pending:
+                run.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _loop(self, job: Job) -> None:
+        while True:
+            now = self._clock()
+            due = job.trigger.next_run(now)
+            delay = (due - now).total_seconds() + random.uniform(0, job.jitter_seconds)
+            await asyncio.sleep(max(delay, 0.0))
+            if job.running >= job.max_instances:
+                JOB_RUNS.inc(job.name, "skipped_overlap")
+                logger.info("Skipping %s: previous run still in progress", job.name)
+                continue
+            job.running += 1
+            run = asyncio.create_task(self.run_job(job, due), name=f"job-run:{job.name}")
+            self._runs.add(run)
+            run.add_done_callback(self._runs.discard)
+
+    async def run_job(self, job: Job, slot: datetime | None = None) -> str:
+        """Run ``job`` for ``slot`` (leader permitting) and return the recorded outcome."""
+
+        slot = slot or self._clock()
+        try:
+            async with self._slots:
+                if job.leader_only and self._leader_lock is not None:
+                    try:
+                        async with self._leader_lock(job.name, slot) as leader:
+                            if not leader:
+                                outcome = "skipped_not_leader"
+                            else:
+                                outcome = await self._execute(job)
+                    except (OSError, SQLAlchemyError):
+                        logger.warning("Leader election for %s failed", job.name, exc_info=True)
+                        outcome = "error"
+                else:
+                    outcome = await self._execute(job)
+        finally:
+            job.running -= 1
+        JOB_RUNS.inc(job.name, outcome)
+        return outcome
+
+    async def _execute(self, job: Job) -> str:
+        JOBS_RUNNING.inc(job.name)
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(job.func(), job.timeout_seconds)
+        except asyncio.TimeoutError:
+            logger.warning("Job %s timed out after %ss", job.name, job.timeout_seconds)
+            return "timeout"
+        except Exception:
+            logger.exception("Job %s failed", job.name)
+            return "error"
+        finally:
+            JOB_DURATION.observe(time.perf_counter() - started, job.name)
+            JOBS_RUNNING.dec(job.name)
+        return "success"
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import math
+
+EARTH_RADIUS_M = 6_371_008.8
+METERS_PER_DEGREE_LAT = math.pi * EARTH_RADIUS_M / 180.0
+
+Cell = tuple[int, int]
+
+
+def haversine_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two WGS84 points in meters."""
+
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a)))
+
+
+class SpatialGrid:
+    """Uniform lat/lon bucket grid over point keys, updated in place as points move.
+
+    Radius and bounding-box queries only visit the cells overlapping the query area, so
+    their cost depends on local density rather than on the total number of points.
+    """
+
+    def __init__(self, cell_size_deg: float = 0.01) -> None:
+        self._cell_size = cell_size_deg
+        self._cells: dict[Cell, set[int]] = {}
+        self._points: dict[int, tuple[float, float, Cell]] = {}
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def _cell(self, lat: float, lon: float) -> Cell:
+        return (math.floor(lat / self._cell_size), math.floor(lon / self._cell_size))
+
+    def upsert(self, key: int, lat: float, lon: float) -> None:
+        cell = self._cell(lat, lon)
+        previous = self._points.get(key)
+        if previous is not None and previous[2] != cell:
+            self._discard(key, previous[2])
+        if previous is None or previous[2] != cell:
+            self._cells.setdefault(cell, set()).add(key)
+        self._points[key] = (lat, lon, cell)
+
+    def remove(self, key: int) -> None:
+        previous = self._points.pop(key, None)
+        if previous is not None:
+            self._discard(key, previous[2])
+
+    def _discard(self, key: int, cell: Cell) -> None:
+        members = self._cells[cell]
+        members.discard(key)
+        if not members:
+            del self._cells[cell]
+
+    def _candidates(
+        self, min_lat: float, min_lon: float, max_lat: float, max_lon: float
+    ) -> list[int]:
+        low_row, low_col = self._cell(min_lat, min_lon)
+        high_row, high_col = self._cell(max_lat, max_lon)
+        span = (high_row - low_row + 1) * (high_col - low_col + 1)
+        keys: list[int] = []
+        if span > len(self._cells):
+            # Huge viewports: walking occupied cells is cheaper than enumerating the range.
+            for (row, col), members in self._cells.items():
+                if low_row <= row <= high_row and low_col <= col <= high_col:
+                    keys.extend(members)
+            return keys
+        for row in range(low_row, high_row + 1):
+            for col in range(low_col, high_col + 1):
+                members = self._cells.get((row, col))
+                if members:
+                    keys.extend(members)
+        return keys
+
+    def within(self, min_lat: float, min_lon: float, max_lat: float, max_lon: float) -> list[int]:
+        """Return keys whose point lies inside the bounding box (inclusive)."""
+
+        points = self._points
+        return [
+            key
+            for key in self._candidates(min_lat, min_lon, max_lat, max_lon)
+            if min_lat <= points[key][0] <= max_lat and min_lon <= points[key][1] <= max_lon
+        ]
+
+    def nearby(
+        self, lat: float, lon: float, radius_m: float, limit: int | None = None
+    ) -> list[tuple[int, float]]:
+        """Return ``(key, distance_m)`` pairs within ``radius_m``, nearest first."""
+
+        dlat = radius_m / METERS_PER_DEGREE_LAT
+        # Longitude degrees shrink with latitude; clamp so polar queries stay bounded.
+        dlon = min(180.0, dlat / max(math.cos(math.radians(lat)), 1e-6))
+        points = self._points
+        matches = []
+        for key in self._candidates(lat - dlat, lon - dlon, lat + dlat, lon + dlon):
+            point_lat, point_lon, _ = points[key]
+            distance = haversine_m(lat, lon, point_lat, point_lon)
+            if distance <= radius_m:
+                matches.append((key, distance))
+        matches.sort(key=lambda match: match[1])
+        return matches if limit is None else matches[:limit]
@@ -0,0 +1,200 @@
+"""Deterministic synthetic fleet data for capacity testing.
+
+Every route and bus draws from its own generator seeded with ``(seed, kind, index)``, so
+any slice of the fleet can be produced independently (and in parallel) and a given seed
+always yields the same rows.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any
+
+import numpy as np
+
+from .spatial import METERS_PER_DEGREE_LAT
+
+CITY_CENTER = (40.73, -73.99)
+CITY_RADIUS_KM = 20.0
+SERVICE_START_HOUR = 5
+SNAPSHOT_SOURCES = ("DOT Feed", "Waze", "City Sensors")
+INCIDENT_TYPES = ("congestion", "collision", "roadwork", "closure", "weather")
+
+_ROUTE_STREAM = 0
+_BUS_STREAM = 1
+_SNAPSHOT_STREAM = 2
+_PREDICTION_STREAM = 3
+_KM_PER_DEGREE_LAT = METERS_PER_DEGREE_LAT / 1000
+
+
+def _rng(seed: int, stream: int, index: int) -> np.random.Generator:
+    return np.random.default_rng([seed, stream, index])
+
+
+@dataclass(frozen=True, slots=True)
+class SyntheticRoute:
+    index: int
+    origin_lat: float
+    origin_lon: float
+    bearing_deg: float
+    length_km: float
+    base_speed_kph: float
+
+
+@dataclass(slots=True)
+class TelemetryColumns:
+    epoch_seconds: np.ndarray
+    latitude: np.ndarray
+    longitude: np.ndarray
+    speed_kph: np.ndarray
+    heading: np.ndarray
+    passenger_load: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.epoch_seconds)
+
+
+def synthetic_route(seed: int, index: int) -> SyntheticRoute:
+    """A straight corridor starting somewhere in the city, 5-30 km long."""
+
+    rng = _rng(seed, _ROUTE_STREAM, index)
+    distance = CITY_RADIUS_KM * math.sqrt(rng.uniform())
+    angle = rng.uniform(0, 2 * math.pi)
+    origin_lat = CITY_CENTER[0] + distance * math.cos(angle) / _KM_PER_DEGREE_LAT
+    origin_lon = CITY_CENTER[1] + distance * math.sin(angle) / (
+        _KM_PER_DEGREE_LAT * math.cos(math.radians(CITY_CENTER[0]))
+    )
+    return SyntheticRoute(
+        index=index,
+        origin_lat=origin_lat,
+        origin_lon=origin_lon,
+        bearing_deg=float(rng.uniform(0, 360)),
+        length_km=float(rng.uniform(5, 30)),
+        base_speed_kph=float(rng.uniform(22, 45)),
+    )
+
+
+def demand_profile(hours: np.ndarray) -> np.ndarray:
+    """Relative demand (0-1) by hour of day, with morning and evening peaks."""
+
+    morning = np.exp(-(((hours - 8.0) / 1.3) ** 2))
+    evening = np.exp(-(((hours - 17.5) / 1.8) ** 2))
+    return np.clip(0.15 + 0.85 * np.maximum(morning, evening), 0.0, 1.0)
+
+
+def bus_telemetry(
+    seed: int,
+    bus_index: int,
+    route: SyntheticRoute,
+    start: datetime,
+    end: datetime,
+    ping_seconds: int,
+    capacity: int = 40,
+) -> TelemetryColumns:
+    """Fixes for one bus shuttling along its route during service hours in ``[start, end)``.
+
+    The generator is keyed on the window start too, so consecutive windows of the same
+    bus are independent draws and can be produced by different workers.
+    """
+
+    rng = np.random.default_rng([seed, _BUS_STREAM, bus_index, int(start.timestamp())])
+    first = int(start.timestamp()) + int(rng.integers(ping_seconds))
+    times = np.arange(first, int(end.timestamp()), ping_seconds, dtype=np.int64)
+    hours = (times % 86_400) / 3_600
+    in_service = hours >= SERVICE_START_HOUR
+    times, hours = times[in_service], hours[in_service]
+    count = len(times)
+
+    demand = demand_profile(hours)
+    speed = route.base_speed_kph * (1 - 0.45 * demand) * rng.lognormal(0.0, 0.15, count)
+    speed[rng.uniform(size=count) < 0.12] = 0.0  # dwelling at a stop or a light
+    speed = np.clip(speed, 0.0, 90.0)
+
+    # Shuttle end to end: distance travelled folds into a position along the corridor.
+    lap = 2 * route.length_km
+    travelled = rng.uniform(0, lap) + np.cumsum(speed * ping_seconds / 3_600)
+    phase = np.mod(travelled, lap)
+    outbound = phase < route.length_km
+    along = np.where(outbound, phase, lap - phase)
+
+    bearing = math.radians(route.bearing_deg)
+    lon_scale = _KM_PER_DEGREE_LAT * math.cos(math.radians(route.origin_lat))
+    latitude = route.origin_lat + along * math.cos(bearing) / _KM_PER_DEGREE_LAT
+    longitude = route.origin_lon + along * math.sin(bearing) / lon_scale
+    latitude += rng.normal(0.0, 0.00003, count)
+    longitude += rng.normal(0.0, 0.00003, count)
+
+    heading = np.where(outbound, route.bearing_deg, route.bearing_deg + 180.0) % 360
+    load = capacity * demand * rng.uniform(0.4, 1.1, count) + rng.normal(0.0, 2.0, count)
+
+    return TelemetryColumns(
+        epoch_seconds=times,
+        latitude=np.round(latitude, 6),
+        longitude=np.round(longitude, 6),
+        speed_kph=np.round(speed, 1),
+        heading=heading.astype(np.int16),
+        passenger_load=np.clip(np.rint(load), 0, capacity * 1.3).astype(np.int16),
+    )
+
+
+def traffic_snapshots(
+    seed: int, source_index: int, start: datetime, end: datetime, every_minutes: int
+) -> list[dict[str, Any]]:
+    """Periodic congestion observations from one feed."""
+
+    rng = _rng(seed, _SNAPSHOT_STREAM, source_index)
+    times = np.arange(int(start.timestamp()), int(end.timestamp()), every_minutes * 60)
+    demand = demand_profile((times % 86_400) / 3_600)
+    congestion = np.clip(np.rint(100 * demand + rng.normal(0, 8, len(times))), 0, 100)
+    incidents = rng.poisson(0.5 + 3 * demand)
+    speeds = np.round(50 * (1 - 0.6 * demand) + rng.normal(0, 3, len(times)), 1)
+    incident_types = rng.integers(len(INCIDENT_TYPES), size=len(times))
+    segments = rng.integers(1, 5_000, size=len(times))
+
+    rows = []
+    for position, epoch in enumerate(times.tolist()):
+        has_incident = bool(incidents[position])
+        rows.append(
+            {
+                "source": SNAPSHOT_SOURCES[source_index % len(SNAPSHOT_SOURCES)],
+                "captured_at": datetime.fromtimestamp(epoch, tz=timezone.utc),
+                "congestion_index": int(congestion[position]),
+                "incident_count": int(incidents[position]),
+                "average_speed_kph": float(speeds[position]),
+                "payload": {
+                    "segment_id": f"S{int(segments[position]):05d}",
+                    "incident_type": (
+                        INCIDENT_TYPES[incident_types[position]] if has_incident else None
+                    ),
+                    "severity": int(rng.integers(1, 6)) if has_incident else None,
+                },
+            }
+        )
+    return rows
+
+
+def route_predictions(
+    seed: int, route: SyntheticRoute, start: datetime, end: datetime, every_minutes: int
+) -> list[dict[str, Any]]:
+    """Historical forecasts issued for a route every ``every_minutes``."""
+
+    rng = _rng(seed, _PREDICTION_STREAM, route.index)
+    issued = np.arange(int(start.timestamp()), int(end.timestamp()), every_minutes * 60)
+    demand = demand_profile((issued % 86_400) / 3_600)
+    speed = route.base_speed_kph * (1 - 0.45 * demand)
+    travel = np.rint(route.length_km / speed * 60 * rng.uniform(0.9, 1.15, len(issued)))
+    headway = np.clip(np.rint(20 - 12 * demand + rng.normal(0, 1.5, len(issued))), 3, 30)
+    confidence = np.round(np.clip(rng.normal(0.75, 0.08, len(issued)), 0.3, 0.99), 2)
+    return [
+        {
+            "target_arrival": datetime.fromtimestamp(
+                epoch + int(headway[position]) * 60, tz=timezone.utc
+            ),
+            "estimated_headway_minutes": int(headway[position]),
+            "travel_time_minutes": int(travel[position]),
+            "confidence": float(confidence[position]),
+        }
+        for position, epoch in enumerate(issued.tolist())
+    ]
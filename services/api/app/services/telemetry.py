@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import get_settings
+from ..models import Bus, TelemetryRecord
+from ..schemas.telemetry import TelemetryPoint
+from .map_matching import RouteMatcher, get_route_matcher
+from .positions import PositionStore, get_position_store
+from .pubsub import TelemetryHub, get_telemetry_hub
+
+
+@dataclass(slots=True)
+class IngestSummary:
+    """Outcome of a single telemetry batch."""
+
+    received: int = 0
+    accepted: int = 0
+    duplicates: int = 0
+    rejected: int = 0
+    rejections: list[dict[str, Any]] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+    rows_per_second: float = 0.0
+
+
+@dataclass(slots=True)
+class PreparedBatch:
+    """Validated, de-duplicated rows ready for a multi-row insert."""
+
+    rows: list[dict[str, Any]]
+    duplicates: int
+    rejections: list[dict[str, Any]]
+
+
+def validate_point(point: TelemetryPoint) -> str | None:
+    """Return a rejection reason for an out-of-range fix, or ``None`` if it is usable."""
+
+    if not -90.0 <= point.latitude <= 90.0:
+        return "latitude out of range"
+    if not -180.0 <= point.longitude <= 180.0:
+        return "longitude out of range"
+    if point.speed_kph is not None and point.speed_kph < 0:
+        return "speed_kph must be non-negative"
+    if point.heading is not None and not 0 <= point.heading < 360:
+        return "heading out of range"
+    if point.passenger_load is not None and point.passenger_load < 0:
+        return "passenger_load must be non-negative"
+    return None
+
+
+def prepare_batch(
+    points: Sequence[TelemetryPoint],
+    known_bus_ids: set[int],
+    *,
+    not_before: datetime | None = None,
+    not_after: datetime | None = None,
+) -> PreparedBatch:
+    """Validate points and drop duplicates within the batch.
+
+    Unknown buses are rejected up front because a single foreign-key violation would
+    otherwise abort the whole multi-row insert. Timestamps outside ``[not_before,
+    not_after]`` are rejected so writes stay within the managed partitions.
+    """
+
+    rows: list[dict[str, Any]] = []
+    rejections: list[dict[str, Any]] = []
+    seen: set[tuple[int, datetime]] = set()
+    duplicates = 0
+
+    for index, point in enumerate(points):
+        reason = validate_point(point)
+        if reason is None and point.bus_id not in known_bus_ids:
+            reason = "unknown bus_id"
+        if reason is not None:
+            rejections.append({"index": index, "reason": reason})
+            continue
+
+        recorded_at = point.recorded_at
+        if recorded_at.tzinfo is None:
+            recorded_at = recorded_at.replace(tzinfo=timezone.utc)
+        if not_before is not None and recorded_at < not_before:
+            rejections.append({"index": index, "reason": "recorded_at is past retention"})
+            continue
+        if not_after is not None and recorded_at > not_after:
+            rejections.append({"index": index, "reason": "recorded_at is in the future"})
+            continue
+        key = (point.bus_id, recorded_at)
+        if key in seen:
+            duplicates += 1
+            continue
+        seen.add(key)
+        rows.append(
+            {
+                "bus_id": point.bus_id,
+                "recorded_at": recorded_at,
+                "latitude": point.latitude,
+                "longitude": point.longitude,
+                "speed_kph": point.speed_kph,
+                "heading": point.heading,
+                "passenger_load": point.passenger_load,
+            }
+        )
+
+    return PreparedBatch(rows=rows, duplicates=duplicates, rejections=rejections)
+
+
+def _chunks(rows: list[dict[str, Any]], size: int) -> Iterable[list[dict[str, Any]]]:
+    for start in range(0, len(rows), size):
+        yield rows[start : start + size]
+
+
+class TelemetryIngestService:
+    """Write telemetry batches with multi-row ``INSERT ... ON CONFLICT DO NOTHING``."""
+
+    def __init__(
+        self,
+        positions: PositionStore | None = None,
+        hub: TelemetryHub | None = None,
+        matcher: RouteMatcher | None = None,
+    ) -> None:
+        self._positions = positions if positions is not None else get_position_store()
+        self._hub = hub if hub is not None else get_telemetry_hub()
+        self._matcher = matcher if matcher is not None else get_route_matcher()
+
+    async def known_bus_ids(self, session: AsyncSession, bus_ids: set[int]) -> set[int]:
+        """Return the subset of ``bus_ids`` that exist, refreshing their position-store slots."""
+
+        if not bus_ids:
+            return set()
+        result = await session.execute(
+            select(Bus.id, Bus.route_id, Bus.status).where(Bus.id.in_(bus_ids))
+        )
+        known = set()
+        for bus_id, route_id, bus_status in result:
+            self._positions.register_bus(bus_id, route_id, bus_status)
+            known.add(bus_id)
+        return known
+
+    async def insert_rows(self, session: AsyncSession, rows: list[dict[str, Any]]) -> int:
+        """Insert rows in bounded chunks and return how many were newly written."""
+
+        # asyncpg caps a statement at 32767 bind parameters, so chunk well below that.
+        chunk_size = get_settings().telemetry_insert_chunk_size
+        table = TelemetryRecord.__table__
+        inserted = 0
+        for chunk in _chunks(rows, chunk_size):
+            stmt = (
+                insert(table)
+                .values(chunk)
+                .on_conflict_do_nothing(constraint="uq_telemetry_bus_recorded_at")
+                .returning(table.c.id)
+            )
+            result = await session.execute(stmt)
+            inserted += len(result.all())
+        return inserted
+
+    def apply_positions(self, rows: list[dict[str, Any]]) -> None:
+        """Advance the position store, publish new latest fixes, and map-match the batch."""
+
+        for row in rows:
+            if self._positions.update(**row):
+                position = self._positions.get(row["bus_id"])
+                if position is not None:
+                    self._hub.publish(position)
+        self._matcher.observe(rows)
+
+    async def ingest(
+        self, session: AsyncSession, points: Sequence[TelemetryPoint]
+    ) -> IngestSummary:
+        started = time.perf_counter()
+        settings = get_settings()
+        now = datetime.now(timezone.utc)
+        retention = settings.telemetry_retention_days
+        known = await self.known_bus_ids(session, {point.bus_id for point in points})
+        batch = prepare_batch(
+            points,
+            known,
+            not_before=now - timedelta(days=retention) if retention is not None else None,
+            not_after=now + timedelta(seconds=settings.telemetry_max_clock_skew_seconds),
+        )
+
+        accepted = 0
+        if batch.rows:
+            accepted = await self.insert_rows(session, batch.rows)
+            await session.commit()
+            self.apply_positions(batch.rows)
+
+        elapsed = time.perf_counter() - started
+        return IngestSummary(
+            received=len(points),
+            accepted=accepted,
+            duplicates=batch.duplicates + (len(batch.rows) - accepted),
+            rejected=len(batch.rejections),
+            rejections=batch.rejections,
+            elapsed_ms=round(elapsed * 1000, 3),
+            rows_per_second=round(len(points) / elapsed, 1) if elapsed > 0 else 0.0,
+        )
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Sequence
+
+from sqlalchemy import Select, String, and_, column, or_, select, true, type_coerce, values
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models import TrafficSnapshot
+from .pagination import InvalidCursorError, cursor_datetime, decode_cursor, encode_cursor
+
+SNAPSHOT_COLUMNS = (
+    TrafficSnapshot.id,
+    TrafficSnapshot.source,
+    TrafficSnapshot.captured_at,
+    TrafficSnapshot.congestion_index,
+    TrafficSnapshot.incident_count,
+    TrafficSnapshot.average_speed_kph,
+    TrafficSnapshot.incident_type,
+    TrafficSnapshot.segment_id,
+    TrafficSnapshot.payload,
+)
+
+
+def snapshot_filter_statement(
+    *,
+    source: str | None = None,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    incident_type: str | None = None,
+    segment_id: str | None = None,
+    payload: dict[str, Any] | None = None,
+) -> Select:
+    """Snapshots matching every given filter, newest first.
+
+    Promoted keys compare against their generated columns (btree indexes), and ``payload``
+    becomes a JSONB containment test that the ``jsonb_path_ops`` GIN index answers.
+    """
+
+    captured_at = TrafficSnapshot.captured_at
+    stmt = select(*SNAPSHOT_COLUMNS)
+    if source is not None:
+        stmt = stmt.where(TrafficSnapshot.source == source)
+    if start is not None:
+        stmt = stmt.where(captured_at >= start)
+    if end is not None:
+        stmt = stmt.where(captured_at < end)
+    if incident_type is not None:
+        stmt = stmt.where(TrafficSnapshot.incident_type == incident_type)
+    if segment_id is not None:
+        stmt = stmt.where(TrafficSnapshot.segment_id == segment_id)
+    if payload:
+        stmt = stmt.where(type_coerce(TrafficSnapshot.payload, JSONB).contains(payload))
+    return stmt.order_by(captured_at.desc(), TrafficSnapshot.id.desc())
+
+
+def latest_per_source_statement(
+    sources: Sequence[str] | None = None, since: datetime | None = None
+) -> Select:
+    """Newest snapshot for each source, one index probe per source.
+
+    Without an explicit ``sources`` list the distinct sources come from a recursive skip
+    scan over ``ix_traffic_snapshots_source_captured_at`` rather than a full DISTINCT.
+    """
+
+    snapshot = TrafficSnapshot
+    if not sources:
+        first = select(snapshot.source).order_by(snapshot.source).limit(1).subquery()
+        source_cte = select(first.c.source).cte("snapshot_sources", recursive=True)
+        following = (
+            select(snapshot.source)
+            .where(snapshot.source > source_cte.c.source)
+            .order_by(snapshot.source)
+            .limit(1)
+            .scalar_subquery()
+        )
+        source_cte = source_cte.union_all(
+            select(following).where(source_cte.c.source.is_not(None))
+        )
+    else:
+        source_cte = (
+            values(column("source", String), name="snapshot_sources")
+            .data([(source,) for source in dict.fromkeys(sources)])
+        )
+
+    latest = select(*SNAPSHOT_COLUMNS).where(snapshot.source == source_cte.c.source)
+    if since is not None:
+        latest = latest.where(snapshot.captured_at >= since)
+    latest = latest.order_by(snapshot.captured_at.desc(), snapshot.id.desc()).limit(1)
+    latest = latest.lateral("latest")
+    return (
+        select(latest)
+        .select_from(source_cte.join(latest, true()))
+        .where(source_cte.c.source.is_not(None))
+        .order_by(latest.c.source)
+    )
+
+
+class TrafficSnapshotService:
+    async def list_snapshots(
+        self,
+        session: AsyncSession,
+        limit: int,
+        cursor: str | None = None,
+        **filters: Any,
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        stmt = snapshot_filter_statement(**filters)
+        if cursor is not None:
+            position = decode_cursor("traffic", cursor)
+            before = cursor_datetime(position, "t")
+            before_id = position.get("id")
+            if not isinstance(before_id, int):
+                raise InvalidCursorError("Malformed cursor")
+            captured_at = TrafficSnapshot.captured_at
+            stmt = stmt.where(
+                captured_at <= before,
+                or_(
+                    captured_at < before,
+                    and_(captured_at == before, TrafficSnapshot.id < before_id),
+                ),
+            )
+
+        rows = [dict(row) for row in (await session.execute(stmt.limit(limit + 1))).mappings()]
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = encode_cursor(
+                "traffic", t=last["captured_at"].isoformat(), id=last["id"]
+            )
+        return rows, next_cursor
+
+    async def latest_per_source(
+        self,
+        session: AsyncSession,
+        sources: Sequence[str] | None = None,
+        since: datetime | None = None,
+    ) -> list[dict[str, Any]]:
+        result = await session.execute(latest_per_source_statement(sources, since))
+        return [dict(row) for row in result.mappings()]
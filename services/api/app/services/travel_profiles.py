@@ -0,0 +1,375 @@
+from __future__ import annotations
+
+import logging
+import os
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Sequence
+from zoneinfo import ZoneInfo
+
+import numpy as np
+from sqlalchemy import Float, cast, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import get_settings
+from ..models import Bus, TelemetryRecord, TrafficSnapshot
+from .kinematics import CONGESTION_SLOWDOWN, haversine_km
+
+logger = logging.getLogger(__name__)
+
+DAYS = 7
+QUANTILES = (0.5, 0.85, 0.95)
+# Pace histogram bins in minutes per km, log-spaced from ~100 km/h down to 1 km/h.
+PACE_EDGES = np.geomspace(0.6, 60.0, 49)
+_MIN_STEP_KM = 0.02
+_MAX_STEP_SECONDS = 300.0
+
+
+@dataclass(slots=True)
+class PaceSamples:
+    """Per-step pace observations with the profile cell each one falls in."""
+
+    route_ids: np.ndarray
+    day: np.ndarray
+    slot: np.ndarray
+    pace: np.ndarray
+
+
+def local_day_and_slot(
+    epoch_seconds: np.ndarray, tz: ZoneInfo, bucket_minutes: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Local weekday (Monday = 0) and time-of-day bucket of each timestamp.
+
+    The UTC offset is resolved once per distinct hour rather than per sample, which keeps
+    DST transitions exact without a Python call per row.
+    """
+
+    hours, inverse = np.unique(np.floor_divide(epoch_seconds, 3600), return_inverse=True)
+    offsets = np.array(
+        [
+            datetime.fromtimestamp(hour * 3600, tz).utcoffset().total_seconds()  # type: ignore[union-attr]
+            for hour in hours.tolist()
+        ]
+    )
+    local = epoch_seconds + offsets[inverse]
+    days = np.floor_divide(local, 86_400)
+    # 1970-01-01 was a Thursday (weekday 3).
+    day = ((days + 3) % DAYS).astype(np.int64)
+    slot = (np.floor_divide(local - days * 86_400, bucket_minutes * 60)).astype(np.int64)
+    return day, slot
+
+
+def pace_samples(
+    route_ids: np.ndarray,
+    bus_ids: np.ndarray,
+    epoch_seconds: np.ndarray,
+    latitude: np.ndarray,
+    longitude: np.ndarray,
+    tz: ZoneInfo,
+    bucket_minutes: int,
+) -> PaceSamples:
+    """Turn consecutive fixes of each bus into minutes-per-km pace observations."""
+
+    order = np.lexsort((epoch_seconds, bus_ids))
+    bus = bus_ids[order]
+    ts = epoch_seconds[order]
+    lat = latitude[order]
+    lon = longitude[order]
+    dt = np.diff(ts)
+    km = haversine_km(lat[:-1], lon[:-1], lat[1:], lon[1:])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pace = dt / 60 / km
+    step = (
+        (bus[1:] == bus[:-1])
+        & (dt > 0)
+        & (dt <= _MAX_STEP_SECONDS)
+        & (km >= _MIN_STEP_KM)
+        & (pace >= PACE_EDGES[0])
+        & (pace <= PACE_EDGES[-1])
+    )
+    # A step belongs to the bucket in which it started.
+    day, slot = local_day_and_slot(ts[:-1][step], tz, bucket_minutes)
+    return PaceSamples(
+        route_ids=route_ids[order][:-1][step], day=day, slot=slot, pace=pace[step]
+    )
+
+
+def pace_percentiles(counts: np.ndarray, quantiles: Sequence[float] = QUANTILES) -> np.ndarray:
+    """Percentile pace per histogram along the last axis; NaN where a cell is empty.
+
+    Values are interpolated geometrically within the bin that crosses each quantile.
+    """
+
+    cumulative = np.cumsum(counts, axis=-1, dtype=np.float64)
+    total = cumulative[..., -1:]
+    log_edges = np.log(PACE_EDGES)
+    result = np.full((*counts.shape[:-1], len(quantiles)), np.nan, dtype=np.float32)
+    populated = total[..., 0] > 0
+    for index, quantile in enumerate(quantiles):
+        target = quantile * total
+        bin_index = np.minimum((cumulative < target).sum(axis=-1), counts.shape[-1] - 1)
+        below = np.take_along_axis(cumulative, bin_index[..., None], -1)[..., 0]
+        in_bin = np.take_along_axis(counts, bin_index[..., None], -1)[..., 0]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            within = np.clip(1 - (below - target[..., 0]) / in_bin, 0.0, 1.0)
+        log_pace = log_edges[bin_index] + np.nan_to_num(within) * np.diff(log_edges)[bin_index]
+        result[..., index] = np.where(populated, np.exp(log_pace), np.nan)
+    return result
+
+
+class TravelProfiles:
+    """Historical pace (minutes per km) by route, local weekday and time-of-day bucket.
+
+    Raw histograms are kept for incremental refreshes; lookups only touch the
+    precomputed percentile table, so an ETA is a dict lookup plus one array index.
+    """
+
+    def __init__(
+        self,
+        route_ids: np.ndarray,
+        counts: np.ndarray,
+        congestion: np.ndarray,
+        *,
+        bucket_minutes: int,
+        timezone_name: str,
+        built_through: datetime | None,
+        percentiles: np.ndarray | None = None,
+    ) -> None:
+        self.route_ids = route_ids
+        self.counts = counts
+        self.congestion = congestion
+        self.bucket_minutes = bucket_minutes
+        self.timezone_name = timezone_name
+        self.built_through = built_through
+        self.percentiles = percentiles if percentiles is not None else pace_percentiles(counts)
+        self.tz = ZoneInfo(timezone_name)
+        self.source_mtime: float | None = None
+        self._rows = {int(route_id): row for row, route_id in enumerate(route_ids.tolist())}
+        self._typical_congestion = self._mean_congestion()
+
+    def _mean_congestion(self) -> np.ndarray:
+        # Mean congestion index historically seen in each weekday/bucket cell.
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(
+                self.congestion[1] > 0, self.congestion[0] / self.congestion[1], np.nan
+            )
+
+    @classmethod
+    def empty(cls, bucket_minutes: int = 15, timezone_name: str = "UTC") -> TravelProfiles:
+        slots = 1440 // bucket_minutes
+        return cls(
+            np.zeros(0, dtype=np.int64),
+            np.zeros((0, DAYS, slots, len(PACE_EDGES) - 1), dtype=np.uint32),
+            np.zeros((2, DAYS, slots)),
+            bucket_minutes=bucket_minutes,
+            timezone_name=timezone_name,
+            built_through=None,
+        )
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @property
+    def slots(self) -> int:
+        return self.counts.shape[2]
+
+    def cell(self, at: datetime) -> tuple[int, int]:
+        local = at.astimezone(self.tz)
+        return local.weekday(), (local.hour * 60 + local.minute) // self.bucket_minutes
+
+    def pace(
+        self,
+        route_id: int,
+        at: datetime,
+        quantile: float = 0.5,
+        congestion_index: float | None = None,
+    ) -> float | None:
+        """Historical pace for the route at ``at``, or ``None`` without enough history.
+
+        With ``congestion_index``, the pace is scaled by how far current congestion is
+        from what is typical for that weekday and time of day.
+        """
+
+        row = self._rows.get(route_id)
+        if row is None:
+            return None
+        day, slot = self.cell(at)
+        value = float(self.percentiles[row, day, slot, QUANTILES.index(quantile)])
+        if value != value:
+            return None
+        if congestion_index is not None:
+            typical = self._typical_congestion[day, slot]
+            if typical == typical:
+                value *= 1 + CONGESTION_SLOWDOWN * (congestion_index - typical) / 100
+        return value
+
+    def add(
+        self, samples: PaceSamples, congestion: tuple[np.ndarray, np.ndarray, np.ndarray]
+    ) -> None:
+        """Fold in pace samples and ``(day, slot, congestion_index)`` snapshot columns."""
+
+        new_routes = np.setdiff1d(samples.route_ids, self.route_ids)
+        if len(new_routes):
+            self.route_ids = np.concatenate((self.route_ids, new_routes))
+            grown = np.zeros((len(new_routes), *self.counts.shape[1:]), dtype=self.counts.dtype)
+            self.counts = np.concatenate((self.counts, grown))
+            self._rows = {int(route_id): row for row, route_id in enumerate(self.route_ids)}
+        sorter = np.argsort(self.route_ids)
+        rows = sorter[np.searchsorted(self.route_ids, samples.route_ids, sorter=sorter)]
+        bins = np.searchsorted(PACE_EDGES, samples.pace, "right") - 1
+        bins = np.clip(bins, 0, len(PACE_EDGES) - 2)
+        np.add.at(self.counts, (rows, samples.day, samples.slot, bins), 1)
+
+        day, slot, index = congestion
+        np.add.at(self.congestion[0], (day, slot), index)
+        np.add.at(self.congestion[1], (day, slot), 1)
+        self.percentiles = pace_percentiles(self.counts)
+        self._typical_congestion = self._mean_congestion()
+
+    def save(self, path: Path) -> None:
+        """Write all arrays to one uncompressed ``.npz``, replacing ``path`` atomically."""
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_name(f".{path.name}.tmp")
+        with temporary.open("wb") as handle:
+            np.savez(
+                handle,
+                route_ids=self.route_ids,
+                counts=self.counts,
+                percentiles=self.percentiles,
+                congestion=self.congestion,
+                bucket_minutes=np.int64(self.bucket_minutes),
+                timezone=np.str_(self.timezone_name),
+                built_through=np.float64(
+                    self.built_through.timestamp() if self.built_through else np.nan
+                ),
+            )
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path: Path, *, with_counts: bool = False) -> TravelProfiles:
+        """Read a profile file; the API skips the raw histograms it never needs."""
+
+        with np.load(path) as data:
+            built_through = float(data["built_through"])
+            percentiles = data["percentiles"]
+            counts = (
+                data["counts"]
+                if with_counts
+                else np.zeros((*percentiles.shape[:3], 0), dtype=np.uint32)
+            )
+            return cls(
+                data["route_ids"],
+                counts,
+                data["congestion"],
+                bucket_minutes=int(data["bucket_minutes"]),
+                timezone_name=str(data["timezone"]),
+                built_through=(
+                    None
+                    if built_through != built_through
+                    else datetime.fromtimestamp(built_through, timezone.utc)
+                ),
+                percentiles=percentiles,
+            )
+
+
+class TravelProfileBuilder:
+    """Fold telemetry into a :class:`TravelProfiles` file one day at a time."""
+
+    async def _samples(
+        self, session: AsyncSession, profiles: TravelProfiles, start: datetime, end: datetime
+    ) -> PaceSamples:
+        rows = (
+            await session.execute(
+                select(
+                    Bus.route_id,
+                    TelemetryRecord.bus_id,
+                    cast(func.extract("epoch", TelemetryRecord.recorded_at), Float),
+                    TelemetryRecord.latitude,
+                    TelemetryRecord.longitude,
+                )
+                .join(Bus, Bus.id == TelemetryRecord.bus_id)
+                .where(TelemetryRecord.recorded_at >= start, TelemetryRecord.recorded_at < end)
+            )
+        ).all()
+        columns = list(zip(*rows)) or [(), (), (), (), ()]
+        return pace_samples(
+            np.asarray(columns[0], dtype=np.int64),
+            np.asarray(columns[1], dtype=np.int64),
+            np.asarray(columns[2], dtype=np.float64),
+            np.asarray(columns[3], dtype=np.float64),
+            np.asarray(columns[4], dtype=np.float64),
+            profiles.tz,
+            profiles.bucket_minutes,
+        )
+
+    async def _congestion(
+        self, session: AsyncSession, profiles: TravelProfiles, start: datetime, end: datetime
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        rows = (
+            await session.execute(
+                select(
+                    cast(func.extract("epoch", TrafficSnapshot.captured_at), Float),
+                    TrafficSnapshot.congestion_index,
+                ).where(TrafficSnapshot.captured_at >= start, TrafficSnapshot.captured_at < end)
+            )
+        ).all()
+        epoch = np.asarray([row[0] for row in rows], dtype=np.float64)
+        day, slot = local_day_and_slot(epoch, profiles.tz, profiles.bucket_minutes)
+        return day, slot, np.asarray([row[1] for row in rows], dtype=np.float64)
+
+    async def refresh(
+        self,
+        session: AsyncSession,
+        profiles: TravelProfiles,
+        until: datetime,
+        history_days: int,
+    ) -> int:
+        """Add everything between the profile's watermark and ``until``; return samples."""
+
+        start = profiles.built_through or until - timedelta(days=history_days)
+        added = 0
+        while start < until:
+            end = min(start + timedelta(days=1), until)
+            samples = await self._samples(session, profiles, start, end)
+            profiles.add(samples, await self._congestion(session, profiles, start, end))
+            profiles.built_through = end
+            added += len(samples.pace)
+            start = end
+        return added
+
+
+@lru_cache
+def get_travel_profiles() -> TravelProfiles:
+    """Return the process-wide travel profiles, loaded from the configured file."""
+
+    settings = get_settings()
+    path = Path(settings.travel_profile_path)
+    try:
+        profiles = TravelProfiles.load(path)
+    except FileNotFoundError:
+        logger.info("No travel profile file at %s; historical baselines are off", path)
+    except (OSError, ValueError, KeyError):
+        logger.warning("Could not read travel profiles from %s", path, exc_info=True)
+    else:
+        profiles.source_mtime = path.stat().st_mtime
+        return profiles
+    return TravelProfiles.empty(
+        settings.travel_profile_bucket_minutes, settings.travel_profile_timezone
+    )
+
+
+def reload_travel_profiles() -> bool:
+    """Swap in the profile file if it changed since it was loaded; return whether it did."""
+
+    path = Path(get_settings().travel_profile_path)
+    try:
+        mtime = path.stat().st_mtime
+    except FileNotFoundError:
+        return False
+    if mtime == get_travel_profiles().source_mtime:
+        return False
+    get_travel_profiles.cache_clear()
+    return get_travel_profiles().source_mtime == mtime
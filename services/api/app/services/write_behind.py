@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Awaitable, Callable, Sequence
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from ..core.config import get_settings
+from ..core.metrics import REGISTRY
+from ..db.session import get_sessionmaker
+from ..schemas.telemetry import TelemetryPoint
+from .telemetry import IngestSummary, TelemetryIngestService
+
+logger = logging.getLogger(__name__)
+
+BUFFER_RECORDS = REGISTRY.counter(
+    "telemetry_buffer_records_total",
+    "Single telemetry submissions by outcome "
+    "(buffered, coalesced, rejected_full, flush_failed, dropped)",
+    ("outcome",),
+)
+BUFFER_FLUSHES = REGISTRY.histogram(
+    "telemetry_buffer_flush_seconds",
+    "Wall time of write-behind buffer flushes",
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+Flusher = Callable[[Sequence[TelemetryPoint]], Awaitable[IngestSummary]]
+
+
+class BufferFull(Exception):
+    """Raised when the write-behind buffer has no room for another record."""
+
+    def __init__(self, retry_after: float) -> None:
+        super().__init__("Telemetry buffer is full")
+        self.retry_after = retry_after
+
+
+async def ingest_points(points: Sequence[TelemetryPoint]) -> IngestSummary:
+    """Write buffered points through the regular batch ingest path."""
+
+    async with get_sessionmaker()() as session:
+        return await TelemetryIngestService().ingest(session, points)
+
+
+def _buffer_key(point: TelemetryPoint) -> tuple[int, datetime]:
+    recorded_at = point.recorded_at
+    if recorded_at.tzinfo is None:
+        recorded_at = recorded_at.replace(tzinfo=timezone.utc)
+    return point.bus_id, recorded_at
+
+
+class TelemetryWriteBuffer:
+    """Coalesce single telemetry submissions into bulk inserts.
+
+    Records are keyed by ``(bus_id, recorded_at)``; a repeat of a key already waiting
+    is dropped, matching the first-write-wins ``ON CONFLICT DO NOTHING`` of the insert.
+    The buffer flushes as soon as ``flush_records`` are waiting and otherwise every
+    ``flush_seconds``, so a record waits at most that long. Beyond ``capacity`` submissions are
+    refused with :class:`BufferFull` so producers back off instead of growing memory.
+    """
+
+    def __init__(
+        self,
+        flush: Flusher = ingest_points,
+        *,
+        capacity: int = 50_000,
+        flush_records: int = 1_000,
+        flush_seconds: float = 1.0,
+    ) -> None:
+        self._flush = flush
+        self._capacity = capacity
+        self._flush_records = flush_records
+        self._flush_seconds = flush_seconds
+        self._pending: dict[tuple[int, datetime], TelemetryPoint] = {}
+        self._wake = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task[None] | None = None
+        self._stopping = False
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def submit(self, point: TelemetryPoint) -> bool:
+        """Queue ``point`` and return ``False`` if it coalesced with a waiting record."""
+
+        key = _buffer_key(point)
+        if key in self._pending:
+            BUFFER_RECORDS.inc("coalesced")
+            return False
+        if len(self._pending) >= self._capacity:
+            BUFFER_RECORDS.inc("rejected_full")
+            raise BufferFull(retry_after=self._flush_seconds)
+        self._pending[key] = point
+        BUFFER_RECORDS.inc("buffered")
+        if len(self._pending) >= self._flush_records:
+            self._wake.set()
+        return True
+
+    def start(self) -> None:
+        if self._task is None:
+            self._stopping = False
+            self._task = asyncio.create_task(self._run(), name="telemetry-write-behind")
+
+    async def stop(self) -> None:
+        """Stop the flush loop and write out whatever is still buffered.
+
+        The loop is asked to exit rather than cancelled, so a flush already in progress
+        finishes (or re-queues its batch) before the final flush runs.
+        """
+
+        if self._task is not None:
+            self._stopping = True
+            self._wake.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+    async def flush(self) -> int:
+        """Write every waiting record in one batch and return how many were taken."""
+
+        async with self._lock:
+            if not self._pending:
+                return 0
+            points = list(self._pending.values())
+            self._pending = {}
+            started = time.perf_counter()
+            try:
+                summary = await self._flush(points)
+            except (OSError, SQLAlchemyError):
+                self._requeue(points)
+                logger.warning("Telemetry buffer flush failed", exc_info=True)
+                return 0
+            except Exception:
+                # Not a connectivity problem, so retrying may fail the same way; keep the
+                # batch, but make the failure loud instead of letting it end the flush loop.
+                self._requeue(points)
+                BUFFER_RECORDS.inc("flush_failed", amount=len(points))
+                logger.exception("Telemetry buffer flush raised unexpectedly")
+                return 0
+            except asyncio.CancelledError:
+                # The insert is rolled back with its session; keep the batch for the next flush.
+                self._requeue(points)
+                raise
+            finally:
+                BUFFER_FLUSHES.observe(time.perf_counter() - started)
+        if summary.rejected:
+            logger.info("Telemetry buffer flush rejected %d records", summary.rejected)
+        return len(points)
+
+    def _requeue(self, points: list[TelemetryPoint]) -> None:
+        # Failed records go back in front of anything submitted during the flush; what
+        # no longer fits is dropped rather than overrunning the capacity.
+        merged: dict[tuple[int, datetime], TelemetryPoint] = {}
+        for point in points:
+            merged[_buffer_key(point)] = point
+        for key, point in self._pending.items():
+            merged.setdefault(key, point)
+        dropped = max(len(merged) - self._capacity, 0)
+        if dropped:
+            BUFFER_RECORDS.inc("dropped", amount=dropped)
+        self._pending = dict(list(merged.items())[: self._capacity])
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._wake.wait(), self._flush_seconds)
+            self._wake.clear()
+            await self.flush()
+
+
+@lru_cache
+def get_telemetry_buffer() -> TelemetryWriteBuffer:
+    """Return the process-wide telemetry write-behind buffer."""
+
+    settings = get_settings()
+    return TelemetryWriteBuffer(
+        capacity=settings.telemetry_buffer_capacity,
+        flush_records=settings.telemetry_buffer_flush_records,
+        flush_seconds=settings.telemetry_buffer_flush_seconds,
+    )
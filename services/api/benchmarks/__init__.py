@@ -0,0 +1,4 @@
+"""Performance benchmarks for the API and database hot paths.
+
+Run with ``python -m benchmarks`` from ``services/api`` against a local, migrated database.
+"""
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+from app.db.session import get_engine, get_sessionmaker
+
+from .cases import CASES, BenchContext
+from .fixtures import create_fleet, drop_fleet
+from .stats import BenchmarkResult, compare, format_table, load_results, save_results
+
+DEFAULT_BASELINE = Path(__file__).parent / "baselines" / "local.json"
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    parser.add_argument("--only", nargs="+", choices=[case.name for case in CASES])
+    parser.add_argument("--no-db", action="store_true", help="Skip cases that need Postgres")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--buses", type=int, default=50, help="Buses in the benchmark fleet")
+    parser.add_argument("--history-per-bus", type=int, default=2_000)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save", action="store_true", help="Store this run as the baseline")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="Allowed fractional p95/throughput drift before a run counts as a regression",
+    )
+    return parser.parse_args(argv)
+
+
+async def run(args: argparse.Namespace) -> list[BenchmarkResult]:
+    cases = [case for case in CASES if args.only is None or case.name in args.only]
+    if args.no_db:
+        cases = [case for case in cases if not case.needs_db]
+
+    ctx = BenchContext(iterations=args.iterations)
+    needs_db = any(case.needs_db for case in cases)
+    if needs_db:
+        ctx.sessionmaker = get_sessionmaker()
+        async with ctx.sessionmaker() as session:
+            ctx.fleet = await create_fleet(
+                session, buses=args.buses, history_per_bus=args.history_per_bus, predictions=20
+            )
+
+    results: list[BenchmarkResult] = []
+    try:
+        for case in cases:
+            print(f"running {case.name} ...", file=sys.stderr)
+            results.extend(await case.run(ctx))
+    finally:
+        if needs_db:
+            async with ctx.sessionmaker() as session:
+                await drop_fleet(session)
+            await get_engine().dispose()
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmarks, print a summary and compare against the stored baseline."""
+
+    args = parse_args(argv)
+    results = asyncio.run(run(args))
+    print(format_table(results))
+
+    if args.save:
+        save_results(args.baseline, results)
+        print(f"\nbaseline written to {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        return 0
+
+    regressions = compare(results, load_results(args.baseline), args.tolerance)
+    if not regressions:
+        print(f"\nno regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+        return 0
+    print(f"\nregressions against {args.baseline}:")
+    for regression in regressions:
+        print(
+            f"  {regression.name} {regression.metric}: {regression.baseline:.3f} -> "
+            f"{regression.current:.3f} ({regression.change:+.0%})"
+        )
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
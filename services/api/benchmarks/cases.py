@@ -0,0 +1,297 @@
+from __future__ import annotations
+
+import logging
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable
+
+import httpx
+import numpy as np
+from fastapi import FastAPI
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.responses import BulkJSONResponse
+from app.main import create_app
+from app.models.bus import BusStatus
+from app.schemas.history import TelemetryPage, TelemetryRecordOut
+from app.services.cache import TTLCache
+from app.services.history import HistoryService
+from app.services.map_matching import RouteGeometry, RouteMatcher
+from app.services.positions import PositionStore, get_position_store
+from app.services.prediction_reads import PredictionReadService
+from app.services.spatial import SpatialGrid
+from app.services.telemetry import TelemetryIngestService
+
+from .fixtures import BenchFleet
+from .stats import BenchmarkResult, measure
+
+
+@dataclass
+class BenchContext:
+    iterations: int
+    sessionmaker: async_sessionmaker[AsyncSession] | None = None
+    fleet: BenchFleet | None = None
+    ingest_batch_size: int = 1_000
+    store_buses: int = 5_000
+    serialization_rows: int = 5_000
+    shape_points: int = 400
+    seed: int = 7
+
+
+@dataclass(frozen=True)
+class Case:
+    name: str
+    needs_db: bool
+    run: Callable[[BenchContext], Awaitable[list[BenchmarkResult]]]
+
+
+def _filled_store(buses: int, rng: random.Random) -> PositionStore:
+    store = PositionStore(grid=SpatialGrid(0.01))
+    _fill_store(store, buses, rng)
+    return store
+
+
+def _fill_store(store: PositionStore, buses: int, rng: random.Random) -> None:
+    recorded_at = datetime.now(timezone.utc)
+    for bus_id in range(1, buses + 1):
+        store.register_bus(bus_id, route_id=bus_id % 50, status=BusStatus.IN_SERVICE)
+        store.update(
+            bus_id,
+            recorded_at,
+            40.70 + rng.uniform(-0.2, 0.2),
+            -74.00 + rng.uniform(-0.2, 0.2),
+            speed_kph=rng.uniform(0, 60),
+        )
+
+
+async def bench_positions(ctx: BenchContext) -> list[BenchmarkResult]:
+    rng = random.Random(ctx.seed)
+    store = _filled_store(ctx.store_buses, rng)
+
+    async def lookup() -> None:
+        store.get(rng.randint(1, ctx.store_buses))
+
+    async def route_snapshot() -> None:
+        store.snapshot(route_id=rng.randrange(50))
+
+    async def nearby() -> None:
+        store.nearby(40.70 + rng.uniform(-0.2, 0.2), -74.00 + rng.uniform(-0.2, 0.2), 1_000)
+
+    return [
+        await measure("positions.get", lookup, iterations=ctx.iterations * 10),
+        await measure("positions.route_snapshot", route_snapshot, iterations=ctx.iterations),
+        await measure("positions.nearby_1km", nearby, iterations=ctx.iterations),
+    ]
+
+
+async def bench_asgi(ctx: BenchContext) -> list[BenchmarkResult]:
+    _fill_store(get_position_store(), ctx.store_buses, random.Random(ctx.seed))
+    app = create_app()
+    # create_app configures INFO logging; per-request httpx lines would dominate the timing.
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def health() -> None:
+            (await client.get("/health")).raise_for_status()
+
+        async def positions() -> None:
+            (await client.get("/buses/positions", params={"route_id": 7})).raise_for_status()
+
+        return [
+            await measure("asgi.health", health, iterations=ctx.iterations),
+            await measure("asgi.route_positions", positions, iterations=ctx.iterations),
+        ]
+
+
+def _telemetry_rows(count: int, rng: random.Random) -> list[dict]:
+    start = datetime.now(timezone.utc)
+    return [
+        {
+            "id": index,
+            "bus_id": 1 + index % 50,
+            "recorded_at": start - timedelta(seconds=5 * index),
+            "latitude": 40.70 + rng.uniform(-0.2, 0.2),
+            "longitude": -74.00 + rng.uniform(-0.2, 0.2),
+            "speed_kph": rng.uniform(0, 60),
+            "heading": rng.randrange(360),
+            "passenger_load": None if index % 7 == 0 else rng.randrange(60),
+        }
+        for index in range(count)
+    ]
+
+
+async def bench_serialization(ctx: BenchContext) -> list[BenchmarkResult]:
+    """Per-model responses (the previous router style) against the bulk fast path."""
+
+    rows = _telemetry_rows(ctx.serialization_rows, random.Random(ctx.seed))
+    app = FastAPI()
+
+    @app.get("/models", response_model=TelemetryPage)
+    async def per_model() -> TelemetryPage:
+        return TelemetryPage(items=[TelemetryRecordOut(**row) for row in rows], next_cursor=None)
+
+    @app.get("/bulk", response_model=TelemetryPage)
+    async def bulk() -> BulkJSONResponse:
+        return BulkJSONResponse({"items": rows, "next_cursor": None})
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        def fetch(path: str) -> Callable[[], Awaitable[None]]:
+            async def call() -> None:
+                (await client.get(path)).raise_for_status()
+
+            return call
+
+        iterations = max(ctx.iterations // 4, 10)
+        return [
+            await measure(
+                f"serialize.models_{len(rows)}",
+                fetch("/models"),
+                iterations=iterations,
+                items_per_call=len(rows),
+            ),
+            await measure(
+                f"serialize.bulk_{len(rows)}",
+                fetch("/bulk"),
+                iterations=iterations,
+                items_per_call=len(rows),
+            ),
+        ]
+
+
+async def bench_map_matching(ctx: BenchContext) -> list[BenchmarkResult]:
+    """Map-match ingest-sized batches of fixes onto a wiggly ~20 km route shape."""
+
+    rng = np.random.default_rng(ctx.seed)
+    steps = np.linspace(0, 0.18, ctx.shape_points)
+    geometry = RouteGeometry(1, 40.70 + steps, -74.00 + 0.01 * np.sin(steps * 60))
+    store = PositionStore()
+    buses = 50
+    for bus_id in range(1, buses + 1):
+        store.register_bus(bus_id, route_id=1, status=BusStatus.IN_SERVICE)
+    matcher = RouteMatcher(store)
+    matcher.set_geometry(geometry)
+    batches = iter(range(1_000_000))
+
+    def batch() -> list[dict]:
+        # Each bus advances one ~50 m vertex per 10 s ping along the shape, with ~10 m of GPS noise.
+        first = next(batches) * ctx.ingest_batch_size // buses
+        started = datetime.now(timezone.utc)
+        rows = []
+        for index in range(ctx.ingest_batch_size):
+            bus_id = 1 + index % buses
+            step = (first + index // buses + bus_id * 7) % (ctx.shape_points - 1)
+            rows.append(
+                {
+                    "bus_id": bus_id,
+                    "recorded_at": started + timedelta(seconds=10 * (first + index // buses)),
+                    "latitude": float(geometry.latitude[step] + rng.normal(0, 1e-4)),
+                    "longitude": float(geometry.longitude[step] + rng.normal(0, 1e-4)),
+                }
+            )
+        return rows
+
+    prepared = [batch() for _ in range(ctx.iterations + 5)]
+    pending = iter(prepared)
+
+    async def observe() -> None:
+        matcher.observe(next(pending))
+
+    return [
+        await measure(
+            "map_matching.observe",
+            observe,
+            iterations=ctx.iterations,
+            items_per_call=ctx.ingest_batch_size,
+        )
+    ]
+
+
+async def bench_ingest(ctx: BenchContext) -> list[BenchmarkResult]:
+    assert ctx.sessionmaker is not None and ctx.fleet is not None
+    fleet = ctx.fleet
+    service = TelemetryIngestService(positions=PositionStore())
+    batches = iter(range(1_000_000))
+    per_bus = -(-ctx.ingest_batch_size // len(fleet.bus_ids))
+
+    async def ingest() -> None:
+        # Batches walk back from the seeded history so no fix is skipped as a duplicate
+        # and none is rejected as being in the future.
+        start = fleet.history_start - timedelta(seconds=5 * per_bus * (next(batches) + 1))
+        points = fleet.points(ctx.ingest_batch_size, start, timedelta(seconds=5))
+        async with ctx.sessionmaker() as session:
+            await service.ingest(session, points)
+
+    iterations = max(ctx.iterations // 10, 5)
+    return [
+        await measure(
+            "ingest.batch",
+            ingest,
+            iterations=iterations,
+            warmup=2,
+            items_per_call=ctx.ingest_batch_size,
+        )
+    ]
+
+
+async def bench_history(ctx: BenchContext) -> list[BenchmarkResult]:
+    assert ctx.sessionmaker is not None and ctx.fleet is not None
+    fleet = ctx.fleet
+    rng = random.Random(ctx.seed)
+    service = HistoryService()
+    span = (fleet.history_end - fleet.history_start).total_seconds()
+
+    async def first_page() -> None:
+        async with ctx.sessionmaker() as session:
+            await service.list_bus_telemetry(session, rng.choice(fleet.bus_ids), limit=100)
+
+    async def range_scan() -> None:
+        start = fleet.history_start + timedelta(seconds=rng.uniform(0, span * 0.8))
+        async with ctx.sessionmaker() as session:
+            await service.list_bus_telemetry(
+                session,
+                rng.choice(fleet.bus_ids),
+                limit=500,
+                start=start,
+                end=start + timedelta(seconds=span * 0.2),
+                order="asc",
+            )
+
+    return [
+        await measure("history.first_page", first_page, iterations=ctx.iterations),
+        await measure("history.range_scan", range_scan, iterations=ctx.iterations),
+    ]
+
+
+async def bench_prediction_reads(ctx: BenchContext) -> list[BenchmarkResult]:
+    assert ctx.sessionmaker is not None and ctx.fleet is not None
+    route_id = ctx.fleet.route_id
+    reads = PredictionReadService(TTLCache(maxsize=1_024, ttl_seconds=3_600))
+
+    async def cached() -> None:
+        async with ctx.sessionmaker() as session:
+            await reads.upcoming(session, route_id)
+
+    async def uncached() -> None:
+        reads.invalidate([route_id])
+        async with ctx.sessionmaker() as session:
+            await reads.upcoming(session, route_id)
+
+    return [
+        await measure("predictions.cache_hit", cached, iterations=ctx.iterations * 10),
+        await measure("predictions.cache_miss", uncached, iterations=ctx.iterations),
+    ]
+
+
+CASES = (
+    Case("positions", needs_db=False, run=bench_positions),
+    Case("asgi", needs_db=False, run=bench_asgi),
+    Case("serialization", needs_db=False, run=bench_serialization),
+    Case("map_matching", needs_db=False, run=bench_map_matching),
+    Case("ingest", needs_db=True, run=bench_ingest),
+    Case("history", needs_db=True, run=bench_history),
+    Case("predictions", needs_db=True, run=bench_prediction_reads),
+)
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Bus, Prediction, Route, TelemetryRecord
+from app.schemas.telemetry import TelemetryPoint
+from app.services.partitions import TelemetryPartitionManager
+from app.services.telemetry import TelemetryIngestService
+
+ROUTE_CODE = "BENCH"
+FLEET_PREFIX = "BENCH-"
+
+
+@dataclass
+class BenchFleet:
+    """A throwaway route with buses, history and predictions owned by the benchmarks."""
+
+    route_id: int
+    bus_ids: list[int]
+    history_start: datetime
+    history_end: datetime
+    rng: random.Random = field(default_factory=lambda: random.Random(1))
+
+    def points(self, count: int, start: datetime, step: timedelta) -> list[TelemetryPoint]:
+        """Deterministic fixes spread round-robin across the fleet."""
+
+        points = []
+        for index in range(count):
+            points.append(
+                TelemetryPoint(
+                    bus_id=self.bus_ids[index % len(self.bus_ids)],
+                    recorded_at=start + step * (index // len(self.bus_ids)),
+                    latitude=40.70 + self.rng.uniform(-0.05, 0.05),
+                    longitude=-74.00 + self.rng.uniform(-0.05, 0.05),
+                    speed_kph=self.rng.uniform(0, 60),
+                    heading=self.rng.randrange(360),
+                    passenger_load=self.rng.randrange(60),
+                )
+            )
+        return points
+
+
+async def drop_fleet(session: AsyncSession) -> None:
+    route_ids = select(Route.id).where(Route.code == ROUTE_CODE)
+    bus_ids = select(Bus.id).where(Bus.fleet_number.startswith(FLEET_PREFIX))
+    await session.execute(delete(Prediction).where(Prediction.route_id.in_(route_ids)))
+    await session.execute(delete(TelemetryRecord).where(TelemetryRecord.bus_id.in_(bus_ids)))
+    await session.execute(delete(Bus).where(Bus.fleet_number.startswith(FLEET_PREFIX)))
+    await session.execute(delete(Route).where(Route.code == ROUTE_CODE))
+    await session.commit()
+
+
+async def create_fleet(
+    session: AsyncSession, *, buses: int, history_per_bus: int, predictions: int
+) -> BenchFleet:
+    """Replace any previous benchmark fleet and load its history and predictions."""
+
+    await drop_fleet(session)
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    await TelemetryPartitionManager().ensure_partitions(session, now)
+
+    route = Route(code=ROUTE_CODE, name="Benchmark Loop", origin="Bench A", destination="Bench B")
+    session.add(route)
+    await session.flush()
+    fleet_buses = [
+        Bus(fleet_number=f"{FLEET_PREFIX}{index:04d}", route_id=route.id)
+        for index in range(buses)
+    ]
+    session.add_all(fleet_buses)
+    await session.flush()
+
+    history_start = now - timedelta(seconds=history_per_bus * 5 + 3600)
+    fleet = BenchFleet(
+        route_id=route.id,
+        bus_ids=[bus.id for bus in fleet_buses],
+        history_start=history_start,
+        history_end=history_start + timedelta(seconds=history_per_bus * 5),
+    )
+    session.add_all(
+        Prediction(
+            route_id=route.id,
+            target_arrival=now + timedelta(minutes=index + 1),
+            estimated_headway_minutes=10,
+            travel_time_minutes=30,
+            confidence=0.8,
+        )
+        for index in range(predictions)
+    )
+    await session.commit()
+
+    ingest = TelemetryIngestService()
+    points = fleet.points(history_per_bus * buses, history_start, timedelta(seconds=5))
+    rows = [point.model_dump() for point in points]
+    await ingest.insert_rows(session, rows)
+    await session.commit()
+    return fleet
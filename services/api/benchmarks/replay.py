@@ -0,0 +1,306 @@
+"""Replay recorded telemetry against the ingest API at a multiple of real time.
+
+Fixes come from the database (``--start``/``--end``) or from a ``/telemetry/export`` file
+(``--file``, NDJSON or CSV). Every bus gets its own coroutine that posts its fixes in
+order to ``POST /telemetry``, sleeping so the gaps between fixes are the recorded gaps
+divided by ``--speed``. That endpoint answers ``202`` once a fix is in the write-behind
+buffer, so it measures how fast the buffer admits fixes, not the database. With
+``--batch-size N`` every bus instead posts its fixes in groups of up to ``N`` to
+``POST /telemetry/batch``, which writes before it answers, so request latency and
+schedule lag include the connection pool and the insert. Run it against a deployed worker
+and raise ``--speed`` until the achieved rate stops following the target rate or errors
+appear: that is the saturation point of that worker and pool configuration.
+
+Example (one hour of route 7, replayed in six minutes):
+
+    python -m benchmarks.replay --url http://localhost:8000 --route-id 7 \\
+        --start 2024-12-02T07:00:00Z --end 2024-12-02T08:00:00Z --speed 10 --batch-size 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import csv
+import logging
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Iterable
+
+import httpx
+import orjson
+
+from app.db.session import get_engine, get_sessionmaker
+from app.services.export import EXPORT_COLUMNS, export_statement
+
+from .stats import percentile
+
+Fix = dict[str, Any]
+
+
+def read_export_file(path: Path) -> list[Fix]:
+    """Read fixes written by ``GET /telemetry/export`` in either format."""
+
+    if path.suffix == ".csv":
+        with path.open(newline="") as handle:
+            rows = list(csv.DictReader(handle))
+        fixes = []
+        for row in rows:
+            fix: Fix = {name: row[name] or None for name in EXPORT_COLUMNS}
+            fix["bus_id"] = int(fix["bus_id"])
+            for name in ("latitude", "longitude", "speed_kph"):
+                fix[name] = None if fix[name] is None else float(fix[name])
+            for name in ("heading", "passenger_load"):
+                fix[name] = None if fix[name] is None else int(fix[name])
+            fixes.append(fix)
+    else:
+        with path.open("rb") as handle:
+            fixes = [orjson.loads(line) for line in handle if line.strip()]
+    for fix in fixes:
+        fix["recorded_at"] = datetime.fromisoformat(fix["recorded_at"])
+    return fixes
+
+
+async def read_database(
+    start: datetime, end: datetime, bus_id: int | None = None, route_id: int | None = None
+) -> list[Fix]:
+    """Read fixes in ``[start, end)`` from ``telemetry_records``."""
+
+    async with get_sessionmaker()() as session:
+        result = await session.execute(
+            export_statement(start, end, bus_id=bus_id, route_id=route_id)
+        )
+        fixes = [dict(row) for row in result.mappings()]
+    await get_engine().dispose()
+    return fixes
+
+
+@dataclass
+class ReplayPlan:
+    """Per-bus fix sequences with each fix's send offset from the start of the replay."""
+
+    buses: dict[int, list[tuple[float, Fix]]]
+    span_seconds: float
+    speed: float
+
+    def __len__(self) -> int:
+        return sum(len(fixes) for fixes in self.buses.values())
+
+    @property
+    def target_rate(self) -> float:
+        """Fixes per second the API has to absorb to keep up."""
+
+        return len(self) / self.span_seconds if self.span_seconds > 0 else float(len(self))
+
+
+def plan_replay(
+    fixes: Iterable[Fix], speed: float, *, restamp_from: datetime | None = None
+) -> ReplayPlan:
+    """Group fixes by bus in recorded order and scale their gaps by ``1 / speed``.
+
+    With ``restamp_from`` each fix is re-dated to when it will be sent relative to that
+    instant, so replayed rows never collide with the originals and look current to the
+    live views.
+    """
+
+    ordered = sorted(fixes, key=lambda fix: (fix["bus_id"], fix["recorded_at"]))
+    if not ordered:
+        return ReplayPlan({}, 0.0, speed)
+    origin = min(fix["recorded_at"] for fix in ordered)
+    buses: dict[int, list[tuple[float, Fix]]] = {}
+    span = 0.0
+    for fix in ordered:
+        offset = (fix["recorded_at"] - origin).total_seconds() / speed
+        if restamp_from is not None:
+            fix = {**fix, "recorded_at": restamp_from + timedelta(seconds=offset)}
+        buses.setdefault(fix["bus_id"], []).append((offset, fix))
+        span = max(span, offset)
+    return ReplayPlan(buses, span, speed)
+
+
+@dataclass
+class ReplayReport:
+    sent: int = 0
+    accepted: int = 0
+    statuses: Counter[str] = field(default_factory=Counter)
+    latencies: list[float] = field(default_factory=list)
+    schedule_lag: list[float] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+    target_rate: float = 0.0
+
+    @property
+    def rate(self) -> float:
+        return self.accepted / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+    @property
+    def error_rate(self) -> float:
+        return (self.sent - self.accepted) / self.sent if self.sent else 0.0
+
+    def format(self) -> str:
+        breakdown = ", ".join(
+            f"{status}: {count}" for status, count in sorted(self.statuses.items())
+        )
+        lines = [
+            f"sent {self.sent} fixes in {self.elapsed_seconds:.1f}s, accepted {self.accepted}",
+            f"rate {self.rate:,.1f}/s achieved vs {self.target_rate:,.1f}/s target",
+            f"errors {self.error_rate:.2%}" + (f" ({breakdown})" if breakdown else ""),
+            f"{'latency ms':<14}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}",
+        ]
+        for label, samples in (
+            ("request", self.latencies),
+            ("schedule lag", self.schedule_lag),
+        ):
+            ordered = sorted(samples)
+            values = [percentile(ordered, q) for q in (50, 95, 99)] + [max(ordered, default=0.0)]
+            lines.append(f"{label:<14}" + "".join(f"{value * 1000:>10.2f}" for value in values))
+        return "\n".join(lines)
+
+
+async def replay(
+    client: httpx.AsyncClient,
+    plan: ReplayPlan,
+    *,
+    batch_size: int | None = None,
+    path: str | None = None,
+    duration: float | None = None,
+) -> ReplayReport:
+    """Post every planned fix on schedule, one coroutine per bus.
+
+    Without ``batch_size`` each fix is posted on its own to ``/telemetry``. With it, each
+    bus posts groups of up to ``batch_size`` consecutive fixes to ``/telemetry/batch``,
+    sending a group when its last fix is due. ``path`` overrides the endpoint.
+
+    Request latency is measured from send to response. Schedule lag runs from the time a
+    request was due, so it also counts the time a bus coroutine spent waiting on its
+    previous request: once the endpoint saturates, that wait grows without bound. It
+    ends at the response, so for ``/telemetry`` it does not include the buffered write.
+    """
+
+    if path is None:
+        path = "/telemetry/batch" if batch_size else "/telemetry"
+    size = batch_size or 1
+    report = ReplayReport(target_rate=plan.target_rate)
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+
+    async def vehicle(fixes: list[tuple[float, Fix]]) -> None:
+        for first in range(0, len(fixes), size):
+            group = fixes[first : first + size]
+            offset = group[-1][0]
+            if duration is not None and offset > duration:
+                return
+            delay = started + offset - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if batch_size:
+                body = orjson.dumps({"records": [fix for _, fix in group]})
+            else:
+                body = orjson.dumps(group[0][1])
+            sent_at = time.perf_counter()
+            report.sent += len(group)
+            try:
+                response = await client.post(
+                    path, content=body, headers={"content-type": "application/json"}
+                )
+            except httpx.HTTPError as exc:
+                report.statuses[type(exc).__name__] += len(group)
+                continue
+            finished = time.perf_counter()
+            report.latencies.append(finished - sent_at)
+            report.schedule_lag.append(loop.time() - (started + offset))
+            if not response.is_success:
+                report.statuses[str(response.status_code)] += len(group)
+            elif batch_size:
+                rejected = orjson.loads(response.content).get("rejected", 0)
+                report.accepted += len(group) - rejected
+                if rejected:
+                    report.statuses["rejected"] += rejected
+            else:
+                report.accepted += 1
+
+    await asyncio.gather(*(vehicle(fixes) for fixes in plan.buses.values()))
+    report.elapsed_seconds = loop.time() - started
+    return report
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.replay",
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--url", default="http://localhost:8000", help="Base URL of the API")
+    parser.add_argument("--file", type=Path, help="NDJSON or CSV export to replay")
+    parser.add_argument("--start", type=datetime.fromisoformat, help="Database range start")
+    parser.add_argument("--end", type=datetime.fromisoformat, help="Database range end")
+    parser.add_argument("--bus-id", type=int, help="Only replay this bus")
+    parser.add_argument("--route-id", type=int, help="Only replay buses on this route")
+    parser.add_argument("--speed", type=float, default=1.0, help="Time multiplier (10 = 10x)")
+    parser.add_argument("--duration", type=float, help="Stop after this many wall-clock seconds")
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        help="Post up to this many fixes per bus to /telemetry/batch instead of /telemetry",
+    )
+    parser.add_argument(
+        "--connections", type=int, default=100, help="Maximum concurrent HTTP connections"
+    )
+    parser.add_argument("--timeout", type=float, default=10.0, help="Per-request timeout")
+    parser.add_argument(
+        "--keep-timestamps",
+        action="store_true",
+        help="Send the recorded timestamps instead of re-dating fixes to the replay clock",
+    )
+    args = parser.parse_args(argv)
+    if args.file is None and (args.start is None or args.end is None):
+        parser.error("pass --file, or --start and --end to read from the database")
+    if args.file is not None and args.route_id is not None:
+        parser.error("--route-id needs the database; filter the export by route instead")
+    if args.speed <= 0:
+        parser.error("--speed must be positive")
+    if args.batch_size is not None and args.batch_size <= 0:
+        parser.error("--batch-size must be positive")
+    return args
+
+
+async def run(args: argparse.Namespace) -> ReplayReport:
+    if args.file is not None:
+        fixes = [
+            fix
+            for fix in read_export_file(args.file)
+            if (args.bus_id is None or fix["bus_id"] == args.bus_id)
+        ]
+    else:
+        fixes = await read_database(
+            args.start, args.end, bus_id=args.bus_id, route_id=args.route_id
+        )
+    restamp_from = None if args.keep_timestamps else datetime.now(timezone.utc)
+    plan = plan_replay(fixes, args.speed, restamp_from=restamp_from)
+    print(
+        f"replaying {len(plan)} fixes from {len(plan.buses)} buses over "
+        f"{plan.span_seconds:.1f}s at {args.speed:g}x",
+        file=sys.stderr,
+    )
+    limits = httpx.Limits(
+        max_connections=args.connections, max_keepalive_connections=args.connections
+    )
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=args.timeout) as client:
+        return await replay(client, plan, batch_size=args.batch_size, duration=args.duration)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Replay telemetry and print the achieved rate, error rate and latency percentiles."""
+
+    args = parse_args(argv)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    report = asyncio.run(run(args))
+    print(report.format())
+    return 0 if report.sent else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
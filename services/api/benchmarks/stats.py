@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import json
+import math
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Awaitable, Callable, Iterable, Sequence
+
+
+def percentile(sorted_samples: Sequence[float], q: float) -> float:
+    """Linear-interpolated percentile (``q`` in 0..100) of already sorted samples."""
+
+    if not sorted_samples:
+        return 0.0
+    rank = (len(sorted_samples) - 1) * q / 100
+    low = math.floor(rank)
+    high = math.ceil(rank)
+    if low == high:
+        return sorted_samples[low]
+    return sorted_samples[low] + (sorted_samples[high] - sorted_samples[low]) * (rank - low)
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    iterations: int
+    items: int
+    total_seconds: float
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+    @property
+    def throughput(self) -> float:
+        """Items processed per second of measured time."""
+
+        return self.items / self.total_seconds if self.total_seconds > 0 else 0.0
+
+    def to_dict(self) -> dict[str, float | int | str]:
+        return {**asdict(self), "throughput": round(self.throughput, 3)}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> BenchmarkResult:
+        data = {key: value for key, value in data.items() if key != "throughput"}
+        return cls(**data)
+
+
+def summarize(name: str, latencies: Iterable[float], items: int) -> BenchmarkResult:
+    """Build a result from per-call latencies in seconds."""
+
+    samples = sorted(latencies)
+    total = sum(samples)
+    return BenchmarkResult(
+        name=name,
+        iterations=len(samples),
+        items=items,
+        total_seconds=round(total, 6),
+        mean_ms=round(total / len(samples) * 1000, 4) if samples else 0.0,
+        p50_ms=round(percentile(samples, 50) * 1000, 4),
+        p95_ms=round(percentile(samples, 95) * 1000, 4),
+        p99_ms=round(percentile(samples, 99) * 1000, 4),
+    )
+
+
+async def measure(
+    name: str,
+    call: Callable[[], Awaitable[object]],
+    *,
+    iterations: int,
+    warmup: int = 5,
+    items_per_call: int = 1,
+) -> BenchmarkResult:
+    """Time ``iterations`` sequential awaits of ``call`` after ``warmup`` untimed ones."""
+
+    for _ in range(warmup):
+        await call()
+    latencies = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        await call()
+        latencies.append(time.perf_counter() - started)
+    return summarize(name, latencies, iterations * items_per_call)
+
+
+@dataclass
+class Regression:
+    name: str
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        return (self.current - self.baseline) / self.baseline if self.baseline else 0.0
+
+
+def compare(
+    current: Iterable[BenchmarkResult],
+    baseline: Iterable[BenchmarkResult],
+    tolerance: float,
+) -> list[Regression]:
+    """Return benchmarks whose p95 rose or throughput fell by more than ``tolerance``."""
+
+    previous = {result.name: result for result in baseline}
+    regressions = []
+    for result in current:
+        before = previous.get(result.name)
+        if before is None:
+            continue
+        if before.p95_ms and result.p95_ms > before.p95_ms * (1 + tolerance):
+            regressions.append(Regression(result.name, "p95_ms", before.p95_ms, result.p95_ms))
+        if before.throughput and result.throughput < before.throughput * (1 - tolerance):
+            regressions.append(
+                Regression(result.name, "throughput", before.throughput, result.throughput)
+            )
+    return regressions
+
+
+def save_results(path: Path, results: Iterable[BenchmarkResult]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {"results": [result.to_dict() for result in results]}
+    path.write_text(json.dumps(payload, indent=2) + "\n")
+
+
+def load_results(path: Path) -> list[BenchmarkResult]:
+    payload = json.loads(path.read_text())
+    return [BenchmarkResult.from_dict(item) for item in payload["results"]]
+
+
+def format_table(results: Iterable[BenchmarkResult]) -> str:
+    header = (
+        f"{'benchmark':<28}{'iters':>8}{'items/s':>14}"
+        f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    )
+    lines = [header, "-" * len(header)]
+    for result in results:
+        lines.append(
+            f"{result.name:<28}{result.iterations:>8}{result.throughput:>14,.1f}"
+            f"{result.p50_ms:>10.3f}{result.p95_ms:>10.3f}{result.p99_ms:>10.3f}"
+        )
+    return "\n".join(lines)
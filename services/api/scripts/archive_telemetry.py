@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+
+from app.core.config import get_settings
+from app.db.session import get_sessionmaker
+from app.services.archive import TelemetryArchiver, get_telemetry_archive
+
+
+async def archive(after_days: int | None) -> None:
+    """Move telemetry older than the cutoff into the cold-tier archive."""
+
+    settings = get_settings()
+    after_days = after_days or settings.telemetry_archive_after_days
+    if after_days is None:
+        raise SystemExit("Set API_TELEMETRY_ARCHIVE_AFTER_DAYS or pass --after-days")
+    archive_reader = get_telemetry_archive()
+
+    session_factory = get_sessionmaker()
+    async with session_factory() as session:
+        summary = await TelemetryArchiver(archive_reader).run(session, after_days)
+
+    horizon = archive_reader.horizon()
+    print(
+        f"archived {summary.rows_archived} rows ({summary.rows_deleted} deleted) from "
+        f"{summary.days} days into {archive_reader.root}"
+    )
+    print(f"archived through: {horizon:%Y-%m-%d}" if horizon else "archived through: -")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=archive.__doc__)
+    parser.add_argument("--after-days", type=int, help="Override API_TELEMETRY_ARCHIVE_AFTER_DAYS")
+    asyncio.run(archive(parser.parse_args().after_days))
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+from datetime import datetime, timezone
+from pathlib import Path
+
+from app.core.config import get_settings
+from app.db.session import get_sessionmaker
+from app.services.travel_profiles import TravelProfileBuilder, TravelProfiles
+
+
+async def build(rebuild: bool) -> None:
+    """Fold telemetry since the last build into the travel profile file."""
+
+    settings = get_settings()
+    path = Path(settings.travel_profile_path)
+    if path.exists() and not rebuild:
+        profiles = TravelProfiles.load(path, with_counts=True)
+    else:
+        profiles = TravelProfiles.empty(
+            settings.travel_profile_bucket_minutes, settings.travel_profile_timezone
+        )
+    # Stop at the top of the hour so late fixes for the current hour are not cut off.
+    until = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+    session_factory = get_sessionmaker()
+    async with session_factory() as session:
+        added = await TravelProfileBuilder().refresh(
+            session, profiles, until, settings.travel_profile_history_days
+        )
+    profiles.save(path)
+
+    print(
+        f"folded {added} pace samples through {until:%Y-%m-%d %H:%M}; "
+        f"{len(profiles)} routes in {path} ({path.stat().st_size / 1024:.0f} KiB)"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=build.__doc__)
+    parser.add_argument(
+        "--rebuild", action="store_true", help="Discard the existing file and start over"
+    )
+    asyncio.run(build(parser.parse_args().rebuild))
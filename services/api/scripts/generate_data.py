@@ -0,0 +1,357 @@
+"""Generate a deterministic, production-sized synthetic dataset.
+
+Routes, buses, traffic snapshots and predictions are bulk-loaded with COPY from the
+parent process; telemetry is produced per bus and day by a pool of worker processes,
+each streaming its rows into ``telemetry_records`` over its own COPY connection.
+
+Example (5,000 buses pinging every 10 s for a week, roughly 240M rows):
+
+    python scripts/generate_data.py --routes 500 --buses-per-route 10 --days 7 --workers 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+
+import asyncpg
+from sqlalchemy.engine import make_url
+
+from app.core.config import get_settings
+from app.db.session import get_engine, get_sessionmaker
+from app.services.partitions import TelemetryPartitionManager
+from app.services.synthetic import (
+    SNAPSHOT_SOURCES,
+    SyntheticRoute,
+    bus_telemetry,
+    route_predictions,
+    synthetic_route,
+    traffic_snapshots,
+)
+
+TELEMETRY_COLUMNS = (
+    "bus_id",
+    "recorded_at",
+    "latitude",
+    "longitude",
+    "speed_kph",
+    "heading",
+    "passenger_load",
+)
+TRUNCATE_TABLES = (
+    "predictions",
+    "telemetry_rollups",
+    "rollup_watermarks",
+    "telemetry_records",
+    "buses",
+    "traffic_snapshots",
+    "routes",
+)
+
+
+def _today() -> datetime:
+    return datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+@dataclass(frozen=True)
+class GeneratorConfig:
+    routes: int = 100
+    buses_per_route: int = 10
+    start: datetime = field(default_factory=lambda: _today() - timedelta(days=1))
+    days: int = 1
+    ping_seconds: int = 10
+    snapshot_minutes: int = 5
+    prediction_minutes: int = 15
+    maintenance_share: float = 0.03
+    seed: int = 42
+    workers: int = 4
+
+    @property
+    def end(self) -> datetime:
+        return self.start + timedelta(days=self.days)
+
+
+@dataclass(frozen=True)
+class TelemetryJob:
+    dsn: str
+    config: GeneratorConfig
+    day: int
+    # (bus_index, bus_id, route_index, capacity)
+    buses: tuple[tuple[int, int, int, int], ...]
+
+
+def asyncpg_dsn(database_url: str) -> str:
+    return make_url(database_url).set(drivername="postgresql").render_as_string(
+        hide_password=False
+    )
+
+
+def _epoch_datetimes(epochs: list[int]) -> list[datetime]:
+    utc = timezone.utc
+    return [datetime.fromtimestamp(epoch, tz=utc) for epoch in epochs]
+
+
+async def _copy_telemetry(job: TelemetryJob) -> int:
+    config = job.config
+    window_start = config.start + timedelta(days=job.day)
+    window_end = window_start + timedelta(days=1)
+    routes: dict[int, SyntheticRoute] = {}
+    connection = await asyncpg.connect(job.dsn)
+    written = 0
+    try:
+        await connection.execute("SET synchronous_commit = off")
+        for bus_index, bus_id, route_index, capacity in job.buses:
+            route = routes.get(route_index)
+            if route is None:
+                route = routes[route_index] = synthetic_route(config.seed, route_index)
+            columns = bus_telemetry(
+                config.seed,
+                bus_index,
+                route,
+                window_start,
+                window_end,
+                config.ping_seconds,
+                capacity,
+            )
+            if not len(columns):
+                continue
+            records = zip(
+                [bus_id] * len(columns),
+                _epoch_datetimes(columns.epoch_seconds.tolist()),
+                columns.latitude.tolist(),
+                columns.longitude.tolist(),
+                columns.speed_kph.tolist(),
+                columns.heading.tolist(),
+                columns.passenger_load.tolist(),
+            )
+            await connection.copy_records_to_table(
+                "telemetry_records", records=records, columns=TELEMETRY_COLUMNS
+            )
+            written += len(columns)
+    finally:
+        await connection.close()
+    return written
+
+
+def _run_telemetry_job(job: TelemetryJob) -> int:
+    return asyncio.run(_copy_telemetry(job))
+
+
+async def _next_id(connection: asyncpg.Connection, table: str) -> int:
+    return int(await connection.fetchval(f"SELECT COALESCE(MAX(id), 0) + 1 FROM {table}"))
+
+
+async def _sync_sequence(connection: asyncpg.Connection, table: str) -> None:
+    await connection.execute(
+        f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+        f"(SELECT COALESCE(MAX(id), 1) FROM {table}))"
+    )
+
+
+async def load_reference_data(
+    connection: asyncpg.Connection, config: GeneratorConfig
+) -> list[tuple[int, int, int, int]]:
+    """COPY routes, buses, traffic snapshots and predictions; return the bus assignments."""
+
+    route_base = await _next_id(connection, "routes")
+    bus_base = await _next_id(connection, "buses")
+    routes = [synthetic_route(config.seed, index) for index in range(config.routes)]
+    await connection.copy_records_to_table(
+        "routes",
+        records=[
+            (
+                route_base + route.index,
+                f"SYN{route_base + route.index}",
+                f"Synthetic Route {route_base + route.index}",
+                f"Stop {route.index}-A",
+                f"Stop {route.index}-Z",
+            )
+            for route in routes
+        ],
+        columns=("id", "code", "name", "origin", "destination"),
+    )
+
+    buses = []
+    bus_records = []
+    for bus_index in range(config.routes * config.buses_per_route):
+        bus_id = bus_base + bus_index
+        route_index = bus_index // config.buses_per_route
+        capacity = 60 if bus_index % 4 == 0 else 40
+        maintenance = (bus_index * 7919 % 1000) / 1000 < config.maintenance_share
+        bus_records.append(
+            (
+                bus_id,
+                f"SYN-{bus_id:07d}",
+                route_base + route_index,
+                capacity,
+                "maintenance" if maintenance else "in_service",
+            )
+        )
+        buses.append((bus_index, bus_id, route_index, capacity))
+    await connection.copy_records_to_table(
+        "buses",
+        records=bus_records,
+        columns=("id", "fleet_number", "route_id", "capacity", "status"),
+    )
+
+    snapshot_records = []
+    for source_index in range(len(SNAPSHOT_SOURCES)):
+        for row in traffic_snapshots(
+            config.seed, source_index, config.start, config.end, config.snapshot_minutes
+        ):
+            snapshot_records.append(
+                (
+                    row["source"],
+                    row["captured_at"],
+                    row["congestion_index"],
+                    row["incident_count"],
+                    row["average_speed_kph"],
+                    json.dumps(row["payload"]),
+                )
+            )
+    await connection.copy_records_to_table(
+        "traffic_snapshots",
+        records=snapshot_records,
+        columns=(
+            "source",
+            "captured_at",
+            "congestion_index",
+            "incident_count",
+            "average_speed_kph",
+            "payload",
+        ),
+    )
+
+    prediction_records = []
+    for route in routes:
+        for row in route_predictions(
+            config.seed, route, config.start, config.end, config.prediction_minutes
+        ):
+            prediction_records.append(
+                (
+                    route_base + route.index,
+                    row["target_arrival"],
+                    row["estimated_headway_minutes"],
+                    row["travel_time_minutes"],
+                    row["confidence"],
+                )
+            )
+    await connection.copy_records_to_table(
+        "predictions",
+        records=prediction_records,
+        columns=(
+            "route_id",
+            "target_arrival",
+            "estimated_headway_minutes",
+            "travel_time_minutes",
+            "confidence",
+        ),
+    )
+
+    for table in ("routes", "buses"):
+        await _sync_sequence(connection, table)
+    print(
+        f"routes: {len(routes)}  buses: {len(buses)}  "
+        f"traffic snapshots: {len(snapshot_records)}  predictions: {len(prediction_records)}"
+    )
+    return buses
+
+
+async def generate(config: GeneratorConfig, *, truncate: bool = False) -> int:
+    """Load the synthetic dataset described by ``config`` and return telemetry rows written."""
+
+    started = time.perf_counter()
+    dsn = asyncpg_dsn(get_settings().database_url)
+
+    # Telemetry COPY bypasses the ingest path, so make sure every day has a partition.
+    async with get_sessionmaker()() as session:
+        created = await TelemetryPartitionManager().create_partitions(
+            session, config.start, config.end - timedelta(microseconds=1)
+        )
+    await get_engine().dispose()
+    if created:
+        print(f"created partitions: {', '.join(created)}")
+
+    connection = await asyncpg.connect(dsn)
+    try:
+        async with connection.transaction():
+            if truncate:
+                await connection.execute(
+                    f"TRUNCATE {', '.join(TRUNCATE_TABLES)} RESTART IDENTITY CASCADE"
+                )
+            buses = await load_reference_data(connection, config)
+    finally:
+        await connection.close()
+
+    # Several jobs per worker and day keep every process busy until the end.
+    per_job = max(len(buses) // (config.workers * 4), 1)
+    jobs = [
+        TelemetryJob(dsn, config, day, tuple(buses[offset : offset + per_job]))
+        for day in range(config.days)
+        for offset in range(0, len(buses), per_job)
+    ]
+    written = 0
+    loop = asyncio.get_running_loop()
+    # Spawned workers start clean instead of inheriting this process's connections.
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=config.workers, mp_context=context) as pool:
+        futures = [loop.run_in_executor(pool, _run_telemetry_job, job) for job in jobs]
+        for completed, future in enumerate(asyncio.as_completed(futures), start=1):
+            written += await future
+            elapsed = time.perf_counter() - started
+            print(
+                f"\rtelemetry jobs {completed}/{len(jobs)}  rows {written:,}  "
+                f"({written / elapsed:,.0f} rows/s)",
+                end="",
+                flush=True,
+            )
+    print()
+    print(f"done in {time.perf_counter() - started:,.1f}s")
+    return written
+
+
+def parse_args(argv: list[str] | None = None) -> tuple[GeneratorConfig, bool]:
+    defaults = GeneratorConfig()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--routes", type=int, default=defaults.routes)
+    parser.add_argument("--buses-per-route", type=int, default=defaults.buses_per_route)
+    parser.add_argument(
+        "--start",
+        type=datetime.fromisoformat,
+        default=defaults.start,
+        help="First day to generate (UTC); defaults to yesterday",
+    )
+    parser.add_argument("--days", type=int, default=defaults.days)
+    parser.add_argument("--ping-seconds", type=int, default=defaults.ping_seconds)
+    parser.add_argument("--snapshot-minutes", type=int, default=defaults.snapshot_minutes)
+    parser.add_argument("--prediction-minutes", type=int, default=defaults.prediction_minutes)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--workers", type=int, default=defaults.workers)
+    parser.add_argument(
+        "--truncate", action="store_true", help="Empty the fleet and telemetry tables first"
+    )
+    args = parser.parse_args(argv)
+    start = args.start if args.start.tzinfo else args.start.replace(tzinfo=timezone.utc)
+    config = GeneratorConfig(
+        routes=args.routes,
+        buses_per_route=args.buses_per_route,
+        start=start,
+        days=args.days,
+        ping_seconds=args.ping_seconds,
+        snapshot_minutes=args.snapshot_minutes,
+        prediction_minutes=args.prediction_minutes,
+        seed=args.seed,
+        workers=args.workers,
+    )
+    return config, args.truncate
+
+
+if __name__ == "__main__":
+    generator_config, truncate_first = parse_args()
+    asyncio.run(generate(generator_config, truncate=truncate_first))
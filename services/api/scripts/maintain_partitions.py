@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+import asyncio
+
+from app.db.session import get_sessionmaker
+from app.services.partitions import TelemetryPartitionManager
+
+
+async def maintain() -> None:
+    """Pre-create upcoming telemetry partitions and retire expired ones."""
+
+    session_factory = get_sessionmaker()
+    async with session_factory() as session:
+        result = await TelemetryPartitionManager().run_maintenance(session)
+
+    print(f"created: {', '.join(result['created']) or '-'}")
+    print(f"removed: {', '.join(result['removed']) or '-'}")
+
+
+if __name__ == "__main__":
+    asyncio.run(maintain())
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import asyncio
+
+from app.db.session import get_sessionmaker
+from app.services.predictions import PredictionEngine
+
+
+async def recompute() -> None:
+    """Recompute headway and travel-time predictions for every active route."""
+
+    session_factory = get_sessionmaker()
+    async with session_factory() as session:
+        summary = await PredictionEngine().run(session)
+
+    print(
+        f"wrote {summary.predictions_written} predictions for {summary.routes} routes "
+        f"from {summary.fixes_used} fixes in {summary.elapsed_ms:.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(recompute())
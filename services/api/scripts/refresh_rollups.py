@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import asyncio
+
+from app.db.session import get_sessionmaker
+from app.services.rollups import TelemetryRollupService
+
+
+async def refresh() -> None:
+    """Fold telemetry received since the last run into the rollup tables."""
+
+    session_factory = get_sessionmaker()
+    async with session_factory() as session:
+        summary = await TelemetryRollupService().refresh(session)
+
+    print(
+        f"refreshed {summary.window_start:%Y-%m-%d %H:%M} to {summary.window_end:%Y-%m-%d %H:%M}: "
+        f"{summary.rows_written} rollup rows in {summary.elapsed_ms:.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(refresh())
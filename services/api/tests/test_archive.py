@@ -0,0 +1,180 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+from sqlalchemy import MetaData, func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.models import Bus, Route, TelemetryArchiveState, TelemetryRecord
+from app.services.archive import (
+    ArchiveLocationError,
+    ArchivePartition,
+    ArchiveVerificationError,
+    TelemetryArchive,
+    TelemetryArchiver,
+    columns_from_rows,
+    rows_from_columns,
+    write_partition,
+)
+from app.services.export import EXPORT_COLUMNS, TelemetryExportService
+from app.services.history import HistoryService
+
+DAY = datetime(2024, 12, 1, tzinfo=timezone.utc)
+
+
+def _row(record_id: int, bus_id: int, minutes: int, speed=30.5, heading=90, load=None):
+    recorded_at = DAY + timedelta(minutes=minutes)
+    return (record_id, bus_id, recorded_at, 40.7 + minutes / 1e4, -74.0, speed, heading, load)
+
+
+def test_partition_round_trips_rows_through_memory_mapped_views(tmp_path) -> None:
+    rows = [_row(1, 3, 0), _row(2, 3, 5, speed=None), _row(3, 7, 1, heading=None, load=12)]
+    write_partition(tmp_path / "route-1", 1, DAY, columns_from_rows(rows))
+
+    partition = ArchivePartition(tmp_path / "route-1")
+    partition.verify()
+    window = partition.bus_slice(3, DAY + timedelta(minutes=1))
+
+    assert partition.bus_ids() == [3, 7]
+    assert isinstance(window["recorded_at"].base, np.memmap)
+    assert rows_from_columns(partition.bus_slice(3), ["id", "speed_kph"]) == [(1, 30.5), (2, None)]
+    assert rows_from_columns(window, ["id", "recorded_at"]) == [(2, rows[1][2])]
+    assert rows_from_columns(partition.bus_slice(7), ["heading", "passenger_load"]) == [(None, 12)]
+
+    with (tmp_path / "route-1" / "latitude.npy").open("r+b") as handle:
+        handle.seek(-1, 2)
+        handle.write(b"\x01")
+    with pytest.raises(ArchiveVerificationError):
+        ArchivePartition(tmp_path / "route-1").verify()
+
+
+def test_archived_days_leave_the_table_and_merge_back_into_reads(tmp_path) -> None:
+    async def scenario():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        metadata = MetaData()
+        for model in (Route, Bus, TelemetryRecord, TelemetryArchiveState):
+            model.__table__.to_metadata(metadata)
+        # SQLite cannot autoincrement half of the composite (id, recorded_at) key.
+        metadata.tables["telemetry_records"].c.id.autoincrement = False
+        async with engine.begin() as connection:
+            await connection.run_sync(metadata.create_all)
+        sessions = async_sessionmaker(engine, expire_on_commit=False)
+        async with sessions() as session:
+            session.add_all(
+                Route(id=route_id, code=f"R{route_id}", name="R", origin="A", destination="B")
+                for route_id in (1, 2)
+            )
+            session.add_all(
+                Bus(id=bus_id, fleet_number=f"F{bus_id}", route_id=route_id)
+                for bus_id, route_id in ((3, 1), (4, 2))
+            )
+            # Bus 3 reports every 8 hours for three days; bus 4 once a day.
+            records = [_row(record_id, 3, record_id * 480) for record_id in range(9)]
+            records += [_row(100 + day, 4, day * 1440 + 30) for day in range(3)]
+            session.add_all(
+                TelemetryRecord(**dict(zip(["id", *EXPORT_COLUMNS], record))) for record in records
+            )
+            await session.commit()
+
+        archive = TelemetryArchive(tmp_path / "shared")
+        now = DAY + timedelta(days=3, hours=12)
+        async with sessions() as session:
+            summary = await TelemetryArchiver(archive).run(session, after_days=1, now=now)
+            rerun = await TelemetryArchiver(archive).run(session, after_days=1, now=now)
+            remaining = await session.scalar(select(func.count()).select_from(TelemetryRecord))
+            state = await archive.check(session)
+            # A replica with its own empty directory must not serve or archive.
+            local = TelemetryArchive(tmp_path / "local")
+            with pytest.raises(ArchiveLocationError):
+                await local.check(session)
+            with pytest.raises(ArchiveLocationError):
+                await TelemetryArchiver(local).run(session, after_days=0, now=now)
+
+            history = HistoryService(archive)
+            pages, cursor = [], None
+            while True:
+                page, cursor = await history.list_bus_telemetry(session, 3, 2, cursor=cursor)
+                pages.append([row["id"] for row in page])
+                if cursor is None:
+                    break
+            ascending, _ = await history.list_bus_telemetry(session, 3, 4, order="asc")
+            windowed, _ = await history.list_bus_telemetry(
+                session, 3, 10, start=DAY + timedelta(hours=9), end=DAY + timedelta(days=1)
+            )
+            # Query strings without an offset arrive naive and mean UTC.
+            naive, _ = await history.list_bus_telemetry(
+                session, 3, 10, start=DAY.replace(tzinfo=None) + timedelta(hours=9), order="asc"
+            )
+        exporter = TelemetryExportService(archive)
+        archived, stmt = exporter.plan(DAY, DAY + timedelta(days=3), route_id=2)
+        only_archived, no_stmt = exporter.plan(DAY, DAY + timedelta(days=1), bus_id=3)
+        naive_archived, naive_stmt = exporter.plan(
+            DAY.replace(tzinfo=None), (DAY + timedelta(days=3)).replace(tzinfo=None), bus_id=3
+        )
+        naive_archived = list(naive_archived)
+        archived, only_archived = list(archived), list(only_archived)
+        everything, _ = exporter.plan(DAY, DAY + timedelta(days=2))
+        everything = [row[:2] for batch in everything for row in batch]
+        # A late fix for an archived day is merged into its route; other routes are copied.
+        # Before that, recover a day whose swap was interrupted after the old files moved aside.
+        day_dir = tmp_path / "shared" / "2024-12-01"
+        day_dir.rename(day_dir.with_name(".2024-12-01.old"))
+        (day_dir.with_name(".2024-12-01.tmp") / "route-1").mkdir(parents=True)
+        async with sessions() as session:
+            session.add(TelemetryRecord(**dict(zip(["id", *EXPORT_COLUMNS], _row(50, 3, 1)))))
+            await session.commit()
+            late = await TelemetryArchiver(archive).run(session, after_days=1, now=now)
+        leftovers = sorted(path.name for path in (tmp_path / "shared").glob(".*"))
+        merged = {path.name: len(ArchivePartition(path)) for path in sorted(day_dir.iterdir())}
+        await engine.dispose()
+        return {
+            "summary": summary,
+            "rerun": rerun,
+            "remaining": remaining,
+            "state": state,
+            "horizon": archive.horizon(),
+            "pages": pages,
+            "ascending": ascending,
+            "windowed": windowed,
+            "naive": naive,
+            "naive_archived": naive_archived,
+            "naive_stmt": naive_stmt,
+            "archived": archived,
+            "stmt": stmt,
+            "only_archived": only_archived,
+            "late": late,
+            "merged": merged,
+            "everything": everything,
+            "leftovers": leftovers,
+            "no_stmt": no_stmt,
+        }
+
+    result = asyncio.run(scenario())
+    summary, archived = result["summary"], result["archived"]
+
+    assert (summary.days, summary.rows_archived, summary.rows_deleted) == (2, 8, 8)
+    assert result["rerun"].rows_deleted == 0
+    assert result["remaining"] == 4
+    assert result["horizon"] == DAY + timedelta(days=2)
+    assert result["state"].archive_id == TelemetryArchive(tmp_path / "shared").archive_id()
+    assert result["state"].archived_through.replace(tzinfo=timezone.utc) == result["horizon"]
+    assert sorted((tmp_path / "shared" / "2024-12-01").iterdir())[0].name == "route-1"
+    # Newest first: the table serves day three, the archive the days before it.
+    assert result["pages"] == [[8, 7], [6, 5], [4, 3], [2, 1], [0]]
+    assert [row["id"] for row in result["ascending"]] == [0, 1, 2, 3]
+    assert [row["id"] for row in result["windowed"]] == [2]
+    assert [[row[0] for row in batch] for batch in archived] == [[4], [4]]
+    assert archived[0][0][1] == DAY + timedelta(minutes=30)
+    assert result["stmt"] is not None
+    assert [len(batch) for batch in result["only_archived"]] == [3]
+    assert result["no_stmt"] is None
+    assert (result["late"].rows_archived, result["late"].rows_deleted) == (5, 1)
+    assert result["merged"] == {"route-1": 4, "route-2": 1}
+    assert result["leftovers"] == []
+    assert [row["id"] for row in result["naive"]] == [2, 3, 4, 5, 6, 7, 8]
+    assert sum(len(batch) for batch in result["naive_archived"]) == 6
+    assert result["naive_stmt"] is not None
+    # Archived rows follow the live export's (bus_id, recorded_at) order across days.
+    assert result["everything"] == sorted(result["everything"])
+    assert [bus_id for bus_id, _ in result["everything"]] == [3] * 6 + [4] * 2
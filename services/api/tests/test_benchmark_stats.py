@@ -0,0 +1,34 @@
+from benchmarks.stats import BenchmarkResult, compare, percentile, summarize
+
+
+def test_percentile_interpolates_between_samples() -> None:
+    samples = [1.0, 2.0, 3.0, 4.0]
+    assert percentile(samples, 0) == 1.0
+    assert percentile(samples, 50) == 2.5
+    assert percentile(samples, 100) == 4.0
+    assert percentile([], 99) == 0.0
+
+
+def test_summarize_reports_throughput_and_percentiles() -> None:
+    result = summarize("ingest", [0.001] * 99 + [0.1], items=1_000)
+    assert result.iterations == 100
+    assert result.p50_ms == 1.0
+    assert result.p99_ms > 1.0
+    assert round(result.throughput) == round(1_000 / 0.199)
+    assert BenchmarkResult.from_dict(result.to_dict()) == result
+
+
+def test_compare_flags_only_drift_beyond_tolerance() -> None:
+    baseline = [summarize("a", [0.010] * 10, items=10), summarize("b", [0.010] * 10, items=10)]
+    current = [
+        summarize("a", [0.011] * 10, items=10),
+        summarize("b", [0.020] * 10, items=10),
+        summarize("new", [1.0], items=1),
+    ]
+
+    regressions = compare(current, baseline, tolerance=0.2)
+
+    assert {(item.name, item.metric) for item in regressions} == {
+        ("b", "p95_ms"),
+        ("b", "throughput"),
+    }
@@ -0,0 +1,102 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.core.responses import dumps
+from app.main import app
+from app.models.bus import BusStatus
+from app.schemas import (
+    BusPage,
+    BusPositionsResponse,
+    BusSummary,
+    NearbyBusesResponse,
+    PredictionPage,
+    RollupSeries,
+    TelemetryPage,
+    TrafficSnapshotPage,
+    UpcomingPredictions,
+)
+
+AT = datetime(2024, 11, 25, 8, 0, 0, 125_000, tzinfo=timezone.utc)
+
+POSITION = {
+    "bus_id": 1,
+    "route_id": 10,
+    "status": BusStatus.IN_SERVICE,
+    "recorded_at": AT,
+    "latitude": 40.7128,
+    "longitude": -74.006,
+    "speed_kph": None,
+    "heading": 180,
+    "passenger_load": None,
+}
+TELEMETRY = {k: v for k, v in POSITION.items() if k not in {"route_id", "status"}} | {"id": 5}
+PREDICTION = {
+    "id": 3,
+    "route_id": 10,
+    "traffic_snapshot_id": None,
+    "target_arrival": AT.astimezone(timezone(timedelta(hours=2))),
+    "estimated_headway_minutes": 12,
+    "travel_time_minutes": 47,
+    "confidence": 0.78,
+    "notes": "Construction",
+    "created_at": AT,
+}
+SNAPSHOT = {
+    "id": 9,
+    "source": "DOT Feed",
+    "captured_at": AT,
+    "congestion_index": 68,
+    "incident_count": 1,
+    "average_speed_kph": 33.2,
+    "incident_type": "collision",
+    "segment_id": "S00042",
+    "payload": {"incident_type": "collision", "segment_id": "S00042", "lanes": [1, 2]},
+}
+LATEST_FIX = {k: v for k, v in TELEMETRY.items() if k not in {"id", "bus_id"}}
+BUS = {
+    "id": 1,
+    "fleet_number": "NYC-0001",
+    "status": BusStatus.IN_SERVICE,
+    "capacity": 60,
+    "last_service_at": None,
+    "route": {"id": 10, "code": "M15", "name": "First Avenue"},
+    "latest_fix": LATEST_FIX,
+}
+BUCKET = {"bucket_start": AT, "ping_count": 4, "avg_speed_kph": 31.5, "avg_passenger_load": None}
+
+CASES = [
+    (BusPositionsResponse, {"count": 1, "positions": [POSITION]}),
+    (NearbyBusesResponse, {"count": 1, "buses": [POSITION | {"distance_m": 12.5}]}),
+    (TelemetryPage, {"items": [TELEMETRY], "next_cursor": "abc"}),
+    (BusSummary, BUS),
+    (BusPage, {"items": [BUS, BUS | {"id": 2, "latest_fix": None}], "next_cursor": "abc"}),
+    (PredictionPage, {"items": [PREDICTION], "next_cursor": None}),
+    (UpcomingPredictions, {"route_id": 10, "items": [PREDICTION]}),
+    (TrafficSnapshotPage, {"items": [SNAPSHOT], "next_cursor": None}),
+    (
+        RollupSeries,
+        {"resolution_seconds": 300, "source_resolution_seconds": 60, "buckets": [BUCKET]},
+    ),
+]
+
+
+@pytest.mark.parametrize(("schema", "payload"), CASES, ids=[case[0].__name__ for case in CASES])
+def test_fast_path_matches_the_pydantic_encoding(schema, payload) -> None:
+    expected = json.loads(schema.model_validate(payload).model_dump_json())
+    assert json.loads(dumps(payload)) == expected
+
+
+def test_bulk_endpoints_keep_their_documented_response_models() -> None:
+    paths = app.openapi()["paths"]
+
+    def schema_ref(path: str) -> str:
+        content = paths[path]["get"]["responses"]["200"]["content"]["application/json"]
+        return content["schema"]["$ref"].rsplit("/", 1)[-1]
+
+    assert schema_ref("/buses/positions") == "BusPositionsResponse"
+    assert schema_ref("/buses/{bus_id}/telemetry") == "TelemetryPage"
+    assert schema_ref("/routes/{route_id}/predictions") == "PredictionPage"
+    assert schema_ref("/traffic/snapshots") == "TrafficSnapshotPage"
+    assert schema_ref("/rollups/telemetry") == "RollupSeries"
@@ -0,0 +1,109 @@
+import asyncio
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.db.base import Base
+from app.models import Bus, BusStatus, Route, TrafficSnapshot
+from app.services.fleet import FleetLoaders, FleetService, latest_fix_statement
+from app.services.loaders import BatchLoader
+
+
+def test_batch_loader_coalesces_concurrent_loads() -> None:
+    calls: list[list[int]] = []
+
+    async def fetch(keys: list[int]) -> dict[int, str]:
+        calls.append(keys)
+        return {key: f"bus-{key}" for key in keys if key != 3}
+
+    async def scenario():
+        loader = BatchLoader(fetch, max_batch_size=2)
+        loader.prime(9, "primed")
+        values = await asyncio.gather(*(loader.load(key) for key in (1, 2, 2, 3, 9)))
+        again = await loader.load_many([1, 2])
+        return loader, values, again
+
+    loader, values, again = asyncio.run(scenario())
+
+    assert values == ["bus-1", "bus-2", "bus-2", None, "primed"]
+    assert again == ["bus-1", "bus-2"]
+    assert calls == [[1, 2], [3]]
+    assert loader.batches == 2
+
+
+def test_latest_fix_statement_uses_one_lateral_probe_per_bus() -> None:
+    sql = str(latest_fix_statement([4, 2, 4]).compile(dialect=postgresql.dialect()))
+
+    assert "JOIN LATERAL" in sql
+    assert "ORDER BY telemetry_records.recorded_at DESC" in sql
+    assert sql.count("VALUES") == 1
+
+
+def test_snapshot_deletes_leave_predictions_to_the_foreign_key() -> None:
+    relationship = TrafficSnapshot.predictions.property
+
+    # Loading the collection to delete or detach it would trip ``raise_on_sql``.
+    assert relationship.passive_deletes is True
+    assert not relationship.cascade.delete and not relationship.cascade.delete_orphan
+
+
+def test_list_buses_query_count_is_independent_of_page_size() -> None:
+    async def scenario():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as connection:
+            await connection.run_sync(
+                Base.metadata.create_all, tables=[Route.__table__, Bus.__table__]
+            )
+        statements: list[str] = []
+        event.listen(
+            engine.sync_engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement),
+        )
+        sessions = async_sessionmaker(engine, expire_on_commit=False)
+        async with sessions() as session:
+            session.add_all(
+                Route(id=route_id, code=f"R{route_id}", name="R", origin="A", destination="B")
+                for route_id in (1, 2)
+            )
+            session.add_all(
+                Bus(id=bus_id, fleet_number=f"F{bus_id}", route_id=1 + bus_id % 2)
+                for bus_id in range(1, 41)
+            )
+            await session.commit()
+
+        fix_batches: list[list[int]] = []
+
+        async def latest_fixes(bus_ids: list[int]) -> dict:
+            fix_batches.append(bus_ids)
+            return {bus_ids[0]: {"latitude": 40.7}}
+
+        counts = []
+        for limit in (5, 30):
+            async with sessions() as session:
+                loaders = FleetLoaders(session)
+                loaders.latest_fix = BatchLoader(latest_fixes)
+                statements.clear()
+                page, cursor = await FleetService().list_buses(session, loaders, limit)
+                counts.append(len(statements))
+                routes = await loaders.routes.load_many([1, 2])
+                with pytest.raises(InvalidRequestError):
+                    await session.run_sync(lambda _: routes[0].buses)
+        async with sessions() as session:
+            detail = await FleetService().get_route(session, 2)
+        await engine.dispose()
+        return counts, page, cursor, routes, fix_batches, detail
+
+    counts, page, cursor, routes, fix_batches, detail = asyncio.run(scenario())
+
+    assert counts == [1, 1]
+    assert len(page) == 30 and cursor is not None
+    assert page[0]["route"] == {"id": 2, "code": "R2", "name": "R"}
+    assert page[0]["latest_fix"] == {"latitude": 40.7}
+    assert page[0]["status"] is BusStatus.IN_SERVICE
+    assert [len(batch) for batch in fix_batches] == [5, 30]
+    assert [route.id for route in routes] == [1, 2]
+    assert [bus["id"] for bus in detail["buses"]] == list(range(1, 41, 2))
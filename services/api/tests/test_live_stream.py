@@ -0,0 +1,65 @@
+import asyncio
+import json
+from datetime import datetime, timezone
+from http import HTTPStatus
+
+from app.routers.live import stream_telemetry
+from app.services.pubsub import TelemetryHub, get_telemetry_hub
+
+RECORDED_AT = datetime(2024, 11, 25, 8, 0, tzinfo=timezone.utc)
+
+
+def _update(bus_id: int, route_id: int, minute: int = 0) -> dict:
+    recorded_at = RECORDED_AT.replace(minute=minute)
+    return {"bus_id": bus_id, "route_id": route_id, "recorded_at": recorded_at}
+
+
+def test_hub_routes_updates_to_matching_subscribers_once() -> None:
+    hub = TelemetryHub(queue_size=8)
+    by_route = hub.subscribe(route_ids=[10])
+    by_both = hub.subscribe(route_ids=[10], bus_ids=[1])
+    other = hub.subscribe(bus_ids=[2])
+
+    assert hub.publish(_update(bus_id=1, route_id=10)) == 2
+    assert hub.publish(_update(bus_id=3, route_id=99)) == 0
+    assert (len(by_route), len(by_both), len(other)) == (1, 1, 0)
+
+    hub.unsubscribe(by_route)
+    assert hub.publish(_update(bus_id=1, route_id=10)) == 1
+    assert len(hub) == 2
+
+
+def test_full_mailboxes_drop_the_oldest_messages() -> None:
+    hub = TelemetryHub(queue_size=2)
+    subscription = hub.subscribe(route_ids=[10])
+    for minute in range(3):
+        hub.publish(_update(bus_id=1, route_id=10, minute=minute))
+
+    batch = asyncio.run(subscription.next_batch(timeout=0))
+
+    assert [json.loads(message)["recorded_at"][14:16] for message in batch] == ["01", "02"]
+    assert subscription.dropped == hub.dropped_messages() == 1
+    assert asyncio.run(subscription.next_batch(timeout=0)) == []
+
+
+def test_stream_requires_a_filter(client) -> None:
+    response = client.get("/telemetry/stream")
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_stream_subscribes_only_while_the_response_is_consumed() -> None:
+    hub = get_telemetry_hub()
+    before = len(hub)
+
+    async def scenario() -> tuple[int, int, int]:
+        abandoned = await stream_telemetry(route_id=[10], bus_id=[])
+        unopened = len(hub)
+        await abandoned.body_iterator.aclose()
+        response = await stream_telemetry(route_id=[10], bus_id=[])
+        await anext(response.body_iterator)
+        streaming = len(hub)
+        await response.body_iterator.aclose()
+        return unopened, streaming, len(hub)
+
+    assert asyncio.run(scenario()) == (before, before + 1, before)
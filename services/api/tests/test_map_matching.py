@@ -0,0 +1,185 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import numpy as np
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.db.base import Base
+from app.models import BusStatus, Route, RouteSegmentStat, RouteShapePoint, RouteStop
+from app.schemas.route_geometry import RouteShapeRequest
+from app.services import map_matching
+from app.services.map_matching import RouteGeometry, RouteMatcher
+from app.services.positions import PositionStore
+from app.services.predictions import compute_route_forecasts
+from app.services.route_geometry import RouteGeometryService
+
+# A straight northbound shape of 100 segments, each ~111 m long.
+LATITUDES = np.linspace(40.70, 40.80, 101)
+LONGITUDES = np.full(101, -74.0)
+START = datetime(2024, 12, 23, 8, 0, tzinfo=timezone.utc)
+
+
+def _geometry() -> RouteGeometry:
+    return RouteGeometry(1, LATITUDES, LONGITUDES)
+
+
+def test_match_snaps_fixes_to_segment_and_offset() -> None:
+    geometry = _geometry()
+
+    matches = geometry.match(
+        np.array([40.7505, 40.70, 40.90]), np.array([-74.0003, -74.0, -74.0]), 75.0
+    )
+
+    assert matches.segment.tolist() == [50, 0, -1]
+    assert np.isclose(matches.offset_m[0], 5_615, atol=5)
+    assert np.isclose(matches.distance_m[0], 25.3, atol=0.5)
+    assert matches.offset_m[1] == 0.0
+    assert np.isclose(geometry.length_m, 11_119.5, atol=1)
+
+
+def test_grid_match_agrees_with_exhaustive_match() -> None:
+    steps = np.linspace(0, 0.05, 120)
+    geometry = RouteGeometry(3, 40.70 + steps, -74.0 + 0.004 * np.sin(steps * 200))
+    rng = np.random.default_rng(3)
+    latitude = 40.70 + rng.random(2_000) * 0.05
+    longitude = -74.0 + rng.normal(0, 0.002, 2_000)
+
+    nearby = geometry.match(latitude, longitude, 60.0)
+    everywhere = geometry.match(latitude, longitude)
+
+    close = everywhere.distance_m <= 60.0
+    assert close.any() and not close.all()
+    assert np.array_equal(nearby.segment, np.where(close, everywhere.segment, -1))
+    assert np.allclose(nearby.offset_m[close], everywhere.offset_m[close])
+
+
+def test_observe_learns_segment_pace_across_batches() -> None:
+    store = PositionStore()
+    store.register_bus(7, route_id=1, status=BusStatus.IN_SERVICE)
+    store.register_bus(8, route_id=2, status=BusStatus.IN_SERVICE)
+    matcher = RouteMatcher(store)
+    matcher.set_geometry(_geometry())
+    # Bus 7 covers one segment (~111 m) every 20 s; bus 8 has no shape to match against.
+    rows = [
+        {
+            "bus_id": bus_id,
+            "recorded_at": START + timedelta(seconds=20 * step),
+            "latitude": 40.70 + 0.001 * step,
+            "longitude": -74.0,
+        }
+        for step in range(30)
+        for bus_id in (7, 8)
+    ]
+
+    assert matcher.observe(rows[:20]) == 10
+    assert matcher.observe(rows[20:]) == 20
+
+    seconds = matcher.segment_seconds(1)
+    assert np.allclose(seconds[:29], 20.0)
+    assert np.isnan(seconds[30:]).all()
+    assert np.isclose(matcher.travel_seconds(1, 0, 1_112), 200.0, atol=0.5)
+    route_id, offset = matcher.position(7)
+    assert route_id == 1 and np.isclose(offset, 29 * 111.2, atol=1)
+    assert matcher.position(8) is None
+
+
+def test_persist_upserts_in_bounded_chunks(monkeypatch) -> None:
+    class RecordingSession:
+        def __init__(self) -> None:
+            self.rows: list[int] = []
+            self.commits = 0
+
+        async def execute(self, stmt):
+            params = stmt.compile(dialect=postgresql.dialect()).params
+            self.rows.append(len(params) // 4)
+
+        async def commit(self) -> None:
+            self.commits += 1
+
+    monkeypatch.setattr(
+        map_matching, "get_settings", lambda: SimpleNamespace(telemetry_insert_chunk_size=40)
+    )
+    matcher = RouteMatcher(PositionStore())
+    matcher.set_geometry(_geometry(), pace=np.full(100, 0.1), samples=np.ones(100))
+    matcher._unsaved[1][:] = 1
+    session = RecordingSession()
+
+    assert asyncio.run(matcher.persist(session)) == 100
+    assert session.rows == [40, 40, 20]
+    assert session.commits == 1
+    assert not matcher._unsaved[1].any()
+
+
+def test_learned_length_and_travel_time_override_estimates() -> None:
+    minutes = np.arange(5, dtype=np.float64)
+    args = (
+        np.zeros(5, np.int64),
+        np.ones(5, np.int64),
+        minutes * 60,
+        40.0 + 0.005 * minutes,
+        np.full(5, -74.0),
+        np.full(5, 30.0),
+        2,
+    )
+
+    forecasts = compute_route_forecasts(
+        *args,
+        route_length_km=np.array([12.0, np.nan]),
+        segment_travel_minutes=np.array([np.nan, np.nan]),
+    )
+    assert forecasts.route_length_km[0] == 12.0
+    assert np.isclose(forecasts.travel_time_minutes[0], 24.0)
+
+    learned = compute_route_forecasts(
+        *args, route_length_km=np.array([12.0, np.nan]), segment_travel_minutes=np.array([31.0, 5])
+    )
+    assert learned.travel_time_minutes[0] == 31.0
+
+
+def test_saved_shape_snaps_stops_and_lists_segments() -> None:
+    async def scenario():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        tables = [
+            model.__table__ for model in (Route, RouteShapePoint, RouteStop, RouteSegmentStat)
+        ]
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all, tables=tables)
+        sessions = async_sessionmaker(engine, expire_on_commit=False)
+        service = RouteGeometryService(RouteMatcher(PositionStore()))
+        shape = RouteShapeRequest(
+            points=[
+                {"latitude": 40.70, "longitude": -74.0},
+                {"latitude": 40.71, "longitude": -74.0},
+                {"latitude": 40.72, "longitude": -74.0},
+            ],
+            stops=[
+                {"name": "Depot", "latitude": 40.70, "longitude": -74.0001},
+                {"name": "Mid", "latitude": 40.715, "longitude": -73.9999},
+            ],
+        )
+        async with sessions() as session:
+            session.add(Route(id=1, code="R1", name="R1", origin="A", destination="B"))
+            await session.commit()
+            missing = await service.save_shape(session, 2, shape)
+            saved = await service.save_shape(session, 1, shape)
+            session.add(
+                RouteSegmentStat(route_id=1, segment_index=1, seconds_per_meter=0.1, samples=4)
+            )
+            await session.commit()
+            stored = await service.shape(session, 1)
+            segments = await service.segments(session, 1)
+        await engine.dispose()
+        return missing, saved, stored, segments
+
+    missing, saved, stored, segments = asyncio.run(scenario())
+
+    assert missing is None
+    assert saved == stored
+    assert np.isclose(saved["length_m"], 2_223.9, atol=1)
+    assert [stop["name"] for stop in saved["stops"]] == ["Depot", "Mid"]
+    assert np.isclose(saved["stops"][1]["distance_m"], 1_667.9, atol=1)
+    assert [segment["samples"] for segment in segments] == [0, 4]
+    assert segments[0]["traversal_seconds"] is None
+    assert np.isclose(segments[1]["traversal_seconds"], 111.2, atol=0.1)
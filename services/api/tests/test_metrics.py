@@ -0,0 +1,53 @@
+import asyncio
+from http import HTTPStatus
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.metrics import DB_QUERY_DURATION, HTTP_REQUESTS, MetricsRegistry
+from app.db.instrumentation import instrument_engine, statement_operation
+
+
+def test_histogram_renders_cumulative_buckets() -> None:
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+    latency.observe(0.05, "/a")
+    latency.observe(0.5, "/a")
+    latency.observe(5.0, "/a")
+
+    output = registry.render()
+    assert "# TYPE latency_seconds histogram" in output
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in output
+    assert 'latency_seconds_bucket{route="/a",le="1.0"} 2' in output
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in output
+    assert 'latency_seconds_count{route="/a"} 3' in output
+
+
+def test_metrics_endpoint_labels_requests_by_route_template(client) -> None:
+    before = HTTP_REQUESTS.value("GET", "/health", "200")
+    assert client.get("/health").status_code == HTTPStatus.OK
+    assert HTTP_REQUESTS.value("GET", "/health", "200") == before + 1
+
+    client.get("/no/such/path")
+    response = client.get("/metrics")
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'http_request_duration_seconds_count{method="GET",route="/health"}' in response.text
+    assert 'route="<unmatched>",status="404"' in response.text
+    assert "db_pool_checked_out" in response.text
+
+
+def test_engine_events_time_each_statement() -> None:
+    assert statement_operation("  with recent as (select 1) select * from recent") == "WITH"
+
+    async def run() -> None:
+        engine = create_async_engine("sqlite+aiosqlite://")
+        instrument_engine(engine.sync_engine)
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+        await engine.dispose()
+
+    before = DB_QUERY_DURATION.count("SELECT")
+    asyncio.run(run())
+    assert DB_QUERY_DURATION.count("SELECT") == before + 1
@@ -0,0 +1,24 @@
+from http import HTTPStatus
+
+import pytest
+
+from app.services.pagination import InvalidCursorError, decode_cursor, encode_cursor
+
+
+def test_cursor_round_trips_and_is_bound_to_its_listing() -> None:
+    token = encode_cursor("predictions", t="2024-11-25T08:00:00+00:00", id=42)
+
+    assert "=" not in token
+    assert decode_cursor("predictions", token) == {"t": "2024-11-25T08:00:00+00:00", "id": 42}
+    with pytest.raises(InvalidCursorError):
+        decode_cursor("telemetry", token)
+    with pytest.raises(InvalidCursorError):
+        decode_cursor("predictions", "not-a-cursor")
+
+
+def test_listing_endpoints_reject_bad_cursors_and_page_sizes(client) -> None:
+    bad_cursor = client.get("/buses/1/telemetry", params={"cursor": "garbage"})
+    too_large = client.get("/routes/1/predictions", params={"limit": 5_000})
+
+    assert bad_cursor.status_code == HTTPStatus.BAD_REQUEST
+    assert too_large.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
@@ -0,0 +1,40 @@
+from datetime import datetime, timezone
+
+from app.services.partitions import (
+    expired_partitions,
+    parse_partition_bound,
+    planned_partitions,
+)
+
+NOW = datetime(2024, 12, 4, 15, 30, tzinfo=timezone.utc)
+
+
+def test_planned_daily_partitions_cover_the_requested_window() -> None:
+    partitions = planned_partitions(NOW, datetime(2024, 12, 6, tzinfo=timezone.utc), "daily")
+
+    assert [partition.name for partition in partitions] == [
+        "telemetry_records_p20241204",
+        "telemetry_records_p20241205",
+        "telemetry_records_p20241206",
+    ]
+    assert partitions[0].start == datetime(2024, 12, 4, tzinfo=timezone.utc)
+    assert partitions[-1].end == datetime(2024, 12, 7, tzinfo=timezone.utc)
+
+
+def test_weekly_partitions_start_on_monday() -> None:
+    (partition,) = planned_partitions(NOW, NOW, "weekly")
+
+    assert partition.start == datetime(2024, 12, 2, tzinfo=timezone.utc)
+    assert partition.end == datetime(2024, 12, 9, tzinfo=timezone.utc)
+
+
+def test_parse_bounds_and_select_expired_partitions() -> None:
+    bound = "FOR VALUES FROM ('2024-09-01 00:00:00+00') TO ('2024-09-02 00:00:00+00')"
+    partition = parse_partition_bound("telemetry_records_p20240901", bound)
+    recent = planned_partitions(NOW, NOW, "daily")[0]
+
+    assert partition is not None
+    assert partition.start == datetime(2024, 9, 1, tzinfo=timezone.utc)
+    assert parse_partition_bound("telemetry_records_default", "DEFAULT") is None
+    assert expired_partitions([partition, recent], NOW, retention_days=90) == [partition]
+    assert expired_partitions([partition, recent], NOW, retention_days=None) == []
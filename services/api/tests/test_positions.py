@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta, timezone
+from http import HTTPStatus
+
+from app.models import BusStatus
+from app.services.positions import PositionStore, get_position_store
+
+NOW = datetime(2024, 11, 25, 8, 0, tzinfo=timezone.utc)
+
+
+def test_position_store_keeps_only_the_newest_fix() -> None:
+    store = PositionStore()
+    store.register_bus(1, route_id=10, status=BusStatus.IN_SERVICE)
+
+    assert store.update(1, NOW, 40.7, -74.0, speed_kph=30.0, heading=90)
+    assert not store.update(1, NOW - timedelta(minutes=1), 0.0, 0.0)
+
+    position = store.get(1)
+    assert position is not None
+    assert (position["latitude"], position["longitude"]) == (40.7, -74.0)
+    assert position["passenger_load"] is None
+    assert position["recorded_at"] == NOW
+
+
+def test_position_store_filters_by_route_and_status() -> None:
+    store = PositionStore()
+    store.register_bus(1, route_id=10, status=BusStatus.IN_SERVICE)
+    store.register_bus(2, route_id=10, status=BusStatus.MAINTENANCE)
+    store.register_bus(3, route_id=20, status=BusStatus.IN_SERVICE)
+    store.register_bus(4, route_id=20, status=BusStatus.IN_SERVICE)
+    for bus_id in (1, 2, 3):
+        store.update(bus_id, NOW, 40.7, -74.0)
+    store.register_bus(3, route_id=10, status=BusStatus.IN_SERVICE)
+
+    assert {row["bus_id"] for row in store.snapshot()} == {1, 2, 3}
+    assert {row["bus_id"] for row in store.snapshot(route_id=10)} == {1, 2, 3}
+    assert store.snapshot(route_id=20) == []
+    in_service = store.snapshot(route_id=10, status=BusStatus.IN_SERVICE)
+    assert {row["bus_id"] for row in in_service} == {1, 3}
+
+
+def test_positions_endpoint_serves_the_shared_store(client) -> None:
+    store = get_position_store()
+    store.register_bus(501, route_id=77, status=BusStatus.IN_SERVICE)
+    store.update(501, NOW, 40.7, -74.0, passenger_load=12)
+
+    response = client.get("/buses/positions", params={"route_id": 77, "status": "in_service"})
+
+    assert response.status_code == HTTPStatus.OK
+    payload = response.json()
+    assert payload["count"] == 1
+    assert payload["positions"][0]["bus_id"] == 501
+    assert payload["positions"][0]["passenger_load"] == 12
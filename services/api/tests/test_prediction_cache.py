@@ -0,0 +1,79 @@
+import asyncio
+from http import HTTPStatus
+
+from app.services.cache import TTLCache
+from app.services.prediction_reads import (
+    PredictionReadService,
+    get_prediction_reads,
+    parse_invalidation,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_ttl_cache_evicts_least_recently_used_and_expired_entries() -> None:
+    clock = FakeClock()
+    cache: TTLCache[int, str] = TTLCache(maxsize=2, ttl_seconds=10, clock=clock)
+    cache.set(1, "a")
+    cache.set(2, "b")
+    cache.get(1)
+    cache.set(3, "c")
+
+    assert cache.get(2) is None
+    assert cache.get(1) == "a"
+    clock.now = 10
+    assert cache.get(1) is None
+    assert len(cache) == 1
+
+
+class CountingReads(PredictionReadService):
+    def __init__(self) -> None:
+        super().__init__(TTLCache(maxsize=8, ttl_seconds=60))
+        self.loads = 0
+
+    async def _load(self, session, route_id):
+        self.loads += 1
+        await asyncio.sleep(0)
+        return []
+
+
+def test_concurrent_misses_share_one_load_and_invalidation_forces_reload() -> None:
+    reads = CountingReads()
+
+    async def scenario() -> None:
+        first, second = await asyncio.gather(reads.upcoming(None, 7), reads.upcoming(None, 7))
+        assert first is second
+        await reads.upcoming(None, 7)
+        assert reads.loads == 1
+        reads.invalidate([7])
+        await reads.upcoming(None, 7)
+        assert reads.loads == 2
+
+    asyncio.run(scenario())
+    assert parse_invalidation("3,4") == [3, 4]
+    assert parse_invalidation("*") is None
+
+
+def test_upcoming_predictions_support_conditional_get(client, monkeypatch) -> None:
+    reads = get_prediction_reads()
+
+    async def no_rows(session, route_id):
+        return []
+
+    monkeypatch.setattr(reads, "_load", no_rows)
+    reads.invalidate([9])
+
+    response = client.get("/routes/9/predictions/upcoming")
+    etag = response.headers["etag"]
+    revalidated = client.get("/routes/9/predictions/upcoming", headers={"If-None-Match": etag})
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {"route_id": 9, "items": []}
+    assert revalidated.status_code == HTTPStatus.NOT_MODIFIED
+    assert revalidated.headers["etag"] == etag
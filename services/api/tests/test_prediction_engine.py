@@ -0,0 +1,53 @@
+import numpy as np
+
+from app.services.predictions import compute_route_forecasts
+
+
+def _fixes(route: int, bus: int, speeds: list[float], lat_step: float) -> list[tuple]:
+    return [
+        (route, bus, 60.0 * minute, 40.0 + lat_step * minute, -74.0, speed)
+        for minute, speed in enumerate(speeds)
+    ]
+
+
+def test_forecasts_aggregate_each_route_independently() -> None:
+    rows = (
+        _fixes(0, 1, [30.0] * 10, 0.01)
+        + _fixes(0, 2, [30.0] * 10, 0.01)
+        + _fixes(1, 3, [float("nan")] * 10, 0.005)
+    )
+    route, bus, ts, lat, lon, speed = (np.asarray(column) for column in zip(*rows))
+
+    forecasts = compute_route_forecasts(
+        route.astype(np.int64),
+        bus.astype(np.int64),
+        ts,
+        lat,
+        lon,
+        speed,
+        n_routes=3,
+        window_minutes=10,
+        min_route_length_km=5.0,
+    )
+
+    assert forecasts.valid.tolist() == [True, True, False]
+    assert forecasts.active_buses.tolist() == [2, 1, 0]
+    assert forecasts.speed_kph[0] == 30.0
+    # Route 1 reports no speed, so it is derived from ~0.556 km covered per minute.
+    assert np.isclose(forecasts.speed_kph[1], 33.4, atol=0.1)
+    assert np.isclose(forecasts.route_length_km[0], 10.0, atol=0.1)
+    assert np.isclose(forecasts.travel_time_minutes[0], 20.0, atol=0.2)
+    assert np.isclose(forecasts.headway_minutes[0], 20.0, atol=0.2)
+    assert 0 < forecasts.confidence[0] <= 0.9
+
+
+def test_congestion_slows_forecasts_and_lowers_confidence() -> None:
+    rows = _fixes(0, 1, [40.0] * 5, 0.02)
+    route, bus, ts, lat, lon, speed = (np.asarray(column) for column in zip(*rows))
+    args = (route.astype(np.int64), bus.astype(np.int64), ts, lat, lon, speed, 1)
+
+    free = compute_route_forecasts(*args, congestion_index=0)
+    jammed = compute_route_forecasts(*args, congestion_index=100)
+
+    assert jammed.travel_time_minutes[0] > free.travel_time_minutes[0]
+    assert jammed.confidence[0] < free.confidence[0]
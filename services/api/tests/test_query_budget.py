@@ -0,0 +1,123 @@
+import asyncio
+import logging
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app import main
+from app.core.config import get_settings
+from app.core.middleware import QueryBudgetMiddleware
+from app.db.query_budget import (
+    SlowQueryLog,
+    instrument_query_budget,
+    start_tracking,
+    stop_tracking,
+)
+from app.routers.admin import router as admin_router
+
+
+async def _run_queries(repeats: int) -> None:
+    engine = create_async_engine("sqlite+aiosqlite://")
+    instrument_query_budget(engine)
+    async with engine.connect() as connection:
+        for bus_id in range(repeats):
+            await connection.execute(text("SELECT :bus_id"), {"bus_id": bus_id})
+        await connection.execute(text("SELECT 1"))
+    await engine.dispose()
+
+
+def test_statements_are_counted_only_while_tracking() -> None:
+    async def scenario():
+        await _run_queries(2)
+        stats, token = start_tracking()
+        try:
+            await _run_queries(6)
+        finally:
+            stop_tracking(token)
+        return stats
+
+    stats = asyncio.run(scenario())
+
+    assert stats.statements == 7
+    assert stats.seconds > 0
+    assert stats.repeated(5) == [("SELECT ?", 6)]
+    assert stats.repeated(7) == []
+
+
+def _app(expose_headers: bool) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(
+        QueryBudgetMiddleware, max_statements=3, repeat_threshold=5, expose_headers=expose_headers
+    )
+
+    @app.get("/buses")
+    async def list_buses() -> dict:
+        await _run_queries(5)
+        return {}
+
+    return app
+
+
+def test_middleware_reports_budget_and_suspected_n_plus_one(caplog) -> None:
+    with caplog.at_level(logging.WARNING, logger="app.db.query_budget"):
+        response = TestClient(_app(expose_headers=True)).get("/buses")
+
+    assert response.headers["x-db-query-count"] == "6"
+    assert float(response.headers["x-db-query-time-ms"]) > 0
+    assert response.headers["x-db-repeated-statements"] == "1"
+    messages = [record.getMessage() for record in caplog.records]
+    assert any("GET /buses ran 6 statements (budget 3" in message for message in messages)
+    assert any("Suspected N+1 in GET /buses: 5 executions" in message for message in messages)
+
+    hidden = TestClient(_app(expose_headers=False)).get("/buses")
+    assert "x-db-query-count" not in hidden.headers
+
+
+def test_slow_query_log_keeps_newest_plans_for_slow_selects() -> None:
+    async def explain(statement: str, parameters) -> str:
+        if "broken" in statement:
+            raise OSError("connection reset")
+        return f"Seq Scan ({parameters})"
+
+    async def scenario():
+        slow_log = SlowQueryLog(capacity=2, threshold_seconds=0.1)
+        assert not slow_log.should_capture("SELECT 1", 0.05)
+        assert not slow_log.should_capture("UPDATE buses SET status = $1", 1.0)
+        for statement in ("SELECT a", "SELECT b", "SELECT broken"):
+            assert slow_log.should_capture(statement, 0.5)
+            slow_log.capture(explain, statement, (1,), 0.5)
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        return slow_log.entries()
+
+    entries = asyncio.run(scenario())
+
+    assert [entry["statement"] for entry in entries] == ["SELECT broken", "SELECT b"]
+    assert entries[0]["plan"] is None and entries[0]["error"] == "connection reset"
+    assert entries[1]["plan"] == "Seq Scan ((1,))"
+    assert entries[1]["duration_ms"] == 500.0
+
+
+def test_admin_endpoint_lists_captured_plans() -> None:
+    app = FastAPI()
+    app.include_router(admin_router)
+
+    response = TestClient(app).get("/admin/slow-queries")
+
+    assert response.status_code == 200
+    assert response.json()["items"] == []
+    assert response.json()["threshold_ms"] == 200.0
+
+
+def test_admin_endpoint_is_not_mounted_in_production(monkeypatch) -> None:
+    def paths(environment: str) -> set[str]:
+        settings = get_settings().model_copy(
+            update={"environment": environment, "query_budget_enabled": True}
+        )
+        monkeypatch.setattr(main, "get_settings", lambda: settings)
+        return {route.path for route in main.create_app().routes}
+
+    assert "/admin/slow-queries" in paths("staging")
+    assert "/admin/slow-queries" not in paths("production")
@@ -0,0 +1,112 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import orjson
+from fastapi import FastAPI, Request, Response
+
+from benchmarks.replay import plan_replay, read_export_file, replay
+
+START = datetime(2024, 12, 2, 7, 0, tzinfo=timezone.utc)
+
+
+def _fix(bus_id: int, seconds: float) -> dict:
+    return {
+        "bus_id": bus_id,
+        "recorded_at": START + timedelta(seconds=seconds),
+        "latitude": 40.7,
+        "longitude": -74.0,
+        "speed_kph": None,
+        "heading": 90,
+        "passenger_load": None,
+    }
+
+
+def test_plan_scales_gaps_and_keeps_per_bus_order() -> None:
+    restamp = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    plan = plan_replay(
+        [_fix(2, 30), _fix(1, 20), _fix(1, 0), _fix(2, 10)], speed=10, restamp_from=restamp
+    )
+
+    assert [offset for offset, _ in plan.buses[1]] == [0.0, 2.0]
+    assert [offset for offset, _ in plan.buses[2]] == [1.0, 3.0]
+    assert plan.buses[2][1][1]["recorded_at"] == restamp + timedelta(seconds=3)
+    assert len(plan) == 4 and plan.target_rate == 4 / 3
+
+
+def test_replay_posts_each_bus_in_order_and_reports_errors() -> None:
+    arrivals: list[tuple[int, str, float]] = []
+    app = FastAPI()
+
+    @app.post("/telemetry")
+    async def ingest(request: Request) -> Response:
+        fix = orjson.loads(await request.body())
+        arrivals.append((fix["bus_id"], fix["recorded_at"], asyncio.get_running_loop().time()))
+        return Response(status_code=429 if fix["bus_id"] == 3 else 202)
+
+    # Three buses, one fix every 60 recorded seconds, replayed at 600x (every 0.1 s).
+    fixes = [_fix(bus_id, step * 60) for bus_id in (1, 2, 3) for step in range(4)]
+    plan = plan_replay(fixes, speed=600)
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://replay") as client:
+            return await replay(client, plan)
+
+    report = asyncio.run(scenario())
+
+    assert report.sent == 12 and report.accepted == 8
+    assert report.statuses == {"429": 4}
+    assert report.error_rate == 4 / 12
+    assert report.elapsed_seconds >= 0.3
+    assert len(report.latencies) == len(report.schedule_lag) == 12
+    for bus_id in (1, 2, 3):
+        sent = [(recorded_at, at) for bus, recorded_at, at in arrivals if bus == bus_id]
+        assert [recorded_at for recorded_at, _ in sent] == sorted(
+            recorded_at for recorded_at, _ in sent
+        )
+        gaps = [later - earlier for (_, earlier), (_, later) in zip(sent, sent[1:])]
+        assert all(gap > 0.07 for gap in gaps)
+    assert "errors 33.33% (429: 4)" in report.format()
+
+
+def test_batch_mode_posts_per_bus_groups_to_the_batch_endpoint() -> None:
+    batches: list[list[dict]] = []
+    app = FastAPI()
+
+    @app.post("/telemetry/batch")
+    async def ingest(request: Request) -> Response:
+        records = orjson.loads(await request.body())["records"]
+        batches.append(records)
+        rejected = sum(1 for record in records if record["bus_id"] == 2)
+        return Response(orjson.dumps({"accepted": len(records) - rejected, "rejected": rejected}))
+
+    # Five fixes per bus, 60 recorded seconds apart, at 1200x: groups of two, two, one.
+    fixes = [_fix(bus_id, step * 60) for bus_id in (1, 2) for step in range(5)]
+    plan = plan_replay(fixes, speed=1200)
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://replay") as client:
+            return await replay(client, plan, batch_size=2)
+
+    report = asyncio.run(scenario())
+
+    assert sorted(len(records) for records in batches) == [1, 1, 2, 2, 2, 2]
+    assert all(len({record["bus_id"] for record in records}) == 1 for records in batches)
+    assert report.sent == 10 and report.accepted == 5
+    assert report.statuses == {"rejected": 5}
+    assert len(report.latencies) == len(report.schedule_lag) == 6
+    assert "schedule lag" in report.format()
+
+
+def test_export_files_are_read_back_in_both_formats(tmp_path) -> None:
+    ndjson = tmp_path / "telemetry.ndjson"
+    ndjson.write_bytes(orjson.dumps(_fix(4, 5)) + b"\n")
+    csv_file = tmp_path / "telemetry.csv"
+    csv_file.write_text(
+        "bus_id,recorded_at,latitude,longitude,speed_kph,heading,passenger_load\n"
+        "4,2024-12-02 07:00:05+00:00,40.7,-74.0,,90,\n"
+    )
+
+    assert read_export_file(ndjson) == read_export_file(csv_file) == [_fix(4, 5)]
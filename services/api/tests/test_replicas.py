@@ -0,0 +1,60 @@
+import asyncio
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.db import session as db_session
+from app.db.replicas import ReplicaSet
+
+UNREACHABLE_URL = "sqlite+aiosqlite:////nonexistent/dir/replica.db"
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_round_robin_skips_replicas_until_retry_window_passes() -> None:
+    clock = FakeClock()
+    engines = [create_async_engine(f"sqlite+aiosqlite:///replica{i}.db") for i in range(3)]
+    replicas = ReplicaSet(engines, retry_after=30.0, clock=clock)
+    first, second, third = replicas.replicas
+
+    assert [replicas.choose() for _ in range(4)] == [first, second, third, first]
+
+    replicas.mark_down(second)
+    assert [replicas.choose() for _ in range(3)] == [third, first, third]
+
+    clock.now = 31.0
+    assert second in replicas.healthy()
+
+    for replica in replicas.replicas:
+        replicas.mark_down(replica)
+    assert replicas.choose() is None
+
+
+def test_read_session_falls_back_to_primary_when_replica_is_down(monkeypatch) -> None:
+    primary = create_async_engine("sqlite+aiosqlite://")
+    replicas = ReplicaSet([create_async_engine(UNREACHABLE_URL)])
+    monkeypatch.setattr(db_session, "get_replica_set", lambda: replicas)
+    monkeypatch.setattr(db_session, "get_sessionmaker", lambda: async_sessionmaker(bind=primary))
+
+    async def run() -> list[int]:
+        values = []
+        async for session in db_session.get_read_session():
+            assert session.bind is primary
+            values.append((await session.execute(text("SELECT 1"))).scalar_one())
+        await primary.dispose()
+        return values
+
+    assert asyncio.run(run()) == [1]
+    assert replicas.healthy() == []
+
+
+def test_health_check_marks_unreachable_replicas_down() -> None:
+    replicas = ReplicaSet([create_async_engine(UNREACHABLE_URL)])
+    asyncio.run(replicas.check())
+    assert replicas.choose() is None
@@ -0,0 +1,38 @@
+from datetime import datetime, timezone
+from http import HTTPStatus
+
+import pytest
+
+from app.services.rollups import TelemetryRollupService, align_down, pick_source_resolution
+
+START = datetime(2024, 11, 25, tzinfo=timezone.utc)
+
+
+def test_pick_source_resolution_prefers_the_coarsest_tiling_rollup() -> None:
+    assert pick_source_resolution(60) == 60
+    assert pick_source_resolution(120) == 60
+    assert pick_source_resolution(900) == 300
+    assert pick_source_resolution(86_400) == 3600
+    assert pick_source_resolution(90) is None
+    moment = datetime(2024, 11, 25, 8, 47, 13, tzinfo=timezone.utc)
+    assert align_down(moment, 3600) == START.replace(hour=8)
+
+
+def test_series_statement_rejects_untileable_or_oversized_requests() -> None:
+    service = TelemetryRollupService()
+
+    source, _ = service.series_statement(900, START, START.replace(day=26), route_id=1)
+    assert source == 300
+    with pytest.raises(ValueError):
+        service.series_statement(90, START, START.replace(day=26), route_id=1)
+    with pytest.raises(ValueError):
+        service.series_statement(60, START, START.replace(month=12), route_id=1)
+
+
+def test_rollup_endpoint_requires_exactly_one_subject(client) -> None:
+    response = client.get(
+        "/rollups/telemetry",
+        params={"start": "2024-11-25T00:00:00Z", "end": "2024-11-26T00:00:00Z"},
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
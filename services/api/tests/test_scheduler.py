@@ -0,0 +1,138 @@
+import asyncio
+import contextlib
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.services.scheduler import (
+    JOB_RUNS,
+    CronTrigger,
+    IntervalTrigger,
+    Job,
+    Scheduler,
+    advisory_lock_key,
+    claim_slot_statement,
+)
+
+
+def _leader(is_leader: bool):
+    @contextlib.asynccontextmanager
+    async def lock(name: str, slot: datetime):
+        yield is_leader
+
+    return lock
+
+
+def test_cron_next_run_handles_steps_ranges_and_weekdays() -> None:
+    every_quarter = CronTrigger.parse("*/15 * * * *")
+    after = datetime(2024, 12, 2, 10, 7, 30, tzinfo=timezone.utc)
+    assert every_quarter.next_run(after) == datetime(2024, 12, 2, 10, 15, tzinfo=timezone.utc)
+
+    weekday_mornings = CronTrigger.parse("30 6 * * 1-5")
+    friday_evening = datetime(2024, 12, 6, 18, 0, tzinfo=timezone.utc)
+    monday = datetime(2024, 12, 9, 6, 30, tzinfo=timezone.utc)
+    assert weekday_mornings.next_run(friday_evening) == monday
+
+    new_year = CronTrigger.parse("0 0 1 1 *")
+    assert new_year.next_run(friday_evening) == datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+    with pytest.raises(ValueError):
+        CronTrigger.parse("61 * * * *")
+    with pytest.raises(ValueError):
+        CronTrigger.parse("* * *")
+
+
+def test_interval_slots_are_aligned_across_replicas() -> None:
+    every_minute = IntervalTrigger(60)
+    early = datetime(2024, 12, 2, 10, 7, 5, tzinfo=timezone.utc)
+    late = early + timedelta(seconds=40)
+
+    assert every_minute.next_run(early) == every_minute.next_run(late)
+    assert every_minute.next_run(early) == datetime(2024, 12, 2, 10, 8, tzinfo=timezone.utc)
+
+
+def test_advisory_lock_key_is_stable_signed_bigint() -> None:
+    key = advisory_lock_key("refresh_rollups")
+    assert key == advisory_lock_key("refresh_rollups")
+    assert key != advisory_lock_key("recompute_predictions")
+    assert -(2**63) <= key < 2**63
+
+
+def test_run_job_skips_when_another_replica_holds_the_lock() -> None:
+    calls: list[str] = []
+
+    async def work() -> None:
+        calls.append("ran")
+
+    async def scenario() -> tuple[str, str]:
+        job = Job("leader-test", work, IntervalTrigger(60))
+        follower = await Scheduler(leader_lock=_leader(False)).run_job(job)
+        job.running += 1
+        leader = await Scheduler(leader_lock=_leader(True)).run_job(job)
+        return follower, leader
+
+    follower, leader = asyncio.run(scenario())
+    assert (follower, leader) == ("skipped_not_leader", "success")
+    assert calls == ["ran"]
+
+
+def test_a_slot_already_claimed_elsewhere_is_not_run_again() -> None:
+    claimed: dict[str, datetime] = {}
+    calls: list[datetime] = []
+    slot = datetime(2024, 12, 2, 10, 8, tzinfo=timezone.utc)
+
+    # Mirrors the upsert: the lock holder runs only if the slot is newer than the last claim.
+    @contextlib.asynccontextmanager
+    async def lock(name: str, slot: datetime):
+        if name in claimed and claimed[name] >= slot:
+            yield False
+            return
+        claimed[name] = slot
+        yield True
+
+    async def work() -> None:
+        calls.append(slot)
+
+    async def scenario() -> list[str]:
+        job = Job("slot-test", work, IntervalTrigger(60))
+        outcomes = []
+        for replica_slot in (slot, slot, slot + timedelta(minutes=1)):
+            job.running += 1
+            outcomes.append(await Scheduler(leader_lock=lock).run_job(job, replica_slot))
+        return outcomes
+
+    assert asyncio.run(scenario()) == ["success", "skipped_not_leader", "success"]
+    assert len(calls) == 2
+
+    sql = str(claim_slot_statement("slot-test", slot).compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT (job) DO UPDATE" in sql
+    assert "WHERE scheduled_job_slots.slot_start < excluded.slot_start" in sql
+
+
+def test_slow_runs_are_skipped_not_queued_and_time_out() -> None:
+    started: list[int] = []
+
+    async def slow() -> None:
+        started.append(1)
+        await asyncio.sleep(1)
+
+    async def scenario() -> None:
+        scheduler = Scheduler(leader_lock=_leader(True))
+        scheduler.add_job(Job("overlap-test", slow, IntervalTrigger(0.01), timeout_seconds=0.1))
+        scheduler.start()
+        await asyncio.sleep(0.15)
+        await scheduler.stop(timeout=1.0)
+
+    asyncio.run(scenario())
+    # ~15 slots elapsed, but each run holds its slot for the 0.1s timeout.
+    assert 1 <= len(started) <= 2
+    assert JOB_RUNS.value("overlap-test", "skipped_overlap") > 0
+    assert JOB_RUNS.value("overlap-test", "timeout") == len(started)
+
+
+def test_duplicate_job_names_are_rejected() -> None:
+    scheduler = Scheduler()
+    scheduler.add_job(Job("dup", lambda: asyncio.sleep(0), IntervalTrigger(1)))
+    with pytest.raises(ValueError):
+        scheduler.add_job(Job("dup", lambda: asyncio.sleep(0), IntervalTrigger(1)))
@@ -0,0 +1,47 @@
+from datetime import datetime, timezone
+from http import HTTPStatus
+
+from app.models import BusStatus
+from app.services.positions import get_position_store
+from app.services.spatial import SpatialGrid, haversine_m
+
+
+def test_grid_nearby_returns_points_within_radius_nearest_first() -> None:
+    grid = SpatialGrid(cell_size_deg=0.01)
+    grid.upsert(1, 40.7128, -74.0060)
+    grid.upsert(2, 40.7150, -74.0060)
+    grid.upsert(3, 40.7600, -74.0060)
+
+    matches = grid.nearby(40.7128, -74.0060, radius_m=500)
+
+    assert [key for key, _ in matches] == [1, 2]
+    assert matches[1][1] == haversine_m(40.7128, -74.0060, 40.7150, -74.0060)
+
+
+def test_grid_moves_points_between_cells_and_answers_bounding_boxes() -> None:
+    grid = SpatialGrid(cell_size_deg=0.01)
+    grid.upsert(1, 40.70, -74.00)
+    grid.upsert(1, 41.50, -73.00)
+    grid.upsert(2, 40.705, -74.005)
+
+    assert grid.within(40.69, -74.01, 40.71, -73.99) == [2]
+    assert grid.within(-90, -180, 90, 180) and len(grid) == 2
+    grid.remove(2)
+    assert grid.nearby(40.705, -74.005, 1_000) == []
+
+
+def test_nearby_endpoint_reads_the_position_store(client) -> None:
+    store = get_position_store()
+    store.register_bus(601, route_id=88, status=BusStatus.IN_SERVICE)
+    store.update(601, datetime(2024, 11, 25, tzinfo=timezone.utc), -33.8688, 151.2093)
+
+    response = client.get(
+        "/buses/nearby", params={"lat": -33.8690, "lon": 151.2090, "radius_m": 200}
+    )
+    inverted = client.get(
+        "/buses/within", params={"min_lat": 1, "min_lon": 0, "max_lat": 0, "max_lon": 1}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert [bus["bus_id"] for bus in response.json()["buses"]] == [601]
+    assert inverted.status_code == HTTPStatus.BAD_REQUEST
@@ -0,0 +1,63 @@
+import asyncio
+import subprocess
+import sys
+import types
+
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.db.session import warm_engine_pool
+from app.profiling import StartupProfiler
+
+
+def test_importing_models_does_not_build_the_api() -> None:
+    probe = "import sys, app.models; print('app.main' in sys.modules)"
+    output = subprocess.run(
+        [sys.executable, "-c", probe], capture_output=True, text=True, check=True
+    ).stdout
+    assert output.strip() == "False"
+
+
+def test_importing_the_api_does_not_load_the_prediction_engine() -> None:
+    probe = "import sys, app.main; print('app.services.predictions' in sys.modules)"
+    output = subprocess.run(
+        [sys.executable, "-c", probe], capture_output=True, text=True, check=True
+    ).stdout
+    assert output.strip() == "False"
+
+
+def test_profiler_separates_self_time_from_nested_imports() -> None:
+    profiler = StartupProfiler()
+
+    class Loader:
+        def __init__(self, body) -> None:
+            self.body = body
+
+        def exec_module(self, module) -> None:
+            self.body()
+
+    def child() -> None:
+        sum(range(200_000))
+
+    def parent() -> None:
+        profiler.run_module("pkg.child", Loader(child), types.ModuleType("pkg.child"))
+
+    profiler.run_module("pkg", Loader(parent), types.ModuleType("pkg"))
+    profiler.mark("first request served")
+
+    timings = {timing.name: timing for timing in profiler.modules}
+    assert timings["pkg"].cumulative >= timings["pkg.child"].cumulative
+    assert timings["pkg"].self_time < timings["pkg"].cumulative
+    report = profiler.report()
+    assert "first request served" in report
+    assert "pkg.child" in report
+
+
+def test_pool_warm_up_leaves_connections_idle_in_the_pool(tmp_path) -> None:
+    async def run() -> tuple[int, int]:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'warm.db'}")
+        opened = await warm_engine_pool(engine, 3)
+        idle = engine.pool.checkedin()
+        await engine.dispose()
+        return opened, idle
+
+    assert asyncio.run(run()) == (3, 3)
@@ -0,0 +1,52 @@
+from datetime import datetime, timezone
+
+import numpy as np
+
+from app.services.synthetic import (
+    SERVICE_START_HOUR,
+    bus_telemetry,
+    demand_profile,
+    synthetic_route,
+    traffic_snapshots,
+)
+
+DAY_START = datetime(2024, 11, 25, tzinfo=timezone.utc)
+DAY_END = datetime(2024, 11, 26, tzinfo=timezone.utc)
+
+
+def test_generation_is_deterministic_per_seed_and_bus() -> None:
+    route = synthetic_route(seed=7, index=3)
+    assert route == synthetic_route(seed=7, index=3)
+    assert route != synthetic_route(seed=8, index=3)
+
+    first = bus_telemetry(7, 11, route, DAY_START, DAY_END, ping_seconds=30)
+    again = bus_telemetry(7, 11, route, DAY_START, DAY_END, ping_seconds=30)
+    other = bus_telemetry(7, 12, route, DAY_START, DAY_END, ping_seconds=30)
+
+    np.testing.assert_array_equal(first.latitude, again.latitude)
+    assert not np.array_equal(first.speed_kph[:100], other.speed_kph[:100])
+
+
+def test_bus_telemetry_stays_on_route_during_service_hours() -> None:
+    route = synthetic_route(seed=1, index=0)
+    columns = bus_telemetry(1, 0, route, DAY_START, DAY_END, ping_seconds=10, capacity=40)
+
+    hours = (columns.epoch_seconds % 86_400) // 3_600
+    assert hours.min() >= SERVICE_START_HOUR
+    assert np.all(np.diff(columns.epoch_seconds) == 10)
+    assert 0 <= columns.speed_kph.min() and columns.speed_kph.max() <= 90
+    assert columns.passenger_load.max() <= 52
+    # Every fix lies within the corridor's extent (plus GPS noise).
+    reach = route.length_km / 111 + 0.01
+    assert np.abs(columns.latitude - route.origin_lat).max() <= reach
+
+
+def test_demand_peaks_at_rush_hour_and_drives_snapshots() -> None:
+    demand = demand_profile(np.array([3.0, 8.0, 12.0, 17.5]))
+    assert demand[1] > demand[2] > demand[0]
+    assert demand[3] > demand[2]
+
+    rows = traffic_snapshots(1, 0, DAY_START, DAY_END, every_minutes=60)
+    assert len(rows) == 24
+    assert rows[8]["congestion_index"] > rows[3]["congestion_index"]
+    assert set(rows[0]["payload"]) == {"segment_id", "incident_type", "severity"}
@@ -0,0 +1,61 @@
+from datetime import datetime, timezone
+from http import HTTPStatus
+
+from app.schemas.telemetry import TelemetryPoint
+from app.services.telemetry import prepare_batch
+
+RECORDED_AT = datetime(2024, 11, 25, 8, 0, tzinfo=timezone.utc)
+
+
+def _point(minute: int = 0, hour: int = 8, **overrides) -> TelemetryPoint:
+    values = {
+        "bus_id": 1,
+        "recorded_at": RECORDED_AT.replace(hour=hour, minute=minute),
+        "latitude": 40.7,
+        "longitude": -74.0,
+    }
+    values.update(overrides)
+    return TelemetryPoint(**values)
+
+
+def test_prepare_batch_drops_in_batch_duplicates_and_rejects_invalid_rows() -> None:
+    points = [
+        _point(),
+        _point(),
+        _point(latitude=123.0),
+        _point(bus_id=99),
+        _point(recorded_at=RECORDED_AT.replace(tzinfo=None, minute=1)),
+    ]
+
+    batch = prepare_batch(points, known_bus_ids={1})
+
+    assert len(batch.rows) == 2
+    assert batch.duplicates == 1
+    assert batch.rejections == [
+        {"index": 2, "reason": "latitude out of range"},
+        {"index": 3, "reason": "unknown bus_id"},
+    ]
+    assert batch.rows[1]["recorded_at"].tzinfo is timezone.utc
+
+
+def test_prepare_batch_rejects_rows_outside_the_writable_window() -> None:
+    points = [_point(minute=1), _point(minute=30), _point(hour=7)]
+
+    batch = prepare_batch(
+        points,
+        known_bus_ids={1},
+        not_before=RECORDED_AT,
+        not_after=RECORDED_AT.replace(minute=5),
+    )
+
+    assert [row["recorded_at"].minute for row in batch.rows] == [1]
+    assert [rejection["reason"] for rejection in batch.rejections] == [
+        "recorded_at is in the future",
+        "recorded_at is past retention",
+    ]
+
+
+def test_batch_endpoint_rejects_empty_batches(client) -> None:
+    response = client.post("/telemetry/batch", json={"records": []})
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
@@ -0,0 +1,89 @@
+import asyncio
+import json
+import threading
+from datetime import datetime, timezone
+from http import HTTPStatus
+
+from sqlalchemy.dialects import postgresql
+
+from app.services.export import (
+    TelemetryExportService,
+    encode_csv,
+    encode_ndjson,
+    export_statement,
+    merge_sorted_batches,
+)
+
+RECORDED_AT = datetime(2024, 11, 25, 8, 0, tzinfo=timezone.utc)
+ROWS = [(1, RECORDED_AT, 40.7, -74.0, 32.5, 180, None)]
+
+
+def test_ndjson_and_csv_encoders_emit_one_line_per_row() -> None:
+    (line,) = encode_ndjson(ROWS).decode().splitlines()
+    assert json.loads(line) == {
+        "bus_id": 1,
+        "recorded_at": "2024-11-25T08:00:00+00:00",
+        "latitude": 40.7,
+        "longitude": -74.0,
+        "speed_kph": 32.5,
+        "heading": 180,
+        "passenger_load": None,
+    }
+
+    header, row = encode_csv(ROWS, header=True).decode().splitlines()
+    assert header.startswith("bus_id,recorded_at,latitude")
+    assert row == "1,2024-11-25 08:00:00+00:00,40.7,-74.0,32.5,180,"
+
+
+def test_export_statement_filters_by_route_in_index_order() -> None:
+    stmt = export_statement(RECORDED_AT, RECORDED_AT.replace(day=26), route_id=3)
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+
+    assert "buses.route_id" in sql
+    assert sql.endswith("ORDER BY telemetry_records.bus_id, telemetry_records.recorded_at")
+
+
+def test_export_rejects_empty_ranges(client) -> None:
+    response = client.get(
+        "/telemetry/export",
+        params={"start": "2024-11-25T08:00:00Z", "end": "2024-11-25T08:00:00Z"},
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_archived_batches_are_read_off_the_event_loop() -> None:
+    threads = []
+
+    def batches():
+        for _ in range(2):
+            threads.append(threading.current_thread())
+            yield ROWS
+
+    async def collect():
+        stream = TelemetryExportService().stream(None, None, "ndjson", archived=batches())
+        return [chunk async for chunk in stream]
+
+    chunks = asyncio.run(collect())
+
+    assert chunks == [encode_ndjson(ROWS)] * 2
+    assert threading.main_thread() not in threads
+
+
+def test_archived_and_live_batches_merge_in_bus_then_time_order() -> None:
+    archived = [[(1, 0), (1, 1), (3, 0)], [(4, 0)]]
+    live = [[(1, 5)], [(2, 5), (3, 5)], [(5, 5)]]
+
+    async def batches(items):
+        for item in items:
+            yield item
+
+    async def collect():
+        merged = merge_sorted_batches(batches(archived), batches(live))
+        return [batch async for batch in merged]
+
+    merged = asyncio.run(collect())
+
+    rows = [row for batch in merged for row in batch]
+    assert rows == sorted(row for batch in archived + live for row in batch)
+    assert all(merged)
@@ -0,0 +1,41 @@
+from http import HTTPStatus
+
+from sqlalchemy.dialects import postgresql
+
+from app.services.traffic import latest_per_source_statement, snapshot_filter_statement
+
+
+def _sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def test_payload_filters_use_generated_columns_and_containment() -> None:
+    sql = _sql(
+        snapshot_filter_statement(
+            source="DOT Feed", incident_type="collision", payload={"severity": 3}
+        )
+    )
+
+    assert "traffic_snapshots.incident_type = " in sql
+    assert "traffic_snapshots.payload @> " in sql
+    assert "->>" not in sql
+    assert sql.endswith("ORDER BY traffic_snapshots.captured_at DESC, traffic_snapshots.id DESC")
+
+
+def test_latest_per_source_probes_each_source_once() -> None:
+    discovered = _sql(latest_per_source_statement())
+    assert discovered.startswith("WITH RECURSIVE snapshot_sources")
+    assert "traffic_snapshots.source > snapshot_sources.source" in discovered
+    assert "JOIN LATERAL" in discovered
+
+    explicit = _sql(latest_per_source_statement(["Waze", "DOT Feed", "Waze"]))
+    assert "RECURSIVE" not in explicit
+    assert "VALUES (%(param_1)s), (%(param_2)s)" in explicit
+
+
+def test_snapshot_listing_rejects_non_object_payload_filters(client) -> None:
+    response = client.get("/traffic/snapshots", params={"payload": "[1, 2]"})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    response = client.get("/traffic/snapshots", params={"cursor": "not-a-cursor"})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
@@ -0,0 +1,130 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from app.services import travel_profiles
+from app.services.predictions import compute_route_forecasts
+from app.services.travel_profiles import (
+    TravelProfiles,
+    local_day_and_slot,
+    pace_percentiles,
+    pace_samples,
+)
+
+NEW_YORK = ZoneInfo("America/New_York")
+# Monday 2024-12-02 08:00 in New York.
+MONDAY_8AM = datetime(2024, 12, 2, 13, 0, tzinfo=timezone.utc)
+
+
+def _samples(route_id: int, minutes_per_km: float, buses: int = 4, steps: int = 30):
+    # Each bus moves 0.5 km north per step, taking 0.5 * minutes_per_km minutes.
+    rows = [
+        (
+            route_id,
+            bus,
+            MONDAY_8AM.timestamp() + step * 30 * minutes_per_km,
+            40.0 + step * 0.5 / 111.195,
+            -74.0,
+        )
+        for bus in range(buses)
+        for step in range(steps)
+    ]
+    route, bus, epoch, lat, lon = (np.asarray(column) for column in zip(*rows))
+    return pace_samples(route, bus, epoch, lat, lon, NEW_YORK, 15)
+
+
+def test_day_and_slot_follow_local_time_across_dst() -> None:
+    epochs = np.array(
+        [
+            MONDAY_8AM.timestamp(),
+            # Sunday 2024-03-10 01:30 EST and, after the jump, 03:30 EDT.
+            datetime(2024, 3, 10, 6, 30, tzinfo=timezone.utc).timestamp(),
+            datetime(2024, 3, 10, 7, 30, tzinfo=timezone.utc).timestamp(),
+        ]
+    )
+
+    day, slot = local_day_and_slot(epochs, NEW_YORK, 15)
+
+    assert day.tolist() == [0, 6, 6]
+    assert slot.tolist() == [32, 6, 14]
+
+
+def test_percentiles_interpolate_within_histogram_bins() -> None:
+    counts = np.zeros((2, 48), dtype=np.uint32)
+    counts[0, 10] = 100
+
+    result = pace_percentiles(counts, (0.5,))
+
+    edges = travel_profiles.PACE_EDGES
+    assert edges[10] < result[0, 0] < edges[11]
+    assert np.isnan(result[1, 0])
+
+
+def test_profiles_round_trip_and_adjust_for_congestion(tmp_path) -> None:
+    profiles = TravelProfiles.empty(15, "America/New_York")
+    day, slot = local_day_and_slot(np.array([MONDAY_8AM.timestamp()] * 2), NEW_YORK, 15)
+    profiles.add(_samples(7, 2.0), (day, slot, np.array([40.0, 60.0])))
+    profiles.add(_samples(9, 4.0), (day[:0], slot[:0], np.zeros(0)))
+    profiles.built_through = MONDAY_8AM
+    path = tmp_path / "profiles.npz"
+    profiles.save(path)
+
+    loaded = TravelProfiles.load(path)
+
+    assert len(loaded) == 2 and loaded.built_through == MONDAY_8AM
+    assert loaded.counts.shape[-1] == 0
+    assert np.isclose(loaded.pace(7, MONDAY_8AM), 2.0, rtol=0.05)
+    assert np.isclose(loaded.pace(9, MONDAY_8AM), 4.0, rtol=0.05)
+    # Typical congestion for the cell is 50; 80 means 30 points worse than usual.
+    jammed = loaded.pace(7, MONDAY_8AM, congestion_index=80)
+    assert np.isclose(jammed, loaded.pace(7, MONDAY_8AM) * 1.09)
+    assert loaded.pace(7, MONDAY_8AM.replace(hour=3)) is None
+    assert loaded.pace(8, MONDAY_8AM) is None
+
+
+def test_reload_swaps_in_a_rebuilt_file(tmp_path, monkeypatch) -> None:
+    path = tmp_path / "profiles.npz"
+    settings = SimpleNamespace(
+        travel_profile_path=str(path),
+        travel_profile_bucket_minutes=15,
+        travel_profile_timezone="America/New_York",
+    )
+    monkeypatch.setattr(travel_profiles, "get_settings", lambda: settings)
+    travel_profiles.get_travel_profiles.cache_clear()
+    try:
+        assert len(travel_profiles.get_travel_profiles()) == 0
+        assert not travel_profiles.reload_travel_profiles()
+
+        profiles = TravelProfiles.empty(15, "America/New_York")
+        profiles.add(_samples(7, 2.0), (np.zeros(0, int), np.zeros(0, int), np.zeros(0)))
+        profiles.save(path)
+
+        assert travel_profiles.reload_travel_profiles()
+        assert len(travel_profiles.get_travel_profiles()) == 1
+        assert not travel_profiles.reload_travel_profiles()
+    finally:
+        travel_profiles.get_travel_profiles.cache_clear()
+
+
+def test_live_segment_pace_beats_baseline_which_beats_reported_speed() -> None:
+    minutes = np.arange(5, dtype=np.float64)
+    args = (
+        np.array([0, 0, 1, 1, 1]),
+        np.array([1, 1, 2, 2, 2]),
+        minutes * 60,
+        40.0 + 0.005 * minutes,
+        np.full(5, -74.0),
+        np.full(5, 30.0),
+        2,
+    )
+
+    forecasts = compute_route_forecasts(
+        *args,
+        route_length_km=np.array([10.0, 10.0]),
+        baseline_pace=np.array([3.0, 3.0]),
+        segment_travel_minutes=np.array([np.nan, 25.0]),
+    )
+
+    assert forecasts.travel_time_minutes.tolist() == [30.0, 25.0]
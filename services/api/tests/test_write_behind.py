@@ -0,0 +1,178 @@
+import asyncio
+import contextlib
+from datetime import datetime, timezone
+from http import HTTPStatus
+
+from sqlalchemy.exc import OperationalError
+
+from app.routers import telemetry as telemetry_router
+from app.schemas.telemetry import TelemetryPoint
+from app.services.telemetry import IngestSummary
+from app.services.write_behind import BUFFER_RECORDS, BufferFull, TelemetryWriteBuffer
+
+RECORDED_AT = datetime(2024, 11, 25, 8, 0, tzinfo=timezone.utc)
+
+
+def _point(bus_id: int = 1, second: int = 0) -> TelemetryPoint:
+    return TelemetryPoint(
+        bus_id=bus_id,
+        recorded_at=RECORDED_AT.replace(second=second),
+        latitude=40.7,
+        longitude=-74.0,
+    )
+
+
+class RecordingFlusher:
+    def __init__(self) -> None:
+        self.batches: list[list[TelemetryPoint]] = []
+        self.fail = False
+
+    async def __call__(self, points) -> IngestSummary:
+        if self.fail:
+            raise OperationalError("INSERT", {}, ConnectionError("down"))
+        self.batches.append(list(points))
+        return IngestSummary(received=len(points), accepted=len(points))
+
+
+def test_buffer_coalesces_duplicates_and_refuses_when_full() -> None:
+    buffer = TelemetryWriteBuffer(RecordingFlusher(), capacity=2, flush_seconds=3.0)
+
+    assert buffer.submit(_point(second=1))
+    assert not buffer.submit(_point(second=1))
+    assert buffer.submit(_point(second=2))
+    # Duplicates of waiting records are still accepted once the buffer is full.
+    assert not buffer.submit(_point(second=2))
+    try:
+        buffer.submit(_point(second=3))
+    except BufferFull as exc:
+        assert exc.retry_after == 3.0
+    else:
+        raise AssertionError("expected BufferFull")
+    assert len(buffer) == 2
+
+
+def test_buffer_flushes_on_count_and_on_stop() -> None:
+    flusher = RecordingFlusher()
+
+    async def scenario() -> None:
+        buffer = TelemetryWriteBuffer(flusher, flush_records=3, flush_seconds=60.0)
+        buffer.start()
+        for second in range(4):
+            buffer.submit(_point(second=second))
+        await asyncio.sleep(0.01)
+        assert [len(batch) for batch in flusher.batches] == [4]
+        buffer.submit(_point(second=10))
+        await buffer.stop()
+
+    asyncio.run(scenario())
+    assert [len(batch) for batch in flusher.batches] == [4, 1]
+
+
+def test_failed_flush_keeps_records_for_the_next_attempt() -> None:
+    flusher = RecordingFlusher()
+
+    async def scenario() -> None:
+        buffer = TelemetryWriteBuffer(flusher, capacity=2)
+        buffer.submit(_point(second=1))
+        buffer.submit(_point(second=2))
+        flusher.fail = True
+        assert await buffer.flush() == 0
+        assert len(buffer) == 2
+        flusher.fail = False
+        assert await buffer.flush() == 2
+
+    asyncio.run(scenario())
+    assert len(flusher.batches) == 1
+
+
+def test_unexpected_flush_errors_do_not_end_the_flush_loop() -> None:
+    flusher = RecordingFlusher()
+    failures = []
+
+    async def flush(points) -> IngestSummary:
+        if not failures:
+            failures.append(len(points))
+            raise ValueError("bad row")
+        return await flusher(points)
+
+    async def scenario() -> None:
+        buffer = TelemetryWriteBuffer(flush, flush_records=2, flush_seconds=60.0)
+        buffer.start()
+        buffer.submit(_point(second=1))
+        buffer.submit(_point(second=2))
+        await asyncio.sleep(0.01)
+        assert len(buffer) == 2
+        # The loop survived the failure and flushes the kept batch on the next wake-up.
+        buffer.submit(_point(second=3))
+        await asyncio.sleep(0.01)
+        assert len(buffer) == 0
+        await buffer.stop()
+
+    before = BUFFER_RECORDS.value("flush_failed")
+    asyncio.run(scenario())
+    assert failures == [2]
+    assert [len(batch) for batch in flusher.batches] == [3]
+    assert BUFFER_RECORDS.value("flush_failed") == before + 2
+
+
+def test_stop_during_a_flush_loses_nothing() -> None:
+    written: list[TelemetryPoint] = []
+    release = None
+
+    async def slow_flush(points) -> IngestSummary:
+        await release.wait()
+        written.extend(points)
+        return IngestSummary(received=len(points), accepted=len(points))
+
+    async def scenario() -> int:
+        nonlocal release
+        release = asyncio.Event()
+        buffer = TelemetryWriteBuffer(slow_flush, flush_records=3, flush_seconds=60.0)
+        buffer.start()
+        for second in range(3):
+            buffer.submit(_point(second=second))
+        await asyncio.sleep(0.01)
+        assert len(buffer) == 0  # the batch is in flight
+        stopping = asyncio.create_task(buffer.stop())
+        await asyncio.sleep(0.01)
+        release.set()
+        await stopping
+        return len(buffer)
+
+    assert asyncio.run(scenario()) == 0
+    assert len(written) == 3
+
+
+def test_cancelled_flush_requeues_its_batch() -> None:
+    async def hanging_flush(points) -> IngestSummary:
+        await asyncio.sleep(60)
+        raise AssertionError("unreachable")
+
+    async def scenario() -> int:
+        buffer = TelemetryWriteBuffer(hanging_flush)
+        buffer.submit(_point(second=1))
+        flushing = asyncio.create_task(buffer.flush())
+        await asyncio.sleep(0.01)
+        flushing.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await flushing
+        return len(buffer)
+
+    assert asyncio.run(scenario()) == 1
+
+
+def test_submit_endpoint_returns_202_then_429_with_retry_after(client, monkeypatch) -> None:
+    buffer = TelemetryWriteBuffer(RecordingFlusher(), capacity=1, flush_seconds=0.5)
+    monkeypatch.setattr(telemetry_router, "get_telemetry_buffer", lambda: buffer)
+    body = _point().model_dump(mode="json")
+
+    accepted = client.post("/telemetry", json=body)
+    assert accepted.status_code == HTTPStatus.ACCEPTED
+    assert accepted.json() == {"buffered": True, "pending": 1}
+
+    full = client.post("/telemetry", json=_point(second=5).model_dump(mode="json"))
+    assert full.status_code == HTTPStatus.TOO_MANY_REQUESTS
+    assert full.headers["Retry-After"] == "1"
+
+    invalid = client.post("/telemetry", json={**body, "latitude": 91.0})
+    assert invalid.status_code == HTTPStatus.UNPROCESSABLE_ENTITY